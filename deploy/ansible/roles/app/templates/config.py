@@ -49,6 +49,12 @@ backlog = 2048
 #
 #       A positive integer generally set to around 1000.
 #
+#   threads - The number of threads of each gthread worker. Long polling
+#       of chats holds a thread for up to QUIZZZ_CHAT_LONG_POLL_SECONDS,
+#       keep it above QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS (per process).
+#
+#       A positive integer.
+#
 #   timeout - If a worker does not notify the master process in this
 #       number of seconds it is killed and a new worker is spawned
 #       to replace it.
@@ -66,7 +72,8 @@ backlog = 2048
 #
 
 workers = 3
-worker_class = 'sync'
+worker_class = 'gthread'
+threads = 8
 worker_connections = 1000
 timeout = 30
 keepalive = 2
@@ -1,16 +1,23 @@
 """
 ASGI config for quizzz project.
 
-It exposes the ASGI callable as a module-level variable named ``application``.
+It exposes the ASGI callable as a module-level variable named ``application``:
+server-sent events of chats (see `quizzz.chat.events`) are streamed by
+the asynchronous app, all other requests are handled by Django.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
+from django.core.asgi import get_asgi_application
+from settings import configure_from_dotenv
 
-import os
+configure_from_dotenv()
+django_application = get_asgi_application()
 
-from django.core.asgi import get_asgi_application
+from quizzz.chat.events import PATH_REGEX as CHAT_EVENTS_PATH_REGEX, chat_events
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'quizzz.settings')
 
-application = get_asgi_application()
+async def application(scope, receive, send):
+    if scope["type"] == "http" and CHAT_EVENTS_PATH_REGEX.match(scope["path"]):
+        return await chat_events(scope, receive, send)
+    return await django_application(scope, receive, send)
@@ -0,0 +1,309 @@
+"""
+Publish/subscribe brokers of real-time chat events (see `quizzz.chat.events`).
+
+Events are published by views (synchronous code, any thread) and delivered
+to subscriptions of connected clients (asynchronous code of the ASGI app).
+The broker is chosen by `settings.QUIZZZ_CHAT_BROKER`:
+
+- LocalBroker delivers events within one process (development, tests,
+  a single ASGI worker);
+- PostgresBroker delivers events to all processes with LISTEN/NOTIFY
+  of the database (events are sent when the transaction is committed).
+
+Custom brokers implement `publish()` and `subscribe()` of BaseBroker.
+Views publish with `publish_event()`: a failure of the broker is logged
+and does not fail the request.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, connections
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+
+def get_channel_name(community_id, round_id=None):
+    """
+    Channel of the community chat or of the round chat.
+    """
+    if round_id is None:
+        return f"chat.{community_id}"
+    return f"chat.{community_id}.round.{round_id}"
+
+
+class Subscription:
+    """
+    Events of a channel received by a client: `await subscription.get()`
+    returns the next event (name, data encoded as JSON) or None when
+    the subscription is closed because the client does not keep up with events.
+    """
+    def __init__(self, broker, channel, max_size):
+        self.broker = broker
+        self.channel = channel
+        self.queue = asyncio.Queue(max_size + 1)
+        self.max_size = max_size
+        self.loop = None
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.broker.add_subscription(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.remove_subscription(self)
+
+    def put(self, event):
+        """
+        Put an event into the queue (thread-safe).
+        """
+        self.loop.call_soon_threadsafe(self._put, event)
+
+    def _put(self, event):
+        if self.queue.qsize() < self.max_size:
+            self.queue.put_nowait(event)
+        elif self.queue.qsize() == self.max_size:
+            self.queue.put_nowait(None)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class BaseBroker:
+
+    def publish(self, channel, event, data):
+        """
+        Send the event (a name and JSON-serializable data) to subscriptions of <channel>.
+        """
+        raise NotImplementedError
+
+    def subscribe(self, channel):
+        """
+        Return a Subscription to <channel> (an asynchronous context manager).
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def encode(event, data):
+        # data is encoded once for all subscriptions:
+        return (event, json.dumps(data, cls=DjangoJSONEncoder))
+
+
+class LocalBroker(BaseBroker):
+    """
+    In-process broker: events are put into queues of subscriptions of the process.
+    """
+    def __init__(self):
+        self.subscriptions = defaultdict(set)
+        self.lock = threading.Lock()
+
+    def publish(self, channel, event, data):
+        self.deliver(channel, self.encode(event, data))
+
+    def subscribe(self, channel):
+        return Subscription(self, channel, settings.QUIZZZ_CHAT_EVENTS_QUEUE_SIZE)
+
+    def add_subscription(self, subscription):
+        with self.lock:
+            self.subscriptions[subscription.channel].add(subscription)
+
+    def remove_subscription(self, subscription):
+        with self.lock:
+            subscriptions = self.subscriptions[subscription.channel]
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self.subscriptions[subscription.channel]
+
+    def deliver(self, channel, event):
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, []))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+
+class PostgresBroker(LocalBroker):
+    """
+    Broker shared by all processes using the database: events are sent by NOTIFY
+    in the transaction of the view, each process LISTENs with one connection
+    (opened on the first subscription, closed with the last one and reopened
+    when it is lost) and delivers them to local subscriptions.
+
+    Payloads of NOTIFY are limited to 8000 bytes: larger events are sent
+    as references (the name and the id of the message) and each listening
+    process loads the message once for its subscriptions (see `load_event()`).
+    """
+    notify_channel = "quizzz_chat"
+    max_payload_size = 8000
+    reconnect_delays = [1, 2, 5, 10, 30]   # seconds
+
+    def __init__(self, using="default"):
+        super().__init__()
+        self.using = using
+        self.listener = None
+        self.listener_fileno = None
+        self.loop = None
+        self.reconnect_handle = None
+        self.reconnect_attempts = 0
+
+    def publish(self, channel, event, data):
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, %s)", [self.notify_channel, self.get_payload(channel, event, data)])
+
+    def get_payload(self, channel, event, data):
+        payload = json.dumps({"channel": channel, "event": self.encode(event, data)})
+        if len(payload.encode("utf-8")) < self.max_payload_size:
+            return payload
+        return json.dumps({"channel": channel, "name": event, "id": data["id"]})
+
+    @staticmethod
+    def load_event(name, id):
+        """
+        Return data of the event sent as a reference or None if the message was deleted.
+        """
+        from .models import ChatMessage
+        from .serializers import ChatMessageSerializer
+
+        if name != "message":
+            raise ValueError(f"Unknown chat event: {name}")
+        message = ChatMessage.objects.select_related('user').filter(pk=id).first()
+        return ChatMessageSerializer(message).data if message else None
+
+    def add_subscription(self, subscription):
+        super().add_subscription(subscription)
+        with self.lock:
+            self.loop = subscription.loop
+            if self.listener is None and self.reconnect_handle is None:
+                self.connect()
+
+    def remove_subscription(self, subscription):
+        super().remove_subscription(subscription)
+        with self.lock:
+            if not self.subscriptions:
+                self.close_listener()
+
+    def connect(self):
+        """
+        Open the listening connection or retry later with a growing delay
+        (called with the lock; events sent in the meantime are lost).
+        """
+        import psycopg2
+
+        try:
+            self.listener = self.listen()
+        except psycopg2.Error:
+            delay = self.reconnect_delays[min(self.reconnect_attempts, len(self.reconnect_delays) - 1)]
+            logger.warning("Chat events listener cannot connect, retrying in %s s", delay, exc_info=True)
+            self.reconnect_attempts += 1
+            self.reconnect_handle = self.loop.call_later(delay, self.reconnect)
+        else:
+            self.reconnect_attempts = 0
+
+    def reconnect(self):
+        with self.lock:
+            self.reconnect_handle = None
+            if self.listener is None and self.subscriptions:
+                self.connect()
+
+    def listen(self):
+        import psycopg2
+
+        connection = connections[self.using]
+        listener = psycopg2.connect(**connection.get_connection_params())
+        try:
+            listener.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with listener.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.notify_channel}"')
+        except psycopg2.Error:
+            listener.close()
+            raise
+        self.listener_fileno = listener.fileno()
+        self.loop.add_reader(self.listener_fileno, self.receive)
+        return listener
+
+    def close_listener(self):
+        """
+        Close the listening connection and cancel reconnection (called with the lock).
+        """
+        import psycopg2
+
+        if self.reconnect_handle is not None:
+            self.reconnect_handle.cancel()
+            self.reconnect_handle = None
+        if self.listener is None:
+            return
+        self.loop.remove_reader(self.listener_fileno)
+        try:
+            self.listener.close()
+        except psycopg2.Error:
+            pass
+        self.listener = None
+
+    def receive(self):
+        import psycopg2
+
+        try:
+            self.listener.poll()
+        except psycopg2.Error:
+            logger.warning("Chat events listener lost its connection", exc_info=True)
+            with self.lock:
+                self.close_listener()
+                if self.subscriptions:
+                    self.connect()
+            return
+
+        while self.listener.notifies:
+            notify = self.listener.notifies.pop(0)
+            try:
+                payload = json.loads(notify.payload)
+                if "event" in payload:
+                    self.deliver(payload["channel"], tuple(payload["event"]))
+                else:
+                    # the database is not queried in the event loop:
+                    self.loop.run_in_executor(
+                        None, self.deliver_loaded, payload["channel"], payload["name"], int(payload["id"]))
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Invalid chat event: %r", notify.payload)
+
+    def deliver_loaded(self, channel, name, id):
+        close_old_connections()
+        try:
+            data = self.load_event(name, id)
+        except Exception:
+            logger.exception("Loading of chat event %s %s failed", name, id)
+            return
+        finally:
+            close_old_connections()
+        if data is not None:
+            self.deliver(channel, self.encode(name, data))
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Broker of the process (an instance of `settings.QUIZZZ_CHAT_BROKER`).
+    """
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.QUIZZZ_CHAT_BROKER)()
+        return _broker
+
+
+def publish_event(channel, event, data):
+    """
+    Publish the event with the broker of the process, logging failures
+    (events are published when the transaction of the view is committed).
+    """
+    try:
+        get_broker().publish(channel, event, data)
+    except Exception:
+        logger.exception("Publishing of chat event %s to %s failed", event, channel)
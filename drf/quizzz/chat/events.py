@@ -0,0 +1,150 @@
+"""
+Server-sent events of community and round chats, served by the ASGI application
+(see `quizzz/asgi.py`) at `/api/communities/<community_id>/chat/events/[?round_id=...]`.
+
+A client opens the stream with `new EventSource(url)` (the session cookie
+authenticates it like other API requests) and receives events:
+
+    event: message
+    data: {"id": 1, "text": "...", "user": {...}, ...}
+
+    event: message_deleted
+    data: {"id": 1}
+
+Comments (": ping") are sent to keep idle connections open. When a client does not
+keep up with events, the stream is closed; EventSource reconnects and the client
+can load missed messages with `?newer_than=` of the chat API.
+"""
+import asyncio
+import json
+import re
+from http import cookies
+from types import SimpleNamespace
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib import auth
+from django.db import close_old_connections
+from django.http import Http404
+from django.utils.module_loading import import_string
+
+from quizzz.communities.memberships import get_membership
+from .broker import get_broker, get_channel_name
+
+
+PATH_REGEX = re.compile(r"^/api/communities/(?P<community_id>\d+)/chat/events/$")
+
+
+def get_subscriber_error(session_key, community_id, round_id):
+    """
+    Return (status, detail) if the session cannot read the chat or None.
+    The same permissions as of `ChatMessageList` are checked.
+    """
+    from .views import RoundPlayedOrAuthored
+
+    close_old_connections()
+    try:
+        session = import_string(settings.SESSION_ENGINE).SessionStore(session_key)
+        user = auth.get_user(SimpleNamespace(session=session))
+        if not user.is_authenticated:
+            return 403, "Authentication credentials were not provided."
+
+        membership = get_membership(user.id, community_id)
+        if not (membership and membership.is_approved):
+            return 403, "You do not have permission to perform this action."
+
+        request = SimpleNamespace(user=user, query_params={"round_id": round_id} if round_id else {})
+        try:
+            if not RoundPlayedOrAuthored().has_permission(request, None):
+                return 403, "You do not have permission to perform this action."
+        except Http404:
+            return 404, "Not found."
+        return None
+    finally:
+        close_old_connections()
+
+
+def format_event(event):
+    """
+    Format an event of the broker (name, data encoded as JSON) as an SSE event.
+    """
+    name, data = event
+    return f"event: {name}\ndata: {data}\n\n".encode("utf-8")
+
+
+async def send_error(send, status, detail):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({"type": "http.response.body", "body": json.dumps({"detail": detail}).encode("utf-8")})
+
+
+async def wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def chat_events(scope, receive, send):
+    """
+    ASGI application streaming events of a chat.
+    """
+    match = PATH_REGEX.match(scope["path"])
+    if scope["method"] != "GET":
+        return await send_error(send, 405, f'Method "{scope["method"]}" not allowed.')
+
+    community_id = int(match["community_id"])
+    round_id = parse_qs(scope["query_string"].decode("latin-1")).get("round_id", [None])[0]
+    if round_id is not None and not round_id.isdigit():
+        return await send_error(send, 404, "Not found.")
+    round_id = int(round_id) if round_id else None
+
+    cookie = cookies.SimpleCookie()
+    for name, value in scope["headers"]:
+        if name == b"cookie":
+            cookie.load(value.decode("latin-1"))
+    session_key = cookie[settings.SESSION_COOKIE_NAME].value if settings.SESSION_COOKIE_NAME in cookie else None
+
+    error = await sync_to_async(get_subscriber_error)(session_key, community_id, round_id)
+    if error:
+        return await send_error(send, *error)
+
+    async with get_broker().subscribe(get_channel_name(community_id, round_id)) as subscription:
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),   # disable buffering of nginx
+            ],
+        })
+        await send({"type": "http.response.body", "body": b": connected\n\n", "more_body": True})
+
+        disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+        try:
+            while True:
+                event = asyncio.ensure_future(subscription.get())
+                done, _ = await asyncio.wait(
+                    {event, disconnect},
+                    timeout=settings.QUIZZZ_CHAT_EVENTS_KEEPALIVE_SECONDS,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if disconnect in done:
+                    event.cancel()
+                    return
+                if event not in done:
+                    event.cancel()
+                    body = b": ping\n\n"
+                elif event.result() is None:
+                    break   # the client does not keep up
+                else:
+                    body = format_event(event.result())
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+        finally:
+            disconnect.cancel()
+        await send({"type": "http.response.body", "body": b""})
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_chatmessage_round'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['community', 'round', 'time_created', 'id'], name='chat_messages_position_idx'),
+        ),
+    ]
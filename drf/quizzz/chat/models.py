@@ -17,6 +17,10 @@ class ChatMessage(TimeStampedModel):
 
     class Meta:
         db_table = "chat_messages"
-        indexes = [models.Index(fields=['time_created'])]
+        indexes = [
+            models.Index(fields=['time_created']),
+            # pages of a chat (see `quizzz.chat.pagination`):
+            models.Index(fields=['community', 'round', 'time_created', 'id'], name='chat_messages_position_idx'),
+        ]
         # A database index is automatically created on the ForeignKey,
         # - no need to specify db_index=True for 'user' and 'community' fields.
\ No newline at end of file
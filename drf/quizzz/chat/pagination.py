@@ -0,0 +1,149 @@
+"""
+Keyset pagination of chat messages.
+
+Messages are listed newest first by (time_created, id). A page is selected by
+the position of the message next to it (`WHERE (time_created, id) < position
+LIMIT n` by the `chat_messages_position_idx` index), so deep pages are as fast
+as the first one and the total count is only calculated for the first page.
+"""
+import base64
+from collections import OrderedDict
+from urllib import parse
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ChatPagination(BasePagination):
+    """
+    Response has the same keys as the one of PageNumberPagination:
+    {"count": ..., "next": ..., "previous": ..., "results": [...]},
+    `next` links to older messages, `previous` to newer ones.
+
+    - no parameters: the newest messages (with `count` of all messages);
+    - `?cursor=...`: a page linked by `next` or `previous` (`count` is null);
+    - `?newer_than=<time>`: messages created after <time>, the oldest of them
+      first if there are more than a page (`previous` links to the rest);
+    - `?page=<number>`: numbered pages with offsets (kept for old clients).
+    """
+    page_size = settings.QUIZZZ_CHAT_PAGE_SIZE
+    cursor_query_param = 'cursor'
+    newer_than_query_param = 'newer_than'
+    page_query_param = 'page'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.numbered_pagination = None
+        if self.page_query_param in request.query_params:
+            self.numbered_pagination = PageNumberPagination()
+            self.numbered_pagination.page_size = self.page_size
+            return self.numbered_pagination.paginate_queryset(queryset, request, view)
+
+        self.count = None
+        position, is_reversed = self.get_position(request)
+        if position is None:
+            self.count = queryset.count()
+        elif position[1] is None:
+            queryset = queryset.filter(time_created__gt=position[0])
+        else:
+            # the plain range condition lets the database start the index scan at the position:
+            time_created, id = position
+            if is_reversed:
+                queryset = queryset\
+                    .filter(time_created__gte=time_created)\
+                    .filter(Q(time_created__gt=time_created) | Q(id__gt=id))
+            else:
+                queryset = queryset\
+                    .filter(time_created__lte=time_created)\
+                    .filter(Q(time_created__lt=time_created) | Q(id__lt=id))
+
+        if is_reversed:
+            messages = list(queryset.order_by('time_created', 'id')[:self.page_size + 1])
+            self.has_newer = len(messages) > self.page_size
+            self.has_older = True
+            messages = messages[:self.page_size][::-1]
+        else:
+            messages = list(queryset.order_by('-time_created', '-id')[:self.page_size + 1])
+            self.has_newer = position is not None
+            self.has_older = len(messages) > self.page_size
+            messages = messages[:self.page_size]
+
+        self.messages = messages
+        return messages
+
+    def paginate_newest(self, queryset, base_url):
+        """
+        Select the newest messages without `count` (for pages embedded into other
+        responses), links are made for the chat endpoint at <base_url>.
+        """
+        self.base_url = base_url
+        self.numbered_pagination = None
+        self.count = None
+        messages = list(queryset.order_by('-time_created', '-id')[:self.page_size + 1])
+        self.has_newer = False
+        self.has_older = len(messages) > self.page_size
+        self.messages = messages[:self.page_size]
+        return self.messages
+
+    def get_position(self, request):
+        """
+        Return ((time_created, id) of the position, whether newer messages are listed),
+        the id is None for all messages of the time.
+        """
+        newer_than = request.query_params.get(self.newer_than_query_param)
+        if newer_than is not None:
+            try:
+                time_created = serializers.DateTimeField().to_internal_value(newer_than)
+            except ValidationError as e:
+                raise ValidationError({self.newer_than_query_param: e.detail})
+            return (time_created, None), True
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None, False
+        try:
+            querystring = base64.b64decode(encoded.encode('ascii')).decode('ascii')
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            time_created = parse_datetime(tokens['t'][0])
+            id = int(tokens['i'][0])
+            is_reversed = bool(int(tokens.get('r', ['0'])[0]))
+        except (TypeError, ValueError, KeyError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if time_created is None:
+            raise NotFound(self.invalid_cursor_message)
+        return (time_created, id), is_reversed
+
+    def encode_cursor(self, message, is_reversed):
+        tokens = {'t': message.time_created.isoformat(), 'i': message.id}
+        if is_reversed:
+            tokens['r'] = '1'
+        encoded = base64.b64encode(parse.urlencode(tokens, doseq=True).encode('ascii')).decode('ascii')
+        url = remove_query_param(self.base_url, self.newer_than_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not (self.has_older and self.messages):
+            return None
+        return self.encode_cursor(self.messages[-1], is_reversed=False)
+
+    def get_previous_link(self):
+        if not (self.has_newer and self.messages):
+            return None
+        return self.encode_cursor(self.messages[0], is_reversed=True)
+
+    def get_paginated_response(self, data):
+        if self.numbered_pagination is not None:
+            return self.numbered_pagination.get_paginated_response(data)
+        return Response(OrderedDict([
+            ('count', self.count),
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
@@ -0,0 +1,100 @@
+"""
+Long polling of chat messages (for deployments without the ASGI app).
+
+The id of the last message of every chat (community or round) is kept
+in the shared cache and set when a message is posted. Waiting requests
+poll this key, not `chat_messages`, and only query messages once the key
+shows a message newer than the one the client has (or when they time out,
+in case the key was overwritten by an older message posted concurrently).
+
+Waiting requests hold a worker thread, so at most QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS
+requests of a process wait at the same time, others return right away (see `waiting_slot()`).
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max
+
+from quizzz.common.cache import get_or_build
+from .models import ChatMessage
+
+
+_num_waiting = 0
+_num_waiting_lock = threading.Lock()
+
+
+@contextmanager
+def waiting_slot():
+    """
+    Context manager yielding whether the request may wait for messages
+    (False when QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS requests of the process are waiting).
+    """
+    global _num_waiting
+    with _num_waiting_lock:
+        is_acquired = _num_waiting < settings.QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS
+        _num_waiting += is_acquired
+    try:
+        yield is_acquired
+    finally:
+        if is_acquired:
+            with _num_waiting_lock:
+                _num_waiting -= 1
+
+
+def get_last_message_key(community_id, round_id=None):
+    return f'chat-last-message:{community_id}:{round_id or ""}'
+
+
+def get_last_message_id(community_id, round_id=None):
+    """
+    Return the id of the last message of the chat (0 if there are none),
+    the chat is only queried when the key is not cached.
+    """
+    return get_or_build(
+        get_last_message_key(community_id, round_id),
+        lambda: ChatMessage.objects
+            .filter(community_id=community_id, round_id=round_id)
+            .aggregate(last_id=Max('id'))['last_id'] or 0,
+        timeout=settings.QUIZZZ_CHAT_LAST_MESSAGE_CACHE_SECONDS,
+    )
+
+
+def set_last_message_id(community_id, round_id, message_id):
+    cache.set(
+        get_last_message_key(community_id, round_id), message_id,
+        settings.QUIZZZ_CHAT_LAST_MESSAGE_CACHE_SECONDS)
+
+
+def wait_for_messages(queryset, community_id, round_id, after_id, timeout, limit):
+    """
+    Return up to <limit> messages of <queryset> (messages of the chat) with id greater
+    than <after_id> (the oldest of them, newest first), waiting for them up to <timeout> seconds.
+    """
+    deadline = time.monotonic() + timeout
+    last_seen_id = after_id
+    while True:
+        is_new = wait_for_new_messages(
+            community_id, round_id, last_seen_id, max(deadline - time.monotonic(), 0))
+        messages = list(queryset.filter(id__gt=after_id).order_by('id')[:limit])
+        if messages or not is_new:
+            return messages[::-1]
+        # newer messages were deleted, wait for the next ones:
+        last_seen_id = get_last_message_id(community_id, round_id)
+
+
+def wait_for_new_messages(community_id, round_id, after_id, timeout, poll_interval=None):
+    """
+    Block until the chat has a message with id greater than <after_id> or
+    <timeout> seconds pass. Return whether such a message may exist.
+    """
+    poll_interval = poll_interval or settings.QUIZZZ_CHAT_LONG_POLL_INTERVAL_SECONDS
+    deadline = time.monotonic() + timeout
+    while True:
+        if get_last_message_id(community_id, round_id) > after_id:
+            return True
+        if time.monotonic() + poll_interval > deadline:
+            return False
+        time.sleep(poll_interval)
@@ -1,10 +1,11 @@
 from rest_framework import serializers
 
 from .models import ChatMessage
+from quizzz.common.serializers import SparseFieldsetsMixin
 from quizzz.users.serializers import UserSerializer
 
 
-class ChatMessageSerializer(serializers.ModelSerializer):
+class ChatMessageSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True) 
     # nested serializers are read-only by default
     # setting read-only here just to be sure
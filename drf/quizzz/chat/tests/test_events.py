@@ -0,0 +1,197 @@
+import asyncio
+import json
+import os
+from unittest import mock
+from asgiref.sync import async_to_sync, sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from quizzz.common.test_mixins import SetupChatDataMixin
+
+from ..broker import LocalBroker, PostgresBroker, get_channel_name
+from ..events import chat_events
+from ..models import ChatMessage
+from ..polling import get_last_message_id
+from ..serializers import ChatMessageSerializer
+
+
+class LocalBrokerTest(APITestCase):
+
+    def test_publish_and_subscribe(self):
+        broker = LocalBroker()
+
+        async def run():
+            async with broker.subscribe(get_channel_name(1)) as subscription, \
+                    broker.subscribe(get_channel_name(1, 2)) as round_subscription:
+                broker.publish(get_channel_name(1), "message", {"id": 1})
+                self.assertEqual(await subscription.get(), ("message", '{"id": 1}'))
+                self.assertTrue(round_subscription.queue.empty())
+            self.assertDictEqual(broker.subscriptions, {})
+
+        async_to_sync(run)()
+
+    @override_settings(QUIZZZ_CHAT_EVENTS_QUEUE_SIZE=2)
+    def test_slow_subscription_is_closed(self):
+        broker = LocalBroker()
+
+        async def run():
+            async with broker.subscribe("chat.1") as subscription:
+                for i in range(5):
+                    broker.publish("chat.1", "message", {"id": i})
+                await asyncio.sleep(0)
+                events = [await subscription.get() for _ in range(3)]
+                self.assertListEqual(events, [("message", '{"id": 0}'), ("message", '{"id": 1}'), None])
+
+        async_to_sync(run)()
+
+
+class PostgresBrokerTest(SetupChatDataMixin, APITestCase):
+
+    def test_large_events_are_sent_as_references(self):
+        broker = PostgresBroker()
+        message = ChatMessage.objects.create(
+            community_id=self.GROUP_ID, user_id=self.USERS["alice"]["id"], text="\U0001F600" * 1000)
+        data = ChatMessageSerializer(message).data
+
+        payload = broker.get_payload("chat.1", "message", {"id": 1, "text": "short"})
+        self.assertEqual(json.loads(payload)["event"], ["message", '{"id": 1, "text": "short"}'])
+
+        payload = broker.get_payload("chat.1", "message", data)
+        self.assertLess(len(payload.encode("utf-8")), broker.max_payload_size)
+        self.assertDictEqual(json.loads(payload), {"channel": "chat.1", "name": "message", "id": message.id})
+        self.assertEqual(broker.load_event("message", message.id), data)
+
+        message.delete()
+        self.assertIsNone(broker.load_event("message", message.id))
+
+    def test_lost_listener_is_reconnected(self):
+        import psycopg2
+
+        read_fd, write_fd = os.pipe()
+        self.addCleanup(os.close, read_fd)
+        self.addCleanup(os.close, write_fd)
+        lost = mock.MagicMock(**{
+            "fileno.return_value": read_fd,
+            "poll.side_effect": psycopg2.OperationalError("server closed the connection unexpectedly"),
+        })
+        notify = mock.Mock(payload=json.dumps({"channel": "chat.1", "event": ["message", '{"id": 1}']}))
+        restored = mock.MagicMock(**{"fileno.return_value": read_fd, "notifies": [notify]})
+        connect = mock.Mock(side_effect=[lost, psycopg2.OperationalError("database is starting up"), restored])
+
+        broker = PostgresBroker()
+        broker.reconnect_delays = [0]
+
+        async def run():
+            async with broker.subscribe("chat.1") as subscription:
+                self.assertIs(broker.listener, lost)
+                broker.receive()
+                lost.close.assert_called_once()
+                self.assertIsNone(broker.listener)
+                self.assertIsNotNone(broker.reconnect_handle)
+
+                await asyncio.sleep(0.01)
+                self.assertIs(broker.listener, restored)
+                broker.receive()
+                self.assertEqual(await subscription.get(), ("message", '{"id": 1}'))
+
+            # the connection is closed with the last subscription:
+            restored.close.assert_called_once()
+            self.assertIsNone(broker.listener)
+
+        with mock.patch("psycopg2.connect", connect), self.assertLogs("quizzz.chat.broker", "WARNING"):
+            async_to_sync(run)()
+        self.assertEqual(connect.call_count, 3)
+
+
+class ChatEventsTest(SetupChatDataMixin, APITransactionTestCase):
+    """
+    Events are streamed by the ASGI app in the same process as views
+    (data is set up for each test: the app closes obsolete connections
+    like Django does between requests, so it cannot run in a test transaction).
+    """
+    def setUp(self):
+        self.set_up_users()
+        self.set_up_communities()
+        self.set_up_chat_data()
+        self.url = reverse('chat:community-chat', kwargs={"community_id": self.GROUP_ID})
+
+    def get_communicator(self, path=None):
+        headers = []
+        if settings.SESSION_COOKIE_NAME in self.client.cookies:
+            session_key = self.client.cookies[settings.SESSION_COOKIE_NAME].value
+            headers.append((b"cookie", f"{settings.SESSION_COOKIE_NAME}={session_key}".encode("latin-1")))
+        return ApplicationCommunicator(chat_events, {
+            "type": "http",
+            "method": "GET",
+            "path": path or f"/api/communities/{self.GROUP_ID}/chat/events/",
+            "query_string": b"",
+            "headers": headers,
+        })
+
+    async def open_stream(self, communicator):
+        await communicator.send_input({"type": "http.request", "body": b""})
+        response_start = await communicator.receive_output(timeout=1)
+        if response_start["status"] == status.HTTP_200_OK:
+            self.assertEqual((await communicator.receive_output(timeout=1))["body"], b": connected\n\n")
+        return response_start
+
+    def test_permissions(self):
+        async def get_status():
+            return (await self.open_stream(self.get_communicator()))["status"]
+
+        self.assertEqual(async_to_sync(get_status)(), status.HTTP_403_FORBIDDEN)
+        self.login_as("ben")   # not a member
+        self.assertEqual(async_to_sync(get_status)(), status.HTTP_403_FORBIDDEN)
+
+    def test_messages_are_streamed(self):
+        self.login_as("alice")
+
+        async def run():
+            communicator = self.get_communicator()
+            response_start = await self.open_stream(communicator)
+            self.assertEqual(response_start["status"], status.HTTP_200_OK)
+            self.assertIn((b"content-type", b"text/event-stream"), response_start["headers"])
+
+            response = await sync_to_async(self.client.post)(self.url, {"text": "live message"})
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            body = (await communicator.receive_output(timeout=1))["body"].decode("utf-8")
+            event, data = body.split("\n")[:2]
+            self.assertEqual(event, "event: message")
+            self.assertDictEqual(json.loads(data[len("data: "):]), json.loads(json.dumps(response.data)))
+
+            await sync_to_async(self.login_as)("bob")
+            await sync_to_async(self.client.delete)(
+                reverse('chat:community-chat-message', kwargs={"community_id": self.GROUP_ID, "message_id": 1}))
+            body = (await communicator.receive_output(timeout=1))["body"]
+            self.assertEqual(body, b'event: message_deleted\ndata: {"id": 1}\n\n')
+
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(timeout=1)
+
+        async_to_sync(run)()
+
+    @override_settings(QUIZZZ_CHAT_EVENTS_KEEPALIVE_SECONDS=0.01)
+    def test_keepalive(self):
+        self.login_as("alice")
+
+        async def run():
+            communicator = self.get_communicator()
+            await self.open_stream(communicator)
+            self.assertEqual((await communicator.receive_output(timeout=1))["body"], b": ping\n\n")
+            await communicator.send_input({"type": "http.disconnect"})
+            await communicator.wait(timeout=1)
+
+        async_to_sync(run)()
+
+    def test_broker_failures_do_not_fail_requests(self):
+        self.login_as("alice")
+
+        with mock.patch.object(LocalBroker, 'publish', side_effect=RuntimeError("payload string too long")):
+            response = self.client.post(self.url, {"text": "message"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # clients polling for messages are notified:
+        self.assertEqual(get_last_message_id(self.GROUP_ID), response.data["id"])
@@ -0,0 +1,99 @@
+import time
+
+from django.core.cache import caches
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
+
+from quizzz.common.test_mixins import SetupChatDataMixin
+
+from ..models import ChatMessage
+from ..polling import get_last_message_id, set_last_message_id
+
+
+@override_settings(QUIZZZ_CHAT_LONG_POLL_INTERVAL_SECONDS=0.01)
+class ChatMessageWaitTest(SetupChatDataMixin, APITestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        self.url = reverse('chat:community-chat-wait', kwargs={"community_id": self.GROUP_ID})
+
+    def test_permissions(self):
+        get_response = lambda: self.client.get(self.url, {"after": 0, "timeout": 0})
+
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+    def test_validation(self):
+        self.login_as("alice")
+
+        response = self.client.get(self.url)
+        self.assert_validation_failed(response, data={"after": ["A valid integer is required."]})
+
+        response = self.client.get(self.url, {"after": 0, "timeout": "long"})
+        self.assert_validation_failed(response, data={"timeout": ["A valid number is required."]})
+
+        for timeout in ["nan", "inf", "-inf"]:
+            response = self.client.get(self.url, {"after": 0, "timeout": timeout})
+            self.assert_validation_failed(response, data={"timeout": ["A valid number is required."]})
+
+    def test_newer_messages_are_returned_immediately(self):
+        self.login_as("alice")
+
+        with self.assertNumQueries(5):
+            # (1-2) request.user (3) member check (4) last message id (not cached) (5) new messages
+            response = self.client.get(self.url, {"after": 0})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertListEqual(list(response.data.keys()), ["results"])
+            self.assertListEqual([m["id"] for m in response.data["results"]], [2, 1])
+
+        response = self.client.get(self.url, {"after": 1})
+        self.assertListEqual([m["id"] for m in response.data["results"]], [2])
+
+    def test_timeout(self):
+        """
+        Waiting requests read the last message id from the cache, the chat is queried once.
+        """
+        self.login_as("alice")
+        get_last_message_id(self.GROUP_ID)
+
+        started = time.monotonic()
+        with self.assertNumQueries(4):  # (1-2) request.user (3) member check (4) new messages
+            response = self.client.get(self.url, {"after": 2, "timeout": 0.05})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertListEqual(response.data["results"], [])
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+
+    @override_settings(QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS=0)
+    def test_requests_do_not_wait_when_too_many_are_waiting(self):
+        self.login_as("alice")
+
+        started = time.monotonic()
+        response = self.client.get(self.url, {"after": 2, "timeout": 5})
+        self.assertListEqual(response.data["results"], [])
+        self.assertLess(time.monotonic() - started, 1)
+
+        response = self.client.get(self.url, {"after": 1, "timeout": 5})
+        self.assertListEqual([m["id"] for m in response.data["results"]], [2])
+
+    def test_posted_messages_are_returned(self):
+        self.login_as("alice")
+        get_last_message_id(self.GROUP_ID)
+
+        message = ChatMessage.objects.create(community_id=self.GROUP_ID, user_id=self.USERS["alice"]["id"], text="new")
+        set_last_message_id(self.GROUP_ID, None, message.id)
+
+        response = self.client.get(self.url, {"after": 2, "timeout": 0.05})
+        self.assertListEqual([m["id"] for m in response.data["results"]], [message.id])
+
+    def test_deleted_messages_are_skipped(self):
+        """
+        When the newer messages were deleted, the request keeps waiting for the next ones.
+        """
+        self.login_as("alice")
+        set_last_message_id(self.GROUP_ID, None, 100)
+
+        with self.assertNumQueries(5):  # (1-2) request.user (3) member check (4-5) new messages
+            response = self.client.get(self.url, {"after": 2, "timeout": 0.05})
+            self.assertListEqual(response.data["results"], [])
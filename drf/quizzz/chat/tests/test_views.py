@@ -1,4 +1,5 @@
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework.test import APITestCase
 from rest_framework import status
 
@@ -54,9 +55,10 @@ class ChatMessageListTest(SetupChatDataMixin, APITestCase):
     def test_pagination(self):
         """
         Test how pagination works:
-        - `count` shows total number of messages in group chat;
-        - `next` and `previous` are either None or a absolute URL with next/previous page;
-        - `results` contains list of paginated objects.
+        - `count` shows total number of messages in group chat (on the first page);
+        - `next` and `previous` are either None or an absolute URL with a cursor
+          of older/newer messages;
+        - `results` contains list of paginated objects, newest first.
         """
         self.login_as("alice")
         
@@ -70,21 +72,85 @@ class ChatMessageListTest(SetupChatDataMixin, APITestCase):
         response = self.client.get(self.url)
 
         self.assertEqual(response.data["count"], self.num_messages)
-        self.assertEqual(response.data["next"], "http://testserver" + self.url + "?page=2")
+        self.assertTrue(response.data["next"].startswith("http://testserver" + self.url + "?cursor="))
         self.assertEqual(response.data["previous"], None)
-        self.assertEqual(len(response.data["results"]), TEMP_PAGE_SIZE)
+        self.assertEqual([m["id"] for m in response.data["results"]], [2])
 
-        # 2nd page
-        response = self.client.get(response.data["next"])
+        # 2nd page is selected by the position of the last message, without count(*):
+        with self.assertNumQueries(3):
+            # (1-2) request.user (3) select page (membership is cached)
+            response = self.client.get(response.data["next"])
         
+        self.assertEqual(response.data["count"], None)
+        self.assertEqual(response.data["next"], None)
+        self.assertTrue(response.data["previous"].startswith("http://testserver" + self.url + "?cursor="))
+        self.assertEqual([m["id"] for m in response.data["results"]], [1])
+
+        # back to the 1st page
+        response = self.client.get(response.data["previous"])
+        self.assertEqual(response.data["previous"], None)
+        self.assertEqual([m["id"] for m in response.data["results"]], [2])
+
+        # numbered pages still work for old clients:
+        response = self.client.get(self.url, {"page": 2})
         self.assertEqual(response.data["count"], self.num_messages)
         self.assertEqual(response.data["next"], None)
         self.assertEqual(response.data["previous"], "http://testserver" + self.url)
-        self.assertEqual(len(response.data["results"]), TEMP_PAGE_SIZE)
+        self.assertEqual([m["id"] for m in response.data["results"]], [1])
+
+        response = self.client.get(self.url, {"cursor": "broken"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
         # restore original pagination settings:
         ChatMessageList.pagination_class.page_size = ORIGINAL_PAGE_SIZE
 
+    def test_messages_with_equal_time(self):
+        """
+        Messages created at the same time are ordered by id, no message is skipped.
+        """
+        self.login_as("alice")
+        ChatMessage.objects.filter(community_id=self.GROUP_ID).update(time_created=timezone.now())
+
+        ORIGINAL_PAGE_SIZE = ChatMessageList.pagination_class.page_size
+        ChatMessageList.pagination_class.page_size = 1
+        response = self.client.get(self.url)
+        self.assertEqual([m["id"] for m in response.data["results"]], [2])
+        response = self.client.get(response.data["next"])
+        self.assertEqual([m["id"] for m in response.data["results"]], [1])
+        ChatMessageList.pagination_class.page_size = ORIGINAL_PAGE_SIZE
+
+    def test_newer_messages(self):
+        """
+        The chat widget asks for messages created after the newest message it has.
+        """
+        self.login_as("alice")
+        newest = self.client.get(self.url).data["results"][0]
+
+        response = self.client.get(self.url, {"newer_than": newest["time_created"]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+
+        new_ids = [
+            ChatMessage.objects.create(text=f"new {i}", user_id=self.USERS["bob"]["id"], community_id=self.GROUP_ID).id
+            for i in range(3)
+        ]
+        ORIGINAL_PAGE_SIZE = ChatMessageList.pagination_class.page_size
+        ChatMessageList.pagination_class.page_size = 2
+
+        # the oldest new messages come first, `previous` links to the newer ones:
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"newer_than": newest["time_created"]})
+        self.assertEqual(response.data["count"], None)
+        self.assertEqual([m["id"] for m in response.data["results"]], new_ids[1::-1])
+        self.assertNotIn("newer_than", response.data["previous"])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([m["id"] for m in response.data["results"]], new_ids[2:])
+        self.assertEqual(response.data["previous"], None)
+        ChatMessageList.pagination_class.page_size = ORIGINAL_PAGE_SIZE
+
+        response = self.client.get(self.url, {"newer_than": "yesterday"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
     def test_post_new_message(self):
         """
@@ -118,9 +184,11 @@ class ChatMessageListTest(SetupChatDataMixin, APITestCase):
         get_response = lambda pk: self.client.delete(get_message_url(pk))
 
         for pk in [1,2]:
+            # memberships of ben and alice are cached after the first requests:
+            num_queries = 3 if pk == 1 else 2
             self.assert_authentication_required(lambda: get_response(pk))
-            self.assert_membership_required(lambda: get_response(pk))
-            self.assert_group_admin_rights_required(lambda: get_response(pk))
+            self.assert_membership_required(lambda: get_response(pk), num_queries)
+            self.assert_group_admin_rights_required(lambda: get_response(pk), num_queries)
 
         self.assertEqual(len(self._load_group_messages()), self.num_messages)
 
@@ -128,7 +196,8 @@ class ChatMessageListTest(SetupChatDataMixin, APITestCase):
         self.login_as("bob")
 
         for pk in [1,2]:
-            with self.assertNumQueries(5):
+            # (1-2) request.user (3) membership check (cached after the first request)
+            with self.assertNumQueries(5 if pk == 1 else 4):
                 response = get_response(pk)
                 self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
                 self.assertEqual(response.data, None)
@@ -6,5 +6,6 @@ from . import views
 app_name = "chat"
 urlpatterns = [
     path('', views.ChatMessageList.as_view(), name="community-chat"),
+    path('wait/', views.ChatMessageWait.as_view(), name="community-chat-wait"),
     path('<int:message_id>/', views.ChatMessageDetail.as_view(), name="community-chat-message"),
 ]
\ No newline at end of file
@@ -1,11 +1,17 @@
-from django.shortcuts import get_object_or_404
+import math
+
 from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import generics, status, permissions
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import ValidationError
 
+from .broker import get_channel_name, publish_event
 from .models import ChatMessage
+from .pagination import ChatPagination
+from .polling import set_last_message_id, wait_for_messages, waiting_slot
 from .serializers import ChatMessageSerializer
 
 from quizzz.common.permissions import IsAuthenticated
@@ -33,17 +39,12 @@ class RoundPlayedOrAuthored(permissions.BasePermission):
         return False
 
 
-class ChatPagination(PageNumberPagination):
-    page_size = settings.QUIZZZ_CHAT_PAGE_SIZE
-
-
-class ChatMessageList(generics.ListCreateAPIView):
+class ChatMessagesMixin:
     """
-    List all chat messages, or create a new chat message.
+    Messages of the community chat or of the round chat (`?round_id=`).
     """
     serializer_class = ChatMessageSerializer
     permission_classes = [IsAuthenticated, IsCommunityMember, RoundPlayedOrAuthored]
-    pagination_class = ChatPagination
 
     def get_queryset(self):
         """
@@ -54,22 +55,76 @@ class ChatMessageList(generics.ListCreateAPIView):
             ChatMessage.objects
             .filter(community_id=self.kwargs['community_id'])
             .select_related('user')
-            .order_by('-time_created')
+            .order_by('-time_created', '-id')
         )
         round_id = self.request.query_params.get('round_id', None)
         queryset = queryset.filter(round_id=round_id)
-        return queryset
+        # `?fields=` (positions of pages are read from `time_created`):
+        return self.get_serializer_class().prune_queryset(queryset, self.request, required=['time_created'])
+
+
+class ChatMessageList(ChatMessagesMixin, generics.ListCreateAPIView):
+    """
+    List all chat messages, or create a new chat message.
+    Messages are paginated by keyset cursors (see ChatPagination).
+    """
+    pagination_class = ChatPagination
 
     def perform_create(self, serializer):
         """
         This method allows us to modify how the instance save is managed.
         Associate the user and the community with the created message.
         """
-        serializer.save(
+        message = serializer.save(
             user=self.request.user, 
             community_id=self.kwargs['community_id'],
             round_id = self.request.query_params.get('round_id', None),
         )
+        # fan out to connected members (see `quizzz.chat.events`):
+        channel = get_channel_name(message.community_id, message.round_id)
+        data = serializer.data
+        transaction.on_commit(lambda: set_last_message_id(message.community_id, message.round_id, message.id))
+        transaction.on_commit(lambda: publish_event(channel, "message", data))
+
+
+class ChatMessageWait(ChatMessagesMixin, generics.GenericAPIView):
+    """
+    Long polling for sync workers: wait up to `?timeout=` seconds (at most
+    QUIZZZ_CHAT_LONG_POLL_SECONDS) for messages with id greater than `?after=`.
+    Returns {"results": [...]}: up to a page of new messages (newest first),
+    or an empty list on timeout. Waiting does not query the chat (see `quizzz.chat.polling`).
+    When too many requests of the process are waiting, new messages are returned without waiting.
+    """
+    # requests block a worker, they are not run in batches (see `quizzz.common.batch`):
+    batchable = False
+
+    def get(self, request, community_id):
+        errors = {}
+        try:
+            after_id = int(request.query_params.get('after', ''))
+        except ValueError:
+            errors["after"] = ["A valid integer is required."]
+        try:
+            timeout = float(request.query_params.get('timeout', settings.QUIZZZ_CHAT_LONG_POLL_SECONDS))
+            if not math.isfinite(timeout):   # `nan` would never time out
+                raise ValueError
+        except ValueError:
+            errors["timeout"] = ["A valid number is required."]
+        if errors:
+            raise ValidationError(errors)
+        timeout = min(max(timeout, 0), settings.QUIZZZ_CHAT_LONG_POLL_SECONDS)
+
+        with waiting_slot() as may_wait:
+            messages = wait_for_messages(
+                self.get_queryset(),
+                community_id,
+                request.query_params.get('round_id', None),
+                after_id,
+                timeout if may_wait else 0,
+                limit=ChatPagination.page_size,
+            )
+        serializer = self.get_serializer(messages, many=True)
+        return Response({"results": serializer.data})
 
 
 # Non-generic version of the code above (without pagination):
@@ -103,5 +158,7 @@ class ChatMessageDetail(APIView):
 
     def delete(self, request, community_id, message_id):
         message = get_object_or_404(ChatMessage.objects.filter(pk=message_id))
+        channel = get_channel_name(message.community_id, message.round_id)
         message.delete()
+        transaction.on_commit(lambda: publish_event(channel, "message_deleted", {"id": message_id}))
         return Response(status=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,125 @@
+"""
+Batch API: several GET requests in one round trip.
+
+    POST /api/batch/
+    {"requests": [{"url": "/api/communities/1/tournaments/"}, {"url": "/api/communities/1/chat/?page=1"}]}
+
+    {"responses": [{"url": ..., "status": 200, "body": [...]}, {"url": ..., "status": 403, "body": {...}}]}
+
+Sub-requests are resolved with the project's urlconf and run in the process
+by the same API views (permissions and throttles of the views apply). They share
+the session and the user of the batch request, and memberships are resolved
+once per community (same as `MembershipMiddleware` does for each request).
+
+Views that block (e.g. long polling) set `batchable = False` and are refused.
+"""
+import logging
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.http import HttpRequest, QueryDict
+from django.urls import Resolver404, resolve
+from rest_framework import exceptions, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from quizzz.communities.memberships import get_membership
+from .exceptions import custom_exception_handler
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    url = serializers.CharField(max_length=2000)
+    method = serializers.ChoiceField(choices=["GET"], default="GET")
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+
+    def validate_requests(self, requests):
+        if len(requests) > settings.QUIZZZ_BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"Ensure this field has no more than {settings.QUIZZZ_BATCH_MAX_REQUESTS} elements."
+            )
+        return requests
+
+
+class Batch(APIView):
+    """
+    Run GET requests of the API in one request (see the module docstring).
+    """
+    # each sub-request is throttled by its view:
+    throttle_classes = []
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        self.memberships = {}
+        responses = [
+            self.run(request, sub_request["url"])
+            for sub_request in serializer.validated_data["requests"]
+        ]
+        return Response({"responses": responses})
+
+    def run(self, request, url):
+        parts = urlsplit(url)
+        try:
+            match = resolve(parts.path)
+        except Resolver404:
+            match = None
+        view_class = getattr(match, "func", None) and getattr(match.func, "cls", None)
+        if not (parts.path.startswith("/api/") and view_class and issubclass(view_class, APIView)) \
+                or issubclass(view_class, Batch):
+            return self.get_error(url, exceptions.NotFound())
+        if not getattr(view_class, "batchable", True):
+            return self.get_error(url, exceptions.ParseError("Not supported in batches."))
+
+        sub_request = self.get_sub_request(request._request, parts, match)
+        try:
+            response = match.func(sub_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception("Batch sub-request %s failed", url)
+            return self.get_error(url, exceptions.APIException())
+        if not isinstance(response, Response):
+            response.close()
+            return self.get_error(url, exceptions.ParseError("Not supported in batches."))
+        return {"url": url, "status": response.status_code, "body": response.data}
+
+    def get_sub_request(self, http_request, parts, match):
+        """
+        GET request to the resolved view sharing the session, the user
+        and memberships of the batch request.
+        """
+        sub_request = HttpRequest()
+        sub_request.method = "GET"
+        sub_request.path = sub_request.path_info = parts.path
+        sub_request.META = {
+            key: value for key, value in http_request.META.items()
+            if key not in ("CONTENT_LENGTH", "CONTENT_TYPE")
+        }
+        sub_request.META.update({
+            "REQUEST_METHOD": "GET",
+            "PATH_INFO": parts.path,
+            "QUERY_STRING": parts.query,
+        })
+        sub_request.GET = QueryDict(parts.query)
+        sub_request.COOKIES = http_request.COOKIES
+        sub_request.session = http_request.session
+        sub_request.user = http_request.user
+        sub_request.resolver_match = match
+
+        community_id = match.kwargs.get("community_id")
+        if community_id not in self.memberships:
+            self.memberships[community_id] = None
+            if community_id and sub_request.user.is_authenticated:
+                self.memberships[community_id] = get_membership(sub_request.user.id, community_id)
+        sub_request.membership = self.memberships[community_id]
+        return sub_request
+
+    @staticmethod
+    def get_error(url, exc):
+        response = custom_exception_handler(exc, {})
+        return {"url": url, "status": response.status_code, "body": response.data}
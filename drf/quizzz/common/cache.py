@@ -0,0 +1,96 @@
+"""
+Cache helpers (on top of the default Django cache).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache
+
+
+# Threads of the same process building the same key wait on one of these locks
+# (a fixed set of locks is enough: a collision only makes unrelated keys wait):
+_process_locks = [threading.Lock() for _ in range(64)]
+
+
+def get_or_build(key, build, timeout=None, lock_timeout=10, wait_timeout=5, poll_interval=0.02):
+    """
+    Return the cached value of <key> or call `build()` and cache its result.
+
+    Loading is single-flight: when many requests miss the same key at once,
+    only one of them calls `build()` (a lock is taken with `cache.add()` across
+    processes and with a thread lock within the process), the others wait for
+    the value to appear in the cache. If the builder does not finish within
+    <wait_timeout> seconds, waiting requests build the value themselves.
+
+    `build()` must not return None (None is a cache miss).
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    with _process_locks[hash(key) % len(_process_locks)]:
+        value = cache.get(key)
+        if value is not None:
+            return value
+
+        lock_key = f'{key}:lock'
+        is_locked = cache.add(lock_key, 1, lock_timeout)
+        if not is_locked:
+            # another process is building the value:
+            deadline = time.monotonic() + wait_timeout
+            while time.monotonic() < deadline:
+                time.sleep(poll_interval)
+                value = cache.get(key)
+                if value is not None:
+                    return value
+
+        try:
+            value = build()
+            cache.set(key, value, timeout)
+        finally:
+            if is_locked:
+                cache.delete(lock_key)
+        return value
+
+
+class LocalLRUCache:
+    """
+    Small thread-safe least-recently-used cache that lives in the process memory.
+    Use it in front of the shared cache for small immutable values read on hot paths
+    (or for mutable values with a short <ttl> in seconds: other processes
+    cannot invalidate them and may read stale values until they expire).
+    """
+    def __init__(self, maxsize, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._data.move_to_end(key)
+            except KeyError:
+                return None
+            value, expires = self._data[key]
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
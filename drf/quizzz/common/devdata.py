@@ -5,7 +5,7 @@ from quizzz.users.models import CustomUser
 from quizzz.communities.models import Community
 from quizzz.chat.models import ChatMessage
 from quizzz.quizzes.models import Quiz, Question, Option
-from quizzz.tournaments.models import Tournament, Round
+from quizzz.tournaments.models import Tournament, Round, TournamentStanding
 
 
 NOW = timezone.now()
@@ -293,4 +293,5 @@ def create_round():
     Round.objects.create(**{
         "start_time": NOW,
         "finish_time": NOW + datetime.timedelta(minutes=60),
-    }, quiz=quiz, tournament=tournament)
\ No newline at end of file
+    }, quiz=quiz, tournament=tournament)
+    TournamentStanding.rebuild(tournament)
\ No newline at end of file
@@ -0,0 +1,30 @@
+"""
+Custom database functions (in addition to `django.db.models.functions`).
+"""
+from django.db.models import Func, FloatField
+
+
+class DurationInSeconds(Func):
+    """
+    Convert a duration expression (e.g. a difference of two DateTimeFields
+    wrapped into `ExpressionWrapper(..., output_field=DurationField())`)
+    into a number of seconds.
+
+    PostgreSQL returns such differences as intervals, while SQLite
+    (through Django's `django_timestamp_diff` function) returns microseconds.
+    """
+    output_field = FloatField()
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='EXTRACT(EPOCH FROM %(expressions)s)::double precision',
+            **extra_context
+        )
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection,
+            template='(%(expressions)s / 1000000.0)',
+            **extra_context
+        )
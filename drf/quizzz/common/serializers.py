@@ -0,0 +1,167 @@
+"""
+Sparse fieldsets: `?fields=` and `?expand=` query parameters of GET requests prune
+serializer output and the queryset the serializer reads.
+
+- no `?fields=`: the full representation (as without the mixin);
+- `?fields=id,text,user`: only listed fields, nested objects as their primary keys;
+- `?fields=id,user.username`: subfields of a nested object;
+- `?fields=id,user&expand=user`: the whole nested object (dotted paths
+  like `expand=quiz.user` expand objects nested deeper).
+
+Unknown field names are ignored.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+
+
+EXPANDED = '*'
+
+
+def parse_fieldset(fields, expand=''):
+    """
+    Return {field name: None (a field or a primary key), EXPANDED or {subfield: ...}}.
+    """
+    spec = {}
+    for path in filter(None, fields.split(',')):
+        node = spec
+        *parents, name = path.strip().split('.')
+        for parent in parents:
+            if not isinstance(node.get(parent), dict):
+                node[parent] = {}
+            node = node[parent]
+        node.setdefault(name, None)
+
+    for path in filter(None, expand.split(',')):
+        node = spec
+        for name in path.strip().split('.'):
+            if node.get(name) is None:
+                node[name] = EXPANDED
+            if not isinstance(node[name], dict):
+                break
+            node = node[name]
+    return spec
+
+
+def prune_fields(fields, spec):
+    """
+    Prune a dict of serializer fields by a parsed fieldset (nested serializers in place).
+    """
+    for name, field in list(fields.items()):
+        if name not in spec:
+            del fields[name]
+            continue
+        if not isinstance(field, serializers.BaseSerializer) or spec[name] == EXPANDED:
+            continue
+        if spec[name] is None:
+            kwargs = {'read_only': True, 'many': isinstance(field, serializers.ListSerializer)}
+            if field.source and field.source != name:
+                kwargs['source'] = field.source
+            fields[name] = serializers.PrimaryKeyRelatedField(**kwargs)
+        else:
+            child = getattr(field, 'child', field)
+            prune_fields(child.fields, spec[name])
+
+
+def get_source_paths(serializer, fields):
+    """
+    Return lookups (`text`, `user__username`) of model fields read by <fields>
+    of a model serializer or None if they are not known.
+    Fields that are not model fields (e.g. methods) declare the lookups
+    they need in `Meta.sparse_field_sources`.
+    """
+    model = serializer.Meta.model
+    sources = getattr(serializer.Meta, 'sparse_field_sources', {})
+    paths = []
+    for name, field in fields.items():
+        if name in sources:
+            paths.extend(sources[name])
+            continue
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        if isinstance(field, serializers.BaseSerializer):
+            if isinstance(field, serializers.ListSerializer) or not hasattr(field, 'Meta'):
+                return None
+            nested_paths = get_source_paths(field, field.fields)
+            if nested_paths is None:
+                return None
+            paths.extend(f'{field.source}__{path}' for path in nested_paths)
+        paths.append(field.source)
+    return paths
+
+
+def get_select_related_paths(select_related, prefix=''):
+    return [
+        path
+        for name, nested in select_related.items()
+        for path in [prefix + name] + get_select_related_paths(nested, prefix + name + '__')
+    ]
+
+
+class SparseFieldsetsMixin:
+    """
+    Serializer mixin honoring `?fields=` and `?expand=` of the request in the context
+    (see the module docstring). Views prune querysets with `prune_queryset()`.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def get_fieldset(self):
+        """
+        Return the parsed fieldset of the request or None (all fields).
+        """
+        request = self.context.get('request')
+        root = self.parent if isinstance(self.parent, serializers.ListSerializer) else self
+        if request is None or request.method != 'GET' or root is not self.root:
+            return None
+        fields = request.query_params.get(self.fields_query_param)
+        if not fields:
+            return None
+        return parse_fieldset(fields, request.query_params.get(self.expand_query_param, ''))
+
+    def get_fields(self):
+        fields = super().get_fields()
+        spec = self.get_fieldset()
+        if spec is not None:
+            prune_fields(fields, spec)
+        return fields
+
+    @classmethod
+    def prune_queryset(cls, queryset, request, required=()):
+        """
+        Load only columns of requested fields (and <required> ones, e.g. used by
+        pagination) and join only relations of requested nested objects
+        (relations not joined by <queryset> are not joined either).
+        """
+        serializer = cls(context={'request': request})
+        if serializer.get_fieldset() is None:
+            return queryset
+        paths = get_source_paths(serializer, serializer.fields)
+        if paths is None:
+            return queryset
+        paths += list(required)
+
+        select_related = queryset.query.select_related
+        if select_related is True:
+            return queryset.only(*paths)
+        joined = set(get_select_related_paths(select_related or {}))
+
+        relations, columns = set(), set()
+        for path in paths:
+            parts = path.split('__')
+            # the longest joined relation of the path, the rest is read from its columns:
+            depth = 0
+            while depth < len(parts) - 1 and '__'.join(parts[:depth + 1]) in joined:
+                depth += 1
+            for i in range(1, depth + 1):
+                relations.add('__'.join(parts[:i]))
+            columns.add('__'.join(parts[:depth + 1]))
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*sorted(relations))
+        return queryset.only(*sorted(columns | relations))
@@ -1,11 +1,20 @@
+from django.core.cache import caches
 from django.db import connection
 from rest_framework import status
 
+from quizzz.communities.memberships import clear_local_cache as clear_local_membership_cache
+
 
 class BaseTestUtils:
     """
     Base test mixin with some helpers to avoid code repetition.
     """
+    def _pre_setup(self):
+        # cached data (e.g. memberships) would outlive test transactions rolled back:
+        caches['default'].clear()
+        clear_local_membership_cache()
+        super()._pre_setup()
+
     def assert_not_authenticated(self, response):
         # why not 401? see:
         # https://www.django-rest-framework.org/api-guide/authentication/#unauthorized-and-forbidden-responses
@@ -24,6 +24,7 @@ class SetupCommunityDataMixin(SetupUsersMixin):
         for membership in MEMBERSHIPS.values():
             if not membership["is_admin"]:
                 Membership.objects.create(**membership)
+        Community.count_members()
         
         cls.COMMUNITIES = COMMUNITIES
         cls.MEMBERSHIPS = MEMBERSHIPS
@@ -32,7 +33,7 @@ class SetupCommunityDataMixin(SetupUsersMixin):
         cls.GROUP = "group1"
         cls.GROUP_ID = cls.COMMUNITIES[cls.GROUP]["id"]
 
-    def assert_membership_required(self, get_response):
+    def assert_membership_required(self, get_response, num_queries=3):
         """
         Helper method to check permissions for 'group1' (default self.GROUP).
         Send request as 'ben' who is not a member of 'group1'.
@@ -40,7 +41,7 @@ class SetupCommunityDataMixin(SetupUsersMixin):
         if self.GROUP != "group1":
             raise RuntimeError("self.GROUP must be 'group1'")
         self.login_as("ben")
-        with self.assertNumQueries(3):
+        with self.assertNumQueries(num_queries):
             self.assert_not_authorized(get_response())
 
     def assert_group_admin_rights_required(self, get_response, num_queries=3):
@@ -0,0 +1,79 @@
+import json
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+
+class BatchTest(SetupRoundsMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('batch')
+        self.community_url = reverse('communities:community-detail', kwargs={"community_id": self.GROUP_ID})
+        self.tournaments_url = reverse('tournaments:tournament-list-create', kwargs={"community_id": self.GROUP_ID})
+        self.rounds_url = reverse('tournaments:round-list-create', kwargs={
+            "community_id": self.GROUP_ID,
+            "tournament_id": self.TOURNAMENTS["tournament1"]["id"],
+        })
+
+    def batch(self, *urls):
+        return self.client.post(self.url, {"requests": [{"url": url} for url in urls]})
+
+    def test_normal(self):
+        self.login_as("alice")
+        group3_url = reverse('communities:community-detail', kwargs={"community_id": self.COMMUNITIES["group3"]["id"]})
+        urls = [self.community_url, self.tournaments_url, self.rounds_url + "?x=1", group3_url, "/api/unknown/"]
+
+        response = self.batch(*urls)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        responses = response.json()["responses"]
+        self.assertListEqual([r["url"] for r in responses], urls)
+        self.assertListEqual([r["status"] for r in responses], [200, 200, 200, 403, 404])
+
+        # bodies are the same as of separate requests to API views:
+        for url, sub_response in zip(urls[:-1], responses):
+            self.assertEqual(sub_response["body"], json.loads(self.client.get(url).content))
+
+    def test_query_budget(self):
+        """
+        The session, the user and the membership are loaded once for all sub-requests.
+        """
+        self.login_as("alice")
+        with self.assertNumQueries(7):
+            # (1-2) request.user (3) membership (4) community (5) tournaments (6) rounds (7) user plays
+            response = self.batch(self.community_url, self.tournaments_url, self.rounds_url)
+        self.assertListEqual([r["status"] for r in response.data["responses"]], [200, 200, 200])
+
+    def test_permissions_of_views_apply(self):
+        response = self.batch(self.community_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["responses"][0]["status"], status.HTTP_403_FORBIDDEN)
+
+    def test_unsupported_requests(self):
+        self.login_as("bob")
+        export_url = reverse('communities:community-export', kwargs={"community_id": self.GROUP_ID})
+        response = self.batch(export_url, self.url, "/admin/")
+        self.assertListEqual([r["status"] for r in response.data["responses"]], [400, 404, 404])
+
+        # blocking views:
+        wait_url = reverse('chat:community-chat-wait', kwargs={"community_id": self.GROUP_ID})
+        response = self.batch(wait_url + "?after=0&timeout=20")
+        self.assertEqual(response.data["responses"][0]["status"], status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["responses"][0]["body"], {"detail": "Not supported in batches."})
+
+    @override_settings(QUIZZZ_BATCH_MAX_REQUESTS=2)
+    def test_validation(self):
+        self.login_as("alice")
+
+        response = self.batch(self.community_url, self.community_url, self.community_url)
+        self.assert_validation_failed(response, data={
+            "requests": ["Ensure this field has no more than 2 elements."],
+        })
+
+        response = self.client.post(self.url, {"requests": [{"url": self.community_url, "method": "DELETE"}]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, {"requests": []})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
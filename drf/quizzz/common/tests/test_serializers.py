@@ -0,0 +1,135 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+from quizzz.chat.models import ChatMessage
+
+from ..serializers import parse_fieldset, EXPANDED
+
+
+class ParseFieldsetTest(APITestCase):
+
+    def test_parse(self):
+        self.assertDictEqual(parse_fieldset("id,text,user"), {"id": None, "text": None, "user": None})
+        self.assertDictEqual(
+            parse_fieldset("id,user.username,quiz.user.id"),
+            {"id": None, "user": {"username": None}, "quiz": {"user": {"id": None}}},
+        )
+        self.assertDictEqual(parse_fieldset("id,user", "user"), {"id": None, "user": EXPANDED})
+        self.assertDictEqual(
+            parse_fieldset("id,quiz.name", "quiz.user"),
+            {"id": None, "quiz": {"name": None, "user": EXPANDED}},
+        )
+        self.assertDictEqual(parse_fieldset(""), {})
+
+
+class SparseFieldsetsTest(SetupRoundsMixin, APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        ChatMessage.objects.create(
+            community_id=cls.COMMUNITIES["group1"]["id"], user_id=cls.USERS["bob"]["id"], text="hello")
+
+    def setUp(self):
+        self.chat_url = reverse('chat:community-chat', kwargs={"community_id": self.GROUP_ID})
+        self.rounds_url = reverse('tournaments:round-list-create', kwargs={
+            "community_id": self.GROUP_ID,
+            "tournament_id": self.TOURNAMENTS["tournament1"]["id"],
+        })
+        self.login_as("alice")
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, context.captured_queries[-1]["sql"]
+
+    def test_chat(self):
+        full = self.client.get(self.chat_url).data["results"][0]
+
+        response, sql = self.get(self.chat_url, {"fields": "id,text,user.username"})
+        message = response.data["results"][0]
+        self.assertDictEqual(message, {"id": full["id"], "text": "hello", "user": {"username": "bob"}})
+        self.assertNotIn("email", sql)
+
+        response, sql = self.get(self.chat_url, {"fields": "id,user"})
+        self.assertDictEqual(response.data["results"][0], {"id": full["id"], "user": self.USERS["bob"]["id"]})
+        self.assertNotIn("JOIN", sql)
+
+        response, sql = self.get(self.chat_url, {"fields": "id,user", "expand": "user"})
+        self.assertDictEqual(response.data["results"][0], {"id": full["id"], "user": full["user"]})
+
+        # unknown fields are ignored:
+        response, sql = self.get(self.chat_url, {"fields": "text,unknown"})
+        self.assertDictEqual(response.data["results"][0], {"text": "hello"})
+
+    def test_rounds(self):
+        full = self.client.get(self.rounds_url).data[0]
+
+        response, sql = self.get(self.rounds_url, {"fields": "id,status,quiz"})
+        self.assertDictEqual(response.data[0], {
+            "id": full["id"], "status": full["status"], "quiz": full["quiz"]["id"],
+        })
+        self.assertNotIn("JOIN", sql)
+
+        response, sql = self.get(self.rounds_url, {"fields": "id,quiz.name,is_author,user_play_id"})
+        self.assertDictEqual(response.data[0], {
+            "id": full["id"],
+            "quiz": {"name": full["quiz"]["name"]},
+            "is_author": full["is_author"],
+            "user_play_id": full["user_play_id"],
+        })
+
+        # the number of queries is the same as without `?fields=`:
+        with self.assertNumQueries(4):
+            # (1-2) request.user (3) rounds (4) user plays
+            self.client.get(self.rounds_url, {"fields": "id,quiz.user.username", "expand": "quiz"})
+
+    def test_other_lists(self):
+        response, sql = self.get(
+            reverse('communities:community-members', kwargs={"community_id": self.GROUP_ID}),
+            {"fields": "user.username,is_admin"})
+        self.assertCountEqual(response.data, [
+            {"user": {"username": "bob"}, "is_admin": True},
+            {"user": {"username": "alice"}, "is_admin": False},
+        ])
+        self.assertNotIn("last_login", sql)
+
+        response, sql = self.get(
+            reverse('tournaments:tournament-list-create', kwargs={"community_id": self.GROUP_ID}),
+            {"fields": "id,name"})
+        self.assertListEqual(list(response.data[0].keys()), ["id", "name"])
+
+        self.login_as("bob")
+        response, sql = self.get(
+            reverse('quizzes:quiz-list-create', kwargs={"community_id": self.GROUP_ID}),
+            {"fields": "id,user"})
+        self.assertTrue(response.data)
+        self.assertTrue(all(quiz == {"id": quiz["id"], "user": self.USERS["bob"]["id"]} for quiz in response.data))
+
+    def test_only_get_requests(self):
+        """
+        Fields of other requests (e.g. updates validated by the same serializer) are not pruned.
+        """
+        self.login_as("bob")
+        url = reverse('tournaments:tournament-detail', kwargs={
+            "community_id": self.GROUP_ID,
+            "tournament_id": self.TOURNAMENTS["tournament1"]["id"],
+        })
+        response = self.client.put(url + "?fields=id", {"name": "Renamed", "is_active": True})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Renamed")
+
+    def test_no_fields(self):
+        self.assertEqual(
+            self.client.get(self.chat_url, {"expand": "user"}).data,
+            self.client.get(self.chat_url).data,
+        )
+        self.assertEqual(
+            self.client.get(self.rounds_url, {"fields": ""}).data,
+            self.client.get(self.rounds_url).data,
+        )
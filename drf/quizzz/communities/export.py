@@ -0,0 +1,109 @@
+"""
+Streaming NDJSON export of a community: one JSON record per line, e.g.
+{"type": "quiz", "id": 1, "user_id": 2, "name": "Quiz One", ...}
+
+Records are grouped by type in this order: community, member, tournament, quiz,
+question, option, round, play, answer (answers packed into plays follow their
+play records). Rows are read with `.values().iterator()`
+in chunks and written line by line, so memory use does not depend on the size
+of the community (records are read by several queries, not from one snapshot).
+"""
+import json
+import zlib
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from quizzz.plays.answer_keys import get_answer_key
+from .models import Community
+
+
+# type: (model, fields, lookup of the community id)
+EXPORTED_MODELS = [
+    ("member", "communities.Membership",
+        ["user_id", "is_admin", "is_approved", "time_created"], "community_id"),
+    ("tournament", "tournaments.Tournament",
+        ["id", "name", "is_active", "time_created"], "community_id"),
+    ("quiz", "quizzes.Quiz",
+        ["id", "user_id", "name", "description", "introduction", "is_finalized",
+            "time_created", "time_updated"], "community_id"),
+    ("question", "quizzes.Question",
+        ["id", "quiz_id", "text", "explanation"], "quiz__community_id"),
+    ("option", "quizzes.Option",
+        ["id", "question_id", "text", "is_correct"], "question__quiz__community_id"),
+    ("round", "tournaments.Round",
+        ["id", "tournament_id", "quiz_id", "start_time", "finish_time"], "tournament__community_id"),
+    ("play", "plays.Play",
+        ["id", "round_id", "user_id", "is_submitted", "result", "start_time", "finish_time",
+            "client_start_time", "client_finish_time"], "round__tournament__community_id"),
+    ("answer", "plays.PlayAnswer",
+        ["play_id", "question_id", "option_id"], "play__round__tournament__community_id"),
+]
+GZIP_BUFFER_SIZE = 64 * 1024
+
+
+def iter_records(community_id, chunk_size=None):
+    """
+    Yield records (dicts) of all data of the community.
+    """
+    chunk_size = chunk_size or settings.QUIZZZ_EXPORT_CHUNK_SIZE
+    community = Community.objects\
+        .filter(pk=community_id)\
+        .values("id", "name", "time_created")\
+        .get()
+    yield {"type": "community", **community}
+
+    for type, model_name, fields, community_lookup in EXPORTED_MODELS:
+        model = apps.get_model(model_name)
+        rows = model.objects\
+            .filter(**{community_lookup: community_id})\
+            .order_by("id")\
+            .values(*fields)
+        if type == "play":
+            # packed answers are unpacked with answer keys of quizzes:
+            rows = rows.values(*fields, "packed_answers", "round__quiz_id", "round__quiz__time_updated")
+            yield from iter_plays(rows, chunk_size)
+            continue
+        for row in rows.iterator(chunk_size=chunk_size):
+            yield {"type": type, **row}
+
+
+def iter_plays(rows, chunk_size):
+    """
+    Yield records of plays followed by records of their packed answers
+    (answers stored as `PlayAnswer` rows are exported separately).
+    """
+    Quiz = apps.get_model("quizzes.Quiz")
+    for row in rows.iterator(chunk_size=chunk_size):
+        packed_answers = row.pop("packed_answers")
+        quiz = Quiz(id=row.pop("round__quiz_id"), time_updated=row.pop("round__quiz__time_updated"))
+        yield {"type": "play", **row}
+        if packed_answers is not None:
+            for question_id, option_id in get_answer_key(quiz).unpack(packed_answers):
+                yield {"type": "answer", "play_id": row["id"], "question_id": question_id, "option_id": option_id}
+
+
+def iter_ndjson(community_id, chunk_size=None):
+    """
+    Yield lines of the NDJSON export (bytes).
+    """
+    for record in iter_records(community_id, chunk_size):
+        yield (json.dumps(record, cls=DjangoJSONEncoder) + "\n").encode("utf-8")
+
+
+def iter_gzipped(lines, buffer_size=GZIP_BUFFER_SIZE):
+    """
+    Compress <lines> (bytes) into a gzip stream yielding compressed chunks
+    of roughly <buffer_size> of input.
+    """
+    compressor = zlib.compressobj(wbits=16 + zlib.MAX_WBITS)   # gzip header and trailer
+    buffer, buffered_size = [], 0
+    for line in lines:
+        buffer.append(line)
+        buffered_size += len(line)
+        if buffered_size >= buffer_size:
+            chunk = compressor.compress(b"".join(buffer))
+            buffer, buffered_size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b"".join(buffer)) + compressor.flush()
@@ -0,0 +1,41 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzz.communities.export import iter_ndjson, iter_gzipped
+from quizzz.communities.models import Community
+
+
+class Command(BaseCommand):
+    help = (
+        'Exports quizzes, rounds, plays and answers of a community as NDJSON '
+        '(one JSON record per line) streamed to a file or to stdout.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('community_id', type=int,
+            help='Community to export.')
+        parser.add_argument('--output', '-o',
+            help='File to write (stdout by default).')
+        parser.add_argument('--gzip', action='store_true',
+            help='Compress the output with gzip.')
+        parser.add_argument('--chunk-size', type=int,
+            help='Number of rows fetched at once (QUIZZZ_EXPORT_CHUNK_SIZE by default).')
+
+    def handle(self, *args, **options):
+        if not Community.objects.filter(pk=options['community_id']).exists():
+            raise CommandError(f'Community {options["community_id"]} does not exist.')
+
+        chunks = iter_ndjson(options['community_id'], options['chunk_size'])
+        if options['gzip']:
+            chunks = iter_gzipped(chunks)
+
+        if options['output']:
+            with open(options['output'], 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            self.stdout.write(self.style.SUCCESS(f'Community {options["community_id"]} exported to {options["output"]}.'))
+        else:
+            output = getattr(self.stdout, 'buffer', None) or sys.stdout.buffer
+            for chunk in chunks:
+                output.write(chunk)
+            output.flush()
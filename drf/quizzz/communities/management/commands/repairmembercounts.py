@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from quizzz.communities.models import Community
+
+
+class Command(BaseCommand):
+    help = (
+        'Recounts members of communities and repairs stored member counts '
+        '(e.g. after memberships were created by bulk inserts or changed with raw SQL).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('community_ids', nargs='*', type=int,
+            help='Communities to process (all communities by default).')
+        parser.add_argument('--check', action='store_true',
+            help='Only report communities with wrong counts without repairing them.')
+
+    def handle(self, *args, **options):
+        communities = Community.objects.order_by('id')
+        if options['community_ids']:
+            communities = communities.filter(pk__in=options['community_ids'])
+        rows = communities\
+            .annotate(num_members=Count('membership'))\
+            .values_list('id', 'member_count', 'num_members')
+
+        drifted_ids = []
+        for community_id, member_count, num_members in rows:
+            if member_count != num_members:
+                self.stderr.write(f'Community {community_id}: stored {member_count}, counted {num_members}')
+                drifted_ids.append(community_id)
+
+        if drifted_ids and options['check']:
+            raise CommandError(f'{len(drifted_ids)} member count(s) are wrong.')
+        if drifted_ids:
+            # recount in the update (memberships may have changed meanwhile):
+            Community.count_members(drifted_ids)
+            self.stdout.write(self.style.SUCCESS(f'Repaired member counts of {len(drifted_ids)} community(ies).'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Member counts are correct.'))
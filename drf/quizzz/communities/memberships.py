@@ -0,0 +1,70 @@
+"""
+Cached memberships of users in communities.
+
+Every community-scoped request needs the membership of the user (see
+`MembershipMiddleware`), so memberships are kept in two tiers: in the memory
+of each process for a few seconds and in the shared cache. Users who are not
+members are cached too. Entries are invalidated by signals (see `signals`)
+when a membership is created, changed or deleted; other processes may keep
+their local copies up to QUIZZZ_MEMBERSHIP_LOCAL_CACHE_SECONDS.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from quizzz.common.cache import LocalLRUCache, get_or_build
+from .models import Membership
+
+
+_local_cache = LocalLRUCache(
+    settings.QUIZZZ_MEMBERSHIP_LOCAL_CACHE_SIZE,
+    ttl=settings.QUIZZZ_MEMBERSHIP_LOCAL_CACHE_SECONDS,
+)
+
+
+def get_membership_key(user_id, community_id):
+    return f'membership:{user_id}:{community_id}'
+
+
+def load_membership(user_id, community_id):
+    # False stands for "not a member" (None is a cache miss):
+    return (
+        Membership.objects.filter(community_id=community_id, user_id=user_id).first()
+        or False
+    )
+
+
+def get_membership(user_id, community_id):
+    """
+    Return the Membership of the user in the community or None.
+    """
+    key = get_membership_key(user_id, int(community_id))
+    membership = _local_cache.get(key)
+    if membership is None:
+        membership = get_or_build(
+            key,
+            lambda: load_membership(user_id, community_id),
+            timeout=settings.QUIZZZ_MEMBERSHIP_CACHE_SECONDS,
+        )
+        _local_cache.set(key, membership)
+    return membership or None
+
+
+def invalidate_membership(user_id, community_id):
+    """
+    Drop cached membership of the user in the community: right away and
+    once the transaction is committed (requests running meanwhile could
+    cache the membership as it was before the transaction).
+    """
+    key = get_membership_key(user_id, int(community_id))
+
+    def delete():
+        cache.delete(key)
+        _local_cache.delete(key)
+
+    delete()
+    transaction.on_commit(delete)
+
+
+def clear_local_cache():
+    _local_cache.clear()
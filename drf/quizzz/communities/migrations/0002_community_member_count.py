@@ -0,0 +1,33 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:14
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def count_members(apps, schema_editor):
+    Community = apps.get_model('communities', 'Community')
+    Membership = apps.get_model('communities', 'Membership')
+    num_members = Membership.objects\
+        .filter(community_id=OuterRef('pk'))\
+        .order_by()\
+        .values('community_id')\
+        .annotate(count=Count('*'))\
+        .values('count')
+    Community.objects.update(member_count=Coalesce(Subquery(num_members), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='community',
+            name='member_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(count_members, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
-from django.db import models, IntegrityError
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.conf import settings
 
 from quizzz.common.models import TimeStampedModel
@@ -10,6 +12,8 @@ class Community(TimeStampedModel):
     password = models.CharField(max_length=20, blank=True)
     approval_required = models.BooleanField(default=False)
     max_members = models.IntegerField(default=100)
+    # number of memberships (approved or not), kept by `join` and `signals.membership_deleted`:
+    member_count = models.PositiveIntegerField(default=0)
 
     members = models.ManyToManyField(settings.AUTH_USER_MODEL, 
         related_name="communities", through='Membership')
@@ -24,16 +28,24 @@ class Community(TimeStampedModel):
     def join(self, user):
         """
         Join this community as a regular user.
+        The member count is incremented by a conditional update (concurrent
+        joins cannot exceed `max_members`) and rolled back if the user is a member.
         """
-        if len(self.members.all()) >= self.max_members:
-            raise MemberLimitException()
+        try:
+            with transaction.atomic():
+                is_counted = Community.objects\
+                    .filter(pk=self.pk, member_count__lt=F('max_members'))\
+                    .update(member_count=F('member_count') + 1)
+                if not is_counted:
+                    raise MemberLimitException()
 
-        try: 
-            return Membership.objects.create(
-                user=user,
-                community=self,
-                is_approved=(False if self.approval_required else True),
-            )
+                membership = Membership.objects.create(
+                    user=user,
+                    community=self,
+                    is_approved=(False if self.approval_required else True),
+                )
+            self.member_count += 1
+            return membership
         except IntegrityError as e:
             if 'unique constraint' in str(e).lower():   
                 # using .lower() would make it work for both SQLite and Posgres
@@ -43,7 +55,7 @@ class Community(TimeStampedModel):
 
     @classmethod
     def create(cls, user, **kwargs):
-        community = cls.objects.create(**kwargs)
+        community = cls.objects.create(member_count=1, **kwargs)
         membership = Membership.objects.create(
             user=user,
             community=community,
@@ -52,6 +64,23 @@ class Community(TimeStampedModel):
         )
         return membership
 
+    @classmethod
+    def count_members(cls, community_ids=None):
+        """
+        Recount members of communities (all by default) in a single update,
+        return the number of updated communities.
+        """
+        communities = cls.objects.all()
+        if community_ids is not None:
+            communities = communities.filter(pk__in=community_ids)
+        num_members = Membership.objects\
+            .filter(community_id=OuterRef('pk'))\
+            .order_by()\
+            .values('community_id')\
+            .annotate(count=Count('*'))\
+            .values('count')
+        return communities.update(member_count=Coalesce(Subquery(num_members), 0))
+
 
 
 class Membership(TimeStampedModel):
@@ -65,4 +94,4 @@ class Membership(TimeStampedModel):
         db_table = "memberships"
         constraints = [
             models.UniqueConstraint(fields=['user', 'community'], name='unique_memberships')
-        ]
\ No newline at end of file
+        ]
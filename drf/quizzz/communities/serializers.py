@@ -4,6 +4,7 @@ from rest_framework.settings import api_settings
 
 from .models import Community, Membership
 from .exceptions import MemberLimitException, MemberAlreadyExistsException
+from quizzz.common.serializers import SparseFieldsetsMixin
 
 from django.contrib.auth import get_user_model
 User = get_user_model()
@@ -50,7 +51,7 @@ class JoinCommunitySerializer(serializers.Serializer):
             })
 
 
-class CommunitySerializer(serializers.ModelSerializer):
+class CommunitySerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     class Meta:
         model = Community
         fields = [
@@ -59,9 +60,10 @@ class CommunitySerializer(serializers.ModelSerializer):
             'password',
             'approval_required',
             'max_members',
+            'member_count',
             'time_created',
         ]
-        read_only_fields = ['time_created']
+        read_only_fields = ['member_count', 'time_created']
     
     def enforce_created_communities_limit(self, user):
         num_created_communities = user.membership_set.filter(is_admin=True).count()
@@ -82,7 +84,7 @@ class CommunitySerializer(serializers.ModelSerializer):
 
 
 
-class MembershipSerializer(serializers.ModelSerializer):
+class MembershipSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     community = CommunitySerializer(read_only=True) 
     # nested serializers are read-only by default
     # setting read-only here just to be sure
@@ -112,7 +114,7 @@ class UserForMembershipListSerializer(serializers.ModelSerializer):
         ]
 
 
-class MembershipForMemberListSerializer(serializers.ModelSerializer):
+class MembershipForMemberListSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     user = UserForMembershipListSerializer(read_only=True)
 
     class Meta:
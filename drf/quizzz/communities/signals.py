@@ -0,0 +1,23 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .memberships import invalidate_membership
+from .models import Community, Membership
+
+
+@receiver(post_save, sender=Membership)
+@receiver(post_delete, sender=Membership)
+def membership_changed(sender, instance, **kwargs):
+    invalidate_membership(instance.user_id, instance.community_id)
+
+
+@receiver(post_delete, sender=Membership)
+def membership_deleted(sender, instance, **kwargs):
+    """
+    Decrement the member count of the community, also when memberships are
+    deleted by cascades (e.g. with their users); runs in the transaction of the deletion.
+    """
+    Community.objects\
+        .filter(pk=instance.community_id)\
+        .update(member_count=F('member_count') - 1)
@@ -0,0 +1,105 @@
+import datetime
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+from quizzz.chat.models import ChatMessage
+from quizzz.plays.models import Play
+from quizzz.quizzes.models import Quiz
+from quizzz.tournaments.models import Round, Tournament
+
+from .test_views import COMMUNITY_EXPECTED_KEYS
+
+
+DASHBOARD_EXPECTED_KEYS = ["community", "membership", "tournament", "rounds", "chat"]
+
+
+def create_round(tournament_id, author_id, start_time, finish_time):
+    quiz = Quiz.objects.create(
+        name="Quiz", num_questions=0, num_options=4, is_finalized=True,
+        community_id=Tournament.objects.get(pk=tournament_id).community_id, user_id=author_id)
+    return Round.objects.create(
+        tournament_id=tournament_id, quiz=quiz, start_time=start_time, finish_time=finish_time)
+
+
+class CommunityDashboardTest(SetupRoundsMixin, APITestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        now = timezone.now()
+        for i in range(3):
+            ChatMessage.objects.create(
+                community_id=cls.COMMUNITIES["group1"]["id"], user_id=cls.USERS["bob"]["id"], text=f"message {i}")
+        # a finished round is not shown:
+        create_round(
+            cls.TOURNAMENTS["tournament1"]["id"], cls.USERS["bob"]["id"],
+            now - datetime.timedelta(days=2), now - datetime.timedelta(days=1))
+
+    def setUp(self):
+        self.url = reverse('communities:community-dashboard', kwargs={"community_id": self.GROUP_ID})
+        self.ROUND_ID = self.ROUNDS["round1"]["id"]
+
+    def test_permissions(self):
+        get_response = lambda: self.client.get(self.url)
+
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+    def test_normal(self):
+        self.login_as("alice")
+        Play.objects.create(user_id=self.USERS["alice"]["id"], round_id=self.ROUND_ID)
+
+        with self.assertNumQueries(8):
+            # (1-2) request.user (3) member check (4) community (5) current tournament
+            # (6) rounds with quizzes (7) user plays (8) newest chat messages
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data
+        self.assertListEqual(list(data.keys()), DASHBOARD_EXPECTED_KEYS)
+        self.assertListEqual(list(data["community"].keys()), COMMUNITY_EXPECTED_KEYS)
+        self.assertEqual(data["community"]["member_count"], 2)
+        self.assertEqual(data["membership"]["is_admin"], False)
+        self.assertEqual(data["tournament"]["id"], self.TOURNAMENTS["tournament1"]["id"])
+        self.assertListEqual([r["id"] for r in data["rounds"]], [self.ROUND_ID])
+        self.assertEqual(data["rounds"][0]["status"], "current")
+        self.assertEqual(data["rounds"][0]["user_play_is_submitted"], False)
+
+        self.assertEqual(data["chat"]["count"], None)
+        self.assertEqual(len(data["chat"]["results"]), settings.QUIZZZ_CHAT_PAGE_SIZE)
+        self.assertEqual(data["chat"]["results"][0]["text"], "message 2")
+        chat_url = reverse('chat:community-chat', kwargs={"community_id": self.GROUP_ID})
+        self.assertTrue(data["chat"]["next"].startswith("http://testserver" + chat_url + "?cursor="))
+        response = self.client.get(data["chat"]["next"])
+        self.assertEqual(response.data["results"][0]["text"], "message 0")
+
+    def test_query_budget(self):
+        """
+        The number of queries does not depend on the number of rounds, plays and messages.
+        """
+        self.login_as("alice")
+        self.client.get(self.url)
+
+        for i in range(3):
+            round = create_round(
+                self.TOURNAMENTS["tournament1"]["id"], self.USERS["bob"]["id"],
+                timezone.now() + datetime.timedelta(days=i + 1), timezone.now() + datetime.timedelta(days=i + 2))
+            Play.objects.create(user_id=self.USERS["alice"]["id"], round=round)
+
+        with self.assertNumQueries(7):   # membership is cached
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.data["rounds"]), 4)
+        self.assertListEqual([r["status"] for r in response.data["rounds"]], ["current"] + ["coming"] * 3)
+
+    def test_no_current_tournament(self):
+        Tournament.objects.filter(community_id=self.GROUP_ID).update(is_active=False)
+        self.login_as("alice")
+
+        with self.assertNumQueries(6):   # no rounds and plays
+            response = self.client.get(self.url)
+        self.assertEqual(response.data["tournament"], None)
+        self.assertListEqual(response.data["rounds"], [])
@@ -0,0 +1,101 @@
+import gzip
+import json
+import os
+import tempfile
+from collections import Counter
+from io import StringIO
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.plays.answer_keys import clear_local_cache, get_answer_key
+from quizzz.plays.models import Play, PlayAnswer
+from quizzz.quizzes.models import Quiz
+from ..models import Membership
+
+
+class CommunityExportTest(SetupRoundsMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('communities:community-export', kwargs={"community_id": self.GROUP_ID})
+        caches['default'].clear()
+        clear_local_cache()
+
+        round_id = self.ROUNDS["round1"]["id"]
+        play = Play.objects.create(user_id=self.USERS["alice"]["id"], round_id=round_id, is_submitted=True, result=1)
+        PlayAnswer.objects.bulk_create([
+            PlayAnswer(play=play, question_id=1, option_id=4),
+            PlayAnswer(play=play, question_id=2, option_id=None),
+        ])
+        # answers of ben are packed:
+        Membership.objects.create(user_id=self.USERS["ben"]["id"], community_id=self.GROUP_ID)
+        answer_key = get_answer_key(Quiz.objects.get(pk=self.ROUNDS["round1"]["quiz_id"]))
+        Play.objects.create(user_id=self.USERS["ben"]["id"], round_id=round_id, is_submitted=True, result=1,
+            packed_answers=answer_key.pack([(1, 3), (2, 8)]))
+
+    def get_records(self, content):
+        return [json.loads(line) for line in content.decode("utf-8").splitlines()]
+
+    def test_permissions(self):
+        get_response = lambda: self.client.get(self.url)
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+        self.assert_group_admin_rights_required(get_response)
+
+    def test_export(self):
+        self.login_as("bob")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn('filename="community-1.ndjson"', response["Content-Disposition"])
+
+        # rows are read while streaming the response: 
+        # (1) community (2-9) rows of every type (answer key of the packed play is cached)
+        with self.assertNumQueries(9):
+            content = b"".join(response.streaming_content)
+        records = self.get_records(content)
+
+        self.assertDictEqual(Counter(record["type"] for record in records), {
+            "community": 1, "member": 3, "tournament": 1, "quiz": 1, "question": 2,
+            "option": 8, "round": 1, "play": 2, "answer": 4,
+        })
+        self.assertDictEqual(records[0], {
+            "type": "community", "id": self.GROUP_ID, "name": self.COMMUNITIES["group1"]["name"],
+            "time_created": records[0]["time_created"],
+        })
+        answers = {
+            (record["play_id"], record["question_id"], record["option_id"])
+            for record in records if record["type"] == "answer"
+        }
+        alice_play, ben_play = [record["id"] for record in records if record["type"] == "play"]
+        self.assertSetEqual(answers, {
+            (alice_play, 1, 4), (alice_play, 2, None), (ben_play, 1, 3), (ben_play, 2, 8),
+        })
+        quiz, = [record for record in records if record["type"] == "quiz"]
+        self.assertEqual(quiz["name"], self.QUIZZES["quiz1"]["name"])
+        self.assertNotIn("packed_answers", records[-1])
+
+        # gzipped export has the same content:
+        response = self.client.get(self.url, {"compression": "gzip"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), content)
+
+    def test_command(self):
+        with self.assertRaises(CommandError):
+            call_command('exportcommunity', '100', stdout=StringIO())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "export.ndjson.gz")
+            out = StringIO()
+            call_command('exportcommunity', str(self.GROUP_ID), '--gzip', '--chunk-size', '1',
+                '--output', path, stdout=out)
+            self.assertIn('exported', out.getvalue())
+            with gzip.open(path) as f:
+                records = self.get_records(f.read())
+        self.assertEqual(len(records), 23)
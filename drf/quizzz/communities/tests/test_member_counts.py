@@ -0,0 +1,64 @@
+import io
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupCommunityDataMixin
+from quizzz.users.models import CustomUser
+
+from ..exceptions import MemberAlreadyExistsException, MemberLimitException
+from ..models import Community, Membership
+
+
+class MemberCountTest(SetupCommunityDataMixin, APITestCase):
+
+    def get_member_count(self):
+        return Community.objects.get(pk=self.GROUP_ID).member_count
+
+    def test_join_and_leave(self):
+        community = Community.objects.get(pk=self.GROUP_ID)
+        self.assertEqual(community.member_count, 2)
+
+        ben = CustomUser.objects.get(username="ben")
+        membership = community.join(ben)
+        self.assertEqual(community.member_count, 3)
+        self.assertEqual(self.get_member_count(), 3)
+
+        with self.assertRaises(MemberAlreadyExistsException):
+            community.join(ben)
+        self.assertEqual(self.get_member_count(), 3)
+
+        membership.delete()
+        self.assertEqual(self.get_member_count(), 2)
+
+    def test_limit(self):
+        Community.objects.filter(pk=self.GROUP_ID).update(max_members=2)
+        community = Community.objects.get(pk=self.GROUP_ID)
+
+        with self.assertRaises(MemberLimitException):
+            community.join(CustomUser.objects.get(username="ben"))
+        self.assertEqual(self.get_member_count(), 2)
+        self.assertFalse(Membership.objects.filter(user__username="ben", community_id=self.GROUP_ID).exists())
+
+    def test_memberships_deleted_by_cascades(self):
+        group2_id = self.COMMUNITIES["group2"]["id"]
+        self.assertEqual(Community.objects.get(pk=group2_id).member_count, 1)
+
+        CustomUser.objects.get(username="alice").delete()
+        self.assertEqual(self.get_member_count(), 1)
+        self.assertEqual(Community.objects.get(pk=group2_id).member_count, 0)
+        call_command('repairmembercounts', '--check', stdout=io.StringIO())
+
+    def test_command(self):
+        call_command('repairmembercounts', '--check', stdout=io.StringIO())
+
+        Community.objects.update(member_count=5)
+        with self.assertRaisesMessage(CommandError, '3 member count(s) are wrong.'):
+            call_command('repairmembercounts', '--check', stdout=io.StringIO(), stderr=io.StringIO())
+
+        out = io.StringIO()
+        call_command('repairmembercounts', str(self.GROUP_ID), stdout=out, stderr=io.StringIO())
+        self.assertIn('Repaired member counts of 1 community(ies).', out.getvalue())
+        self.assertEqual(self.get_member_count(), 2)
+        with self.assertRaisesMessage(CommandError, '2 member count(s) are wrong.'):
+            call_command('repairmembercounts', '--check', stdout=io.StringIO(), stderr=io.StringIO())
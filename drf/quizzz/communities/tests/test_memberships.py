@@ -0,0 +1,90 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.cache import LocalLRUCache
+from quizzz.common.test_mixins import SetupCommunityDataMixin
+
+from ..memberships import get_membership
+from ..models import Membership
+
+
+class MembershipCacheTest(SetupCommunityDataMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('communities:community-detail', kwargs={"community_id": self.GROUP_ID})
+        self.alice_id = self.USERS["alice"]["id"]
+        self.ben_id = self.USERS["ben"]["id"]
+
+    def get_membership_queries(self, get_response):
+        with CaptureQueriesContext(connection) as queries:
+            get_response()
+        return [q["sql"] for q in queries if '"memberships"' in q["sql"]]
+
+    def test_warm_requests_do_not_query_memberships(self):
+        self.login_as("alice")
+        get_response = lambda: self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.assertEqual(len(self.get_membership_queries(get_response)), 1)
+        with self.assertNumQueries(3):   # (1-2) request.user (3) community
+            self.assertListEqual(self.get_membership_queries(get_response), [])
+
+        # users who are not members are cached too:
+        self.login_as("ben")
+        get_response = lambda: self.assert_not_authorized(self.client.get(self.url))
+        self.assertEqual(len(self.get_membership_queries(get_response)), 1)
+        self.assertListEqual(self.get_membership_queries(get_response), [])
+
+    def test_invalidation(self):
+        self.assertFalse(get_membership(self.alice_id, self.GROUP_ID).is_admin)
+
+        # promoted:
+        membership = Membership.objects.get(user_id=self.alice_id, community_id=self.GROUP_ID)
+        membership.is_admin = True
+        membership.save()
+        self.assertTrue(get_membership(self.alice_id, self.GROUP_ID).is_admin)
+
+        # deleted:
+        membership.delete()
+        self.assertIsNone(get_membership(self.alice_id, self.GROUP_ID))
+
+        # created (not approved yet), approved:
+        self.assertIsNone(get_membership(self.ben_id, self.GROUP_ID))
+        membership = Membership.objects.create(user_id=self.ben_id, community_id=self.GROUP_ID, is_approved=False)
+        self.assertFalse(get_membership(self.ben_id, self.GROUP_ID).is_approved)
+        membership.is_approved = True
+        membership.save()
+        self.assertTrue(get_membership(self.ben_id, self.GROUP_ID).is_approved)
+
+    def test_admin_removes_member(self):
+        """
+        A removed member loses access right away (in the same process).
+        """
+        self.login_as("alice")
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_200_OK)
+
+        self.login_as("bob")
+        url = reverse('communities:membership-detail', kwargs={
+            'community_id': self.GROUP_ID,
+            'user_id': self.alice_id,
+        })
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+
+        self.login_as("alice")
+        self.assert_not_authorized(self.client.get(self.url))
+
+
+class LocalLRUCacheTest(APITestCase):
+
+    def test_ttl(self):
+        cache = LocalLRUCache(2, ttl=0)
+        cache.set("key", 1)
+        self.assertIsNone(cache.get("key"))
+
+        cache = LocalLRUCache(2, ttl=60)
+        cache.set("key", 1)
+        self.assertEqual(cache.get("key"), 1)
+        cache.delete("key")
+        self.assertIsNone(cache.get("key"))
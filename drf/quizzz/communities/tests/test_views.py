@@ -10,7 +10,7 @@ from quizzz.communities.models import Community, Membership
 
 
 MEMBERSHIP_EXPECTED_KEYS = ['user', 'community', 'is_admin', 'is_approved', 'time_created']
-COMMUNITY_EXPECTED_KEYS = ["id", "name", "password", "approval_required", "max_members", "time_created"]
+COMMUNITY_EXPECTED_KEYS = ["id", "name", "password", "approval_required", "max_members", "member_count", "time_created"]
 MEMBER_USER_EXPECTED_KEYS = ['id', 'username', 'first_name', 'last_name', 'last_login']
 
 
@@ -181,8 +181,11 @@ class JoinCommunityTest(SetupCommunityDataMixin, APITestCase):
 
         # Works for a regular non-member:
         self.login_as(self.USER)
-        with self.assertNumQueries(6): # (3) get com (4) member count (5) user memberships count (6) insert
+        with self.assertNumQueries(8):
+            # (3) get com (4) user memberships count (5) savepoint (6) increment member count
+            # (7) insert (8) release savepoint
             response = get_response()
+            self.assertEqual(response.data["community"]["member_count"], 3)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertListEqual(list(response.data.keys()), self.expected_keys)
             self.assertListEqual(list(response.data["community"].keys()), self.community_expected_keys)
@@ -201,7 +204,9 @@ class JoinCommunityTest(SetupCommunityDataMixin, APITestCase):
         group_members = Membership.objects.filter(community_id=self.GROUP_ID).count()
         Community.objects.filter(pk=self.GROUP_ID).update(max_members=group_members)
         
-        with self.assertNumQueries(5):
+        # (3) get com (4) user memberships count (5) savepoint (6) increment member count (no rows)
+        # (7-8) rollback savepoint
+        with self.assertNumQueries(8):
             response = self.client.post(self.url, self.payload)
             self.assert_validation_failed(response, data={
                 "non_field_errors": ["This group has reached its member limit."]
@@ -285,7 +290,8 @@ class JoinAlreadyJoinedCommunityTest(SetupCommunityDataMixin, APITransactionTest
         """
         self.login_as("bob")
 
-        with self.assertNumQueries(6):
+        # (+1) rollback to savepoint (the member count is not incremented)
+        with self.assertNumQueries(7):
             response = self.client.post(self.url, self.payload)
             self.assert_validation_failed(response, data={
                 "non_field_errors": ["You are already a member of this group."]
@@ -416,8 +422,10 @@ class CommunityDetailTest(SetupCommunityDataMixin, APITestCase):
 
         # bob is group admin, he can delete the group:
         self.login_as("bob")
-        with self.assertNumQueries(9):
-            # (5) select quizzes (6) del members (7) del chat (8) del tournaments (9) del com 
+        with self.assertNumQueries(14):
+            # (5) select quizzes (6) select members (to invalidate cached memberships)
+            # (7) del members (8-9) member counts, one per member (10) del chat (11) del tournaments
+            # (12) del search documents (13) del similarity buckets (14) del com
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             self.assertEqual(response.data, None)
@@ -558,7 +566,7 @@ class MembershipDetailTest(SetupCommunityDataMixin, APITestCase):
                 'user_id': USER_ID,
             }
         )
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(5):   # (5) decrement member count
             response = self.client.delete(url)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             self.assertEqual(response.data, None)
@@ -580,7 +588,7 @@ class MembershipDetailTest(SetupCommunityDataMixin, APITestCase):
             }
         )
         self.login_as("alice")
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(6):   # (6) decrement member count
             response = self.client.delete(url)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             self.assertEqual(response.data, None)
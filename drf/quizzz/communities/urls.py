@@ -13,6 +13,10 @@ urlpatterns = [
         views.JoinCommunity.as_view(), name="join-community"),
     path('<int:community_id>/', 
         views.CommunityDetail.as_view(), name="community-detail"),
+    path('<int:community_id>/dashboard/',
+        views.CommunityDashboard.as_view(), name="community-dashboard"),
+    path('<int:community_id>/export/',
+        views.CommunityExport.as_view(), name="community-export"),
     path('<int:community_id>/members/', 
         views.MembershipList.as_view(), name="community-members"),
     path('<int:community_id>/members/<int:user_id>/',
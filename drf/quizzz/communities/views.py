@@ -1,4 +1,7 @@
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -7,9 +10,15 @@ from .serializers import MembershipSerializer, CommunitySerializer, \
     JoinCommunitySerializer, MembershipForMemberListSerializer
 from .models import Membership, Community
 from .permissions import IsCommunityAdmin, IsCommunityMember
+from .export import iter_ndjson, iter_gzipped
 
 from quizzz.users.permissions import IsSuperuser, AuthenticatedAsUrlUserId
 from quizzz.common.permissions import IsSafeMethod, IsDeleteMethod, IsAuthenticated
+from quizzz.chat.models import ChatMessage
+from quizzz.chat.pagination import ChatPagination
+from quizzz.chat.serializers import ChatMessageSerializer
+from quizzz.tournaments.models import Tournament, Round
+from quizzz.tournaments.serializers import TournamentSerializer, ListedRoundSerializer
 
 from django.contrib.auth import get_user_model
 User = get_user_model()
@@ -23,8 +32,8 @@ class CommunityList(APIView):
     permission_classes = [IsAuthenticated, IsSuperuser]
 
     def get(self, request):
-        communities = Community.objects.all()
-        serializer = CommunitySerializer(communities, many=True)
+        communities = CommunitySerializer.prune_queryset(Community.objects.all(), request)
+        serializer = CommunitySerializer(communities, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -65,6 +74,54 @@ class CommunityDetail(APIView):
 
 
 
+class CommunityDashboard(APIView):
+    """
+    Everything shown when a community is opened, in one request:
+    the community (with its member count), the user's membership,
+    the current (latest active) tournament with its current and upcoming
+    rounds and the user's plays, and the newest page of the community chat
+    (`next` links to older messages of the chat endpoint).
+    """
+    permission_classes = [IsAuthenticated, IsCommunityMember]
+
+    def get(self, request, community_id):
+        community = get_object_or_404(Community.objects.filter(pk=community_id))
+        membership = request.membership
+
+        tournament = Tournament.objects\
+            .filter(community_id=community_id, is_active=True)\
+            .order_by('-time_created')\
+            .first()
+        rounds = []
+        if tournament is not None:
+            rounds = Round.objects\
+                .filter(tournament_id=tournament.id, finish_time__gte=timezone.now())\
+                .select_related('quiz__user')\
+                .prefetch_related(Round.get_user_plays_prefetch_object(request.user.id))\
+                .order_by('start_time', 'id')
+
+        messages = ChatMessage.objects\
+            .filter(community_id=community_id, round_id=None)\
+            .select_related('user')
+        paginator = ChatPagination()
+        messages = paginator.paginate_newest(messages, request.build_absolute_uri(
+            reverse('chat:community-chat', kwargs={"community_id": community_id})))
+        chat = paginator.get_paginated_response(ChatMessageSerializer(messages, many=True).data).data
+
+        return Response({
+            "community": CommunitySerializer(community).data,
+            "membership": {
+                "is_admin": membership.is_admin,
+                "is_approved": membership.is_approved,
+                "time_created": membership.time_created,
+            },
+            "tournament": TournamentSerializer(tournament).data if tournament else None,
+            "rounds": ListedRoundSerializer(rounds, many=True, context={'request': request}).data,
+            "chat": chat,
+        })
+
+
+
 class UserCommunityList(APIView):
     """
     List user's communities as part of membership objects.
@@ -81,7 +138,8 @@ class UserCommunityList(APIView):
             .filter(user__id=user_id)
             .select_related('community')
         )
-        serializer = MembershipSerializer(memberships, many=True)
+        memberships = MembershipSerializer.prune_queryset(memberships, request)
+        serializer = MembershipSerializer(memberships, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -136,7 +194,8 @@ class MembershipList(APIView):
             .filter(community__id=community_id)
             .select_related('user')
         )
-        serializer = MembershipForMemberListSerializer(memberships, many=True)
+        memberships = MembershipForMemberListSerializer.prune_queryset(memberships, request)
+        serializer = MembershipForMemberListSerializer(memberships, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -177,4 +236,25 @@ class MembershipDetail(APIView):
     def delete(self, request, user_id, community_id):
         membership = self.get_object()
         membership.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+
+class CommunityExport(APIView):
+    """
+    Stream all quizzes, rounds, plays and answers of a community as NDJSON 
+    (gzipped with `?compression=gzip`), see `export.py`.
+    """
+    permission_classes = [IsAuthenticated, IsCommunityAdmin]
+
+    def get(self, request, community_id):
+        lines = iter_ndjson(community_id)
+        filename = f"community-{community_id}.ndjson"
+
+        if request.query_params.get("compression") == "gzip":
+            response = StreamingHttpResponse(iter_gzipped(lines), content_type="application/gzip")
+            filename += ".gz"
+        else:
+            response = StreamingHttpResponse(lines, content_type="application/x-ndjson")
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
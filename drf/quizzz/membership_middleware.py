@@ -1,4 +1,4 @@
-from quizzz.communities.models import Membership
+from quizzz.communities.memberships import get_membership
 
 
 class MembershipMiddleware:
@@ -7,7 +7,8 @@ class MembershipMiddleware:
     
     Whenever there is `community_id` parameter in the url and the user
     is a member of the community, the user's community membership object 
-    is loaded. In all other cases, it's `None`.
+    is loaded (from the cache, see `quizzz.communities.memberships`).
+    In all other cases, it's `None`.
     """
     def __init__(self, get_response):
         self.get_response = get_response
@@ -25,8 +26,4 @@ class MembershipMiddleware:
         community_id = view_kwargs.get("community_id")
         request.membership = None
         if community_id and request.user.is_authenticated:
-            try:
-                request.membership = Membership.objects.get(
-                    community_id=community_id, user=request.user)
-            except Membership.DoesNotExist:
-                pass
\ No newline at end of file
+            request.membership = get_membership(request.user.id, community_id)
\ No newline at end of file
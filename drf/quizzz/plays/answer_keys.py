@@ -0,0 +1,112 @@
+"""
+Answer keys to grade submitted plays.
+
+An answer key maps every question of a quiz to its valid option ids and its
+correct option id. Quizzes of rounds are finalized and cannot change, so an
+answer key is built once (in a single query) and kept in two tiers: in the
+memory of each process and in the shared cache. Keys include
+`quiz.time_updated`, same as quiz payloads (see `payloads`).
+"""
+from django.conf import settings
+from django.apps import apps
+
+from quizzz.common.cache import LocalLRUCache, get_or_build
+
+
+_local_cache = LocalLRUCache(settings.QUIZZZ_ANSWER_KEY_LOCAL_CACHE_SIZE)
+
+
+class AnswerKey:
+    """
+    {question_id: (valid option ids, correct option id)} ordered by question id.
+    The correct option id is None in drafts.
+    """
+    def __init__(self, questions):
+        self.questions = questions
+
+    def grade(self, submitted_answers):
+        """
+        Check answers {question_id: option_id} (option_id is None or missing when skipped)
+        and return a list of (question_id, option_id) for all questions and the number
+        of correct answers. Raise ValueError if an option does not belong to its question.
+        """
+        answers = []
+        num_correct = 0
+        for question_id, (option_ids, correct_option_id) in self.questions.items():
+            option_id = submitted_answers.get(question_id)
+            if option_id is not None and option_id not in option_ids:
+                raise ValueError("Option ids do not match.")
+            answers.append((question_id, option_id))
+            num_correct += (option_id is not None and option_id == correct_option_id)
+        return answers, num_correct
+
+    def pack(self, answers):
+        """
+        Pack graded answers (see `grade()`) into bytes: one byte per question,
+        0 for a skipped question or the position of the selected option plus one.
+        """
+        if len(answers) != len(self.questions):
+            raise ValueError("Answers do not match questions.")
+        positions = []
+        for (question_id, option_id), (key_question_id, (option_ids, _)) \
+                in zip(answers, self.questions.items()):
+            if question_id != key_question_id:
+                raise ValueError("Answers do not match questions.")
+            positions.append(0 if option_id is None else option_ids.index(option_id) + 1)
+        return bytes(positions)
+
+    def unpack(self, packed_answers):
+        """
+        Return a list of (question_id, option_id) for all questions from packed bytes.
+        """
+        packed_answers = bytes(packed_answers)   # PostgreSQL returns memoryview
+        if len(packed_answers) != len(self.questions):
+            raise ValueError("Packed answers do not match questions.")
+        return [
+            (question_id, option_ids[position - 1] if position else None)
+            for (question_id, (option_ids, _)), position
+            in zip(self.questions.items(), packed_answers)
+        ]
+
+    @classmethod
+    def build(cls, quiz_id):
+        Question = apps.get_model('quizzes.Question')
+        rows = Question.objects\
+            .filter(quiz_id=quiz_id)\
+            .order_by('id', 'option__id')\
+            .values_list('id', 'option__id', 'option__is_correct')
+        questions = {}
+        for question_id, option_id, is_correct in rows:
+            option_ids, correct_option_id = questions.get(question_id, ((), None))
+            if option_id is not None:
+                option_ids += (option_id,)
+                if is_correct:
+                    correct_option_id = option_id
+            questions[question_id] = (option_ids, correct_option_id)
+        return cls(questions)
+
+
+def get_answer_key_cache_key(quiz):
+    version = int(quiz.time_updated.timestamp() * 1000000)
+    return f'answer-key:{quiz.id}:{version}'
+
+
+def get_answer_key(quiz):
+    """
+    Return `AnswerKey` of the quiz; <quiz> only needs `id` and `time_updated` to be loaded.
+    """
+    key = get_answer_key_cache_key(quiz)
+    answer_key = _local_cache.get(key)
+    if answer_key is None:
+        questions = get_or_build(
+            key,
+            lambda: AnswerKey.build(quiz.id).questions,
+            timeout=settings.QUIZZZ_ANSWER_KEY_CACHE_SECONDS,
+        )
+        answer_key = AnswerKey(questions)
+        _local_cache.set(key, answer_key)
+    return answer_key
+
+
+def clear_local_cache():
+    _local_cache.clear()
@@ -0,0 +1,95 @@
+from collections import defaultdict
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from quizzz.plays.answer_keys import get_answer_key
+from quizzz.plays.models import Play, PlayAnswer
+
+
+class Command(BaseCommand):
+    help = (
+        'Converts answers of submitted plays from PlayAnswer rows into Play.packed_answers '
+        '(or back with --unpack) in batches. Run it after switching QUIZZZ_PACKED_PLAY_ANSWERS.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--unpack', action='store_true',
+            help='Convert packed answers back into PlayAnswer rows.')
+        parser.add_argument('--batch-size', type=int, default=500,
+            help='Number of plays converted in one transaction (default: 500).')
+
+    def handle(self, *args, **options):
+        if options['unpack']:
+            num_plays = self.unpack(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Unpacked answers of {num_plays} play(s).'))
+        else:
+            num_plays = self.pack(options['batch_size'])
+            self.stdout.write(self.style.SUCCESS(f'Packed answers of {num_plays} play(s).'))
+
+    def get_batches(self, queryset, batch_size):
+        """
+        Yield lists of plays ordered by id (a batch is read after the previous one is converted).
+        """
+        last_id = 0
+        while True:
+            plays = list(
+                queryset
+                .filter(id__gt=last_id)
+                .select_related('round__quiz')
+                .order_by('id')[:batch_size]
+            )
+            if not plays:
+                return
+            last_id = plays[-1].id
+            yield plays
+
+    def pack(self, batch_size):
+        num_packed = 0
+        plays_with_rows = Play.objects.filter(is_submitted=True, packed_answers__isnull=True)
+        for plays in self.get_batches(plays_with_rows, batch_size):
+            answers_by_play_id = defaultdict(dict)
+            rows = PlayAnswer.objects\
+                .filter(play_id__in=[play.id for play in plays])\
+                .values_list('play_id', 'question_id', 'option_id')
+            for play_id, question_id, option_id in rows:
+                answers_by_play_id[play_id][question_id] = option_id
+
+            packed_plays = []
+            for play in plays:
+                answer_key = get_answer_key(play.round.quiz)
+                submitted_answers = answers_by_play_id[play.id]
+                try:
+                    if not set(submitted_answers) <= set(answer_key.questions):
+                        raise ValueError("Questions do not match.")
+                    answers, _ = answer_key.grade(submitted_answers)
+                    play.packed_answers = answer_key.pack(answers)
+                except ValueError as e:
+                    self.stderr.write(f'Play {play.id} skipped: {e}')
+                    continue
+                packed_plays.append(play)
+
+            with transaction.atomic():
+                Play.objects.bulk_update(packed_plays, ['packed_answers'])
+                PlayAnswer.objects.filter(play_id__in=[play.id for play in packed_plays]).delete()
+            num_packed += len(packed_plays)
+        return num_packed
+
+    def unpack(self, batch_size):
+        num_unpacked = 0
+        packed_plays = Play.objects.filter(packed_answers__isnull=False)
+        for plays in self.get_batches(packed_plays, batch_size):
+            new_answer_objects = []
+            for play in plays:
+                answer_key = get_answer_key(play.round.quiz)
+                new_answer_objects += [
+                    PlayAnswer(play=play, question_id=question_id, option_id=option_id)
+                    for question_id, option_id in answer_key.unpack(play.packed_answers)
+                ]
+
+            with transaction.atomic():
+                PlayAnswer.objects.bulk_create(new_answer_objects)
+                Play.objects\
+                    .filter(id__in=[play.id for play in plays])\
+                    .update(packed_answers=None)
+            num_unpacked += len(plays)
+        return num_unpacked
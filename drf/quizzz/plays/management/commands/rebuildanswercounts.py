@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzz.plays.models import RoundAnswerCount
+from quizzz.tournaments.models import Round
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds answer counters of rounds from submitted plays and verifies '
+        'that they match answers counted from plays.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('round_ids', nargs='*', type=int,
+            help='Rounds to process (all rounds by default).')
+        parser.add_argument('--check', action='store_true',
+            help='Only verify stored counters without rebuilding them.')
+
+    def handle(self, *args, **options):
+        rounds = Round.objects.select_related('quiz').order_by('id')
+        if options['round_ids']:
+            rounds = rounds.filter(pk__in=options['round_ids'])
+
+        num_mismatches = 0
+        for round in rounds.iterator():
+            if not options['check']:
+                RoundAnswerCount.rebuild(round)
+
+            errors = self.compare(RoundAnswerCount.get_distribution(round.id), round.count_answers())
+            for error in errors:
+                self.stderr.write(f'Round {round.id}: {error}')
+            num_mismatches += bool(errors)
+
+        if num_mismatches:
+            raise CommandError(f'Stored answer counts do not match in {num_mismatches} round(s).')
+        self.stdout.write(self.style.SUCCESS('Answer counts are up to date.'))
+
+    @staticmethod
+    def compare(stored, expected):
+        """
+        Compare stored counters with expected ones and return a list of errors
+        (zero counters are the same as missing ones).
+        """
+        def flatten(distribution):
+            return {
+                (question_id, option_id): count
+                for question_id, counts in distribution.items()
+                for option_id, count in counts.items()
+                if count
+            }
+        stored, expected = flatten(stored), flatten(expected)
+        return [
+            f'question {question_id}, option {option_id}: '
+            f'stored {stored.get((question_id, option_id))}, '
+            f'expected {expected.get((question_id, option_id))}'
+            for question_id, option_id in sorted(set(stored) | set(expected), key=str)
+            if stored.get((question_id, option_id)) != expected.get((question_id, option_id))
+        ]
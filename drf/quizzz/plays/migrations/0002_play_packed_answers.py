@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plays', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='play',
+            name='packed_answers',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+    ]
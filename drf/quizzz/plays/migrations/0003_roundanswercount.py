@@ -0,0 +1,37 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0004_round_finalization_status'),
+        ('quizzes', '0001_initial'),
+        ('plays', '0002_play_packed_answers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoundAnswerCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('count', models.IntegerField(default=0)),
+                ('option', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='quizzes.option')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='quizzes.question')),
+                ('round', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='answer_counts', to='tournaments.round')),
+            ],
+            options={
+                'db_table': 'round_answer_counts',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='roundanswercount',
+            constraint=models.UniqueConstraint(condition=models.Q(('option__isnull', False)), fields=('round', 'question', 'option'), name='unique_round_answer_counts'),
+        ),
+        migrations.AddConstraint(
+            model_name='roundanswercount',
+            constraint=models.UniqueConstraint(condition=models.Q(('option__isnull', True)), fields=('round', 'question'), name='unique_round_answer_counts_skipped'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+from django.db import migrations
+from django.db.models import Count
+
+
+def get_option_ids(Question, quiz_id):
+    """
+    Return {question_id: option ids} of the quiz ordered by ids (as in answer keys).
+    """
+    rows = Question.objects\
+        .filter(quiz_id=quiz_id)\
+        .order_by('id', 'option__id')\
+        .values_list('id', 'option__id')
+    questions = {}
+    for question_id, option_id in rows:
+        option_ids = questions.setdefault(question_id, [])
+        if option_id is not None:
+            option_ids.append(option_id)
+    return questions
+
+
+def unpack(questions, packed_answers):
+    """
+    Return (question_id, option_id) for all questions from packed answers: one byte
+    per question, 0 for a skipped question or the position of the option plus one.
+    """
+    packed_answers = bytes(packed_answers)   # PostgreSQL returns memoryview
+    if len(packed_answers) != len(questions):
+        raise ValueError("Packed answers do not match questions.")
+    return [
+        (question_id, option_ids[position - 1] if position else None)
+        for (question_id, option_ids), position in zip(questions.items(), packed_answers)
+    ]
+
+
+def count_answers(apps, schema_editor):
+    """
+    Build counters of existing rounds from their plays (see `RoundAnswerCount.rebuild()`).
+    """
+    Round = apps.get_model('tournaments', 'Round')
+    Play = apps.get_model('plays', 'Play')
+    PlayAnswer = apps.get_model('plays', 'PlayAnswer')
+    Question = apps.get_model('quizzes', 'Question')
+    RoundAnswerCount = apps.get_model('plays', 'RoundAnswerCount')
+
+    for round_id, quiz_id in Round.objects.order_by('id').values_list('id', 'quiz_id').iterator():
+        distribution = {}
+        counts = PlayAnswer.objects\
+            .filter(play__round_id=round_id)\
+            .values('question_id', 'option_id')\
+            .annotate(count=Count('id'))\
+            .order_by()
+        for row in counts:
+            distribution[(row["question_id"], row["option_id"])] = row["count"]
+
+        packed_rows = Play.objects\
+            .filter(round_id=round_id, packed_answers__isnull=False)\
+            .values_list('packed_answers', flat=True)
+        questions = None
+        for packed_answers in packed_rows:
+            questions = questions or get_option_ids(Question, quiz_id)
+            for answer in unpack(questions, packed_answers):
+                distribution[answer] = distribution.get(answer, 0) + 1
+
+        RoundAnswerCount.objects.filter(round_id=round_id).delete()
+        RoundAnswerCount.objects.bulk_create([
+            RoundAnswerCount(round_id=round_id, question_id=question_id, option_id=option_id, count=count)
+            for (question_id, option_id), count in distribution.items()
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('plays', '0003_roundanswercount'),
+    ]
+
+    operations = [
+        migrations.RunPython(count_answers, migrations.RunPython.noop),
+    ]
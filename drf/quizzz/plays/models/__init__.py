@@ -1,2 +1,3 @@
 from .play import Play
-from .play_answer import PlayAnswer
\ No newline at end of file
+from .play_answer import PlayAnswer
+from .answer_count import RoundAnswerCount
@@ -0,0 +1,93 @@
+from django.db import models, transaction
+from django.db.models import F, Q
+
+from quizzz.tournaments.models import Round
+from quizzz.quizzes.models import Question, Option
+
+
+class RoundAnswerCount(models.Model):
+    """
+    Number of times an option was chosen in a round (option is None for skipped questions).
+
+    Counters are incremented when a play is submitted (see `add_answers()`),
+    so the answer distribution of a round is read without loading its answers.
+    Use `manage.py rebuildanswercounts` to recalculate them from plays.
+    """
+    round = models.ForeignKey(Round, related_name="answer_counts", on_delete=models.CASCADE)
+    question = models.ForeignKey(Question, related_name="+", on_delete=models.CASCADE)
+    option = models.ForeignKey(Option, related_name="+", on_delete=models.CASCADE, null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "round_answer_counts"
+        constraints = [
+            # NULLs are never equal in a unique constraint, hence two partial constraints:
+            models.UniqueConstraint(
+                fields=['round', 'question', 'option'],
+                condition=Q(option__isnull=False),
+                name='unique_round_answer_counts'
+            ),
+            models.UniqueConstraint(
+                fields=['round', 'question'],
+                condition=Q(option__isnull=True),
+                name='unique_round_answer_counts_skipped'
+            ),
+        ]
+
+    def __str__(self):
+        return "<RoundAnswerCount of %r in %r: %r>" % (self.option_id, self.round_id, self.count)
+
+    @classmethod
+    def add_answers(cls, round_id, answers):
+        """
+        Increment counters of graded answers of a play: a list of (question_id, option_id).
+        Runs 2 queries regardless of the number of questions; call it inside a transaction.
+        """
+        if not answers:
+            return
+        # make sure rows exist (without racing with concurrent inserts):
+        cls.objects.bulk_create(
+            [
+                cls(round_id=round_id, question_id=question_id, option_id=option_id)
+                for question_id, option_id in answers
+            ],
+            ignore_conflicts=True,
+        )
+        # a play has one answer per question, so each row is incremented once:
+        conditions = Q()
+        for question_id, option_id in answers:
+            if option_id is None:
+                conditions |= Q(question_id=question_id, option__isnull=True)
+            else:
+                conditions |= Q(question_id=question_id, option_id=option_id)
+        cls.objects\
+            .filter(round_id=round_id)\
+            .filter(conditions)\
+            .update(count=F('count') + 1)
+
+    @classmethod
+    def get_distribution(cls, round_id):
+        """
+        Return counters of the round as {question_id: {option_id: count}}.
+        """
+        distribution = {}
+        rows = cls.objects\
+            .filter(round_id=round_id)\
+            .values_list('question_id', 'option_id', 'count')
+        for question_id, option_id, count in rows:
+            distribution.setdefault(question_id, {})[option_id] = count
+        return distribution
+
+    @classmethod
+    def rebuild(cls, round):
+        """
+        Recalculate counters of the round from its plays (see `Round.count_answers()`).
+        """
+        counters = [
+            cls(round_id=round.id, question_id=question_id, option_id=option_id, count=count)
+            for question_id, counts in round.count_answers().items()
+            for option_id, count in counts.items()
+        ]
+        with transaction.atomic():
+            cls.objects.filter(round_id=round.id).delete()
+            cls.objects.bulk_create(counters)
@@ -1,7 +1,54 @@
 from django.db import models
+from django.db.models import F, Q, Case, When, Value, Window, ExpressionWrapper
+from django.db.models.functions import Greatest, RowNumber
 from django.conf import settings
+from django.apps import apps
 
+from quizzz.common.functions import DurationInSeconds
 from quizzz.tournaments.models import Round
+from ..answer_keys import get_answer_key
+
+
+class PlayQuerySet(models.QuerySet):
+
+    def with_scores(self):
+        """
+        Annotate plays with:
+        - `server_time`: seconds between start and finish (same as `Play.get_server_time()`);
+        - `score`: same as `Play.get_score()` (0 for plays not submitted yet).
+        """
+        server_time = DurationInSeconds(
+            ExpressionWrapper(F('finish_time') - F('start_time'), output_field=models.DurationField())
+        )
+        score = Case(
+            When(
+                Q(result__gt=0) & Q(server_time__gt=0),
+                then=Greatest(Value(0.0), 100 * F('result') - F('server_time')),
+            ),
+            default=Value(0.0),
+            output_field=models.FloatField(),
+        )
+        return self\
+            .annotate(server_time=server_time)\
+            .annotate(score=score)
+
+    def with_standings(self):
+        """
+        Annotate plays with standings data calculated in a single SQL query:
+        `server_time` and `score` (see `with_scores()`) and
+        - `rank`: 1-based position by score (ties are broken by play id);
+        - `points`: number of plays in the queryset minus `rank` plus one.
+        Plays are ordered by rank.
+        """
+        ranking = [F('score').desc(), F('id').asc()]
+        return self\
+            .with_scores()\
+            .annotate(
+                rank=Window(RowNumber(), order_by=ranking),
+                num_participants=Window(models.Count('id')),
+            )\
+            .annotate(points=F('num_participants') - F('rank') + 1)\
+            .order_by('rank')
 
 
 class Play(models.Model):
@@ -19,6 +66,12 @@ class Play(models.Model):
     client_start_time = models.DateTimeField(null=True, blank=True)
     client_finish_time = models.DateTimeField(null=True, blank=True)
 
+    # Answers packed into one byte per question (see `AnswerKey.pack()`) instead of
+    # `PlayAnswer` rows when `settings.QUIZZZ_PACKED_PLAY_ANSWERS` is on:
+    packed_answers = models.BinaryField(null=True, blank=True)
+
+    objects = PlayQuerySet.as_manager()
+
     def __str__(self):
         return "<Play of %r by %r [%r]>" % (self.round_id, self.user.username, self.user_id)
 
@@ -43,6 +96,20 @@ class Play(models.Model):
             return None
         return (self.client_finish_time - self.client_start_time).total_seconds()
 
+    def get_answers(self):
+        """
+        Return answers of the play as `PlayAnswer` objects
+        (not saved when the answers are packed).
+        """
+        if self.packed_answers is None:
+            return list(self.answers.all())
+        PlayAnswer = apps.get_model('plays.PlayAnswer')
+        answer_key = get_answer_key(self.round.quiz)
+        return [
+            PlayAnswer(play=self, question_id=question_id, option_id=option_id)
+            for question_id, option_id in answer_key.unpack(self.packed_answers)
+        ]
+
     def get_result(self):
         return len([answer.option.is_correct for answer in self.answers.all()])
 
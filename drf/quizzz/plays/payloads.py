@@ -0,0 +1,48 @@
+"""
+Pre-rendered quiz payloads.
+
+A quiz of a round is finalized and does not change while the round is played,
+but every player requests it as soon as the round opens. The rendered JSON of
+`PlayQuizSerializer` / `ReviewQuizSerializer` is therefore cached per quiz
+and built by a single request (see `quizzz.common.cache.get_or_build`).
+
+Cache keys include `quiz.time_updated`: any edit of a quiz saves the quiz
+(see `EditableQuizSerializer.update()`), so edited quizzes get new keys
+and stale payloads simply expire.
+"""
+import json
+
+from django.conf import settings
+from django.db.models import prefetch_related_objects
+from rest_framework.renderers import JSONRenderer
+
+from quizzz.common.cache import get_or_build
+
+
+def get_quiz_payload_key(quiz, serializer_class):
+    version = int(quiz.time_updated.timestamp() * 1000000)
+    return f'quiz-payload:{serializer_class.__name__}:{quiz.id}:{version}'
+
+
+def render_quiz_payload(quiz, serializer_class):
+    prefetch_related_objects([quiz], 'questions', 'questions__options')
+    return JSONRenderer().render(serializer_class(quiz).data)
+
+
+def get_quiz_payload(quiz, serializer_class):
+    """
+    Return JSON bytes of `serializer_class(quiz)` with questions and options
+    (which are only loaded on a cache miss).
+    """
+    return get_or_build(
+        get_quiz_payload_key(quiz, serializer_class),
+        lambda: render_quiz_payload(quiz, serializer_class),
+        timeout=settings.QUIZZZ_QUIZ_PAYLOAD_CACHE_SECONDS,
+    )
+
+
+def get_quiz_payload_data(quiz, serializer_class):
+    """
+    Same as `get_quiz_payload()` but decoded, to be nested into other response data.
+    """
+    return json.loads(get_quiz_payload(quiz, serializer_class))
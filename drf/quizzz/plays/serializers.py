@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from django.utils import timezone
+from django.conf import settings
 from django.db import transaction
+from django.utils import timezone
 
-from .models import Play, PlayAnswer
+from .models import Play, PlayAnswer, RoundAnswerCount
+from quizzz.tournaments.models import TournamentStanding
 from quizzz.quizzes.models import Quiz, Question, Option
 
 
@@ -76,47 +78,55 @@ class SubmittedPlaySerializer(serializers.ModelSerializer):
         """
         Update and return an existing `Play` instance, given the validated data.
 
-        Requires 'play' and 'quiz' instances to be injected into 'validated_data'.
+        Requires 'play' instance and quiz 'answer_key' (see `answer_keys`)
+        to be injected into 'validated_data'.
         """
         play = validated_data['play']
-        quiz = validated_data['quiz']
+        answer_key = validated_data['answer_key']
 
         submitted_answers = {
             answer.get("question_id"): answer.get("option_id")
             for answer in validated_data["answers"]
         }
 
-        new_answer_objects = []
-        num_correct = 0
-        for question in quiz.questions.all():
-
-            available_options_by_id = {option.id: option for option in question.options.all()}          
-            
-            submitted_option_id = submitted_answers.get(question.id)
-            if submitted_option_id is not None and submitted_option_id not in available_options_by_id:
-                raise serializers.ValidationError("Option ids do not match.")
-
-            new_answer_objects += [
-                PlayAnswer(
-                    play=play, 
-                    question_id=question.id, 
-                    option_id=submitted_option_id
-                )
-            ]
-            
-            selected_option = available_options_by_id.get(submitted_option_id)
-            num_correct += (selected_option is not None and selected_option.is_correct)
+        try:
+            answers, num_correct = answer_key.grade(submitted_answers)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+
+        new_answer_objects = [
+            PlayAnswer(play=play, question_id=question_id, option_id=option_id)
+            for question_id, option_id in answers
+        ]
+        packed_answers = answer_key.pack(answers) if settings.QUIZZZ_PACKED_PLAY_ANSWERS else None
 
         instance.is_submitted = True
         instance.finish_time = timezone.now()
         instance.result = num_correct
+        instance.packed_answers = packed_answers
 
-        # save changes:
+        # save changes (and update tournament standings accordingly):
         with transaction.atomic():
-            for object in new_answer_objects:
-                object.save()
-            instance.save()
-            
+            TournamentStanding.lock_round(instance.round)
+            # the play is submitted only once, even by concurrent requests:
+            num_updated = Play.objects\
+                .filter(pk=instance.id, is_submitted=False)\
+                .update(
+                    is_submitted=instance.is_submitted,
+                    finish_time=instance.finish_time,
+                    result=instance.result,
+                    packed_answers=instance.packed_answers,
+                )
+            if not num_updated:
+                raise serializers.ValidationError("You have already played this round.")
+            if packed_answers is None:
+                PlayAnswer.objects.bulk_create(new_answer_objects)
+            RoundAnswerCount.add_answers(instance.round_id, answers)
+            TournamentStanding.add_submitted_play(instance.round, instance)
+
+        # list submitted answers in the response without loading them back
+        # (same as `prefetch_related('answers')`):
+        instance._prefetched_objects_cache = {'answers': new_answer_objects}
         return instance
 
 
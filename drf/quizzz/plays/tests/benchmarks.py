@@ -0,0 +1,104 @@
+"""
+Benchmarks (not collected by the test runner, run explicitly):
+
+    python manage.py test quizzz.plays.tests.benchmarks
+
+N players (re)load the same round at once, first with every request rendering
+the quiz (dummy cache, i.e. the behaviour before quiz payloads were cached),
+then with the rendered quiz cached by single-flight loading. Plays exist
+beforehand: creating them does not depend on caching (and SQLite would
+serialize concurrent writes anyway).
+"""
+import statistics
+import threading
+import time
+from unittest import mock
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.communities.models import Membership
+from quizzz.quizzes.models import Quiz
+from quizzz.users.models import CustomUser
+from .. import payloads
+from ..models import Play
+
+
+NUM_PLAYERS = 50
+
+DUMMY_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+class StartRoundBenchmark(SetupRoundsMixin, TransactionTestCase):
+    def setUp(self):
+        self.setUpTestData()
+        Quiz.objects.filter(pk=self.ROUNDS["round1"]["quiz_id"]).update(is_finalized=True)
+        self.url = reverse('plays:start-round', kwargs={
+            "community_id": self.GROUP_ID,
+            "round_id": self.ROUNDS["round1"]["id"],
+        })
+        self.players = []
+        for i in range(NUM_PLAYERS):
+            user = CustomUser.objects.create_user(
+                username=f"player{i}", email=f"player{i}@example.com", password="player12345",
+                is_email_confirmed=True)
+            Membership.objects.create(user=user, community_id=self.GROUP_ID)
+            Play.objects.create(user=user, round_id=self.ROUNDS["round1"]["id"])
+            self.players.append(user)
+
+    def start_round_concurrently(self):
+        """
+        Start the round by all players at once; return response times in ms.
+        """
+        timings = []
+        errors = []
+        barrier = threading.Barrier(len(self.players), timeout=30)
+        clients = []
+        for user in self.players:
+            client = APIClient()
+            client.force_login(user)
+            clients.append(client)
+
+        def play(client):
+            try:
+                barrier.wait()
+                start = time.perf_counter()
+                response = client.post(self.url, {})
+                timings.append((time.perf_counter() - start) * 1000)
+                if response.status_code != 200:
+                    errors.append((response.status_code, response.content))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=play, args=(client,)) for client in clients]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertListEqual(errors, [])
+        return timings
+
+    def run_benchmark(self, caches, title):
+        with override_settings(CACHES=caches), \
+            mock.patch.object(payloads, 'render_quiz_payload', wraps=payloads.render_quiz_payload) as render:
+            timings = self.start_round_concurrently()
+        quantiles = statistics.quantiles(timings, n=100)
+        print(
+            f'\n{title}: {len(timings)} players, '
+            f'p50 {quantiles[49]:.1f} ms, p99 {quantiles[98]:.1f} ms, '
+            f'quiz rendered {render.call_count} time(s)'
+        )
+        return render.call_count
+
+    def test_start_round(self):
+        num_renders = self.run_benchmark(DUMMY_CACHE, 'StartRound, no cache')
+        self.assertEqual(num_renders, NUM_PLAYERS)
+
+        num_renders = self.run_benchmark(LOCMEM_CACHE, 'StartRound, cached quiz')
+        self.assertEqual(num_renders, 1)
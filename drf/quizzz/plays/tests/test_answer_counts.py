@@ -0,0 +1,74 @@
+from importlib import import_module
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.apps import apps
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.communities.models import Membership
+from quizzz.tournaments.models import Round
+from ..answer_keys import clear_local_cache, get_answer_key
+from ..models import Play, RoundAnswerCount
+
+
+class RoundAnswerCountTest(SetupRoundsMixin, APITestCase):
+    def setUp(self):
+        self.ROUND_ID = self.ROUNDS["round1"]["id"]
+        kwargs = {"community_id": self.GROUP_ID, "round_id": self.ROUND_ID}
+        self.start_url = reverse('plays:start-round', kwargs=kwargs)
+        self.submit_url = reverse('plays:submit-round', kwargs=kwargs)
+        for username in ["ben", "admin"]:
+            Membership.objects.create(user_id=self.USERS[username]["id"], community_id=self.GROUP_ID)
+        caches['default'].clear()
+        clear_local_cache()
+
+        self.play("alice", [{"question_id": 1, "option_id": 4}, {"question_id": 2, "option_id": 7}])
+        self.play("ben", [{"question_id": 1, "option_id": 4}])
+        self.play("admin", [{"question_id": 2, "option_id": 7}])
+        self.round = Round.objects.get(pk=self.ROUND_ID)
+
+    def play(self, username, answers):
+        self.login_as(username)
+        self.client.post(self.start_url, {})
+        response = self.client.post(self.submit_url, {"answers": answers})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_counters_follow_submissions(self):
+        self.assertDictEqual(RoundAnswerCount.get_distribution(self.ROUND_ID), {
+            1: {4: 2, None: 1},
+            2: {7: 2, None: 1},
+        })
+        self.assertDictEqual(RoundAnswerCount.get_distribution(self.ROUND_ID), self.round.count_answers())
+
+        with self.assertNumQueries(1):
+            distribution = self.round.get_answer_distribution(question_ids=[1, 2])
+        self.assertDictEqual(distribution, self.round.count_answers())
+
+    def test_rebuild_command(self):
+        RoundAnswerCount.objects.filter(option_id=4).update(count=100)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuildanswercounts', '--check', stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('rebuildanswercounts', stdout=out, stderr=StringIO())
+        self.assertIn('up to date', out.getvalue())
+        self.assertDictEqual(RoundAnswerCount.get_distribution(self.ROUND_ID), self.round.count_answers())
+
+    def test_migration_backfills_counters(self):
+        migration = import_module('quizzz.plays.migrations.0004_backfill_round_answer_counts')
+        # plays submitted with packed answers have no `PlayAnswer` rows:
+        play = Play.objects.get(round_id=self.ROUND_ID, user_id=self.USERS["alice"]["id"])
+        answers = list(play.answers.order_by('question_id').values_list('question_id', 'option_id'))
+        play.packed_answers = get_answer_key(self.round.quiz).pack(answers)
+        play.save()
+        play.answers.all().delete()
+        RoundAnswerCount.objects.all().delete()
+
+        migration.count_answers(apps, None)
+        self.assertDictEqual(RoundAnswerCount.get_distribution(self.ROUND_ID), self.round.count_answers())
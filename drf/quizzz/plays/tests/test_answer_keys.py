@@ -0,0 +1,49 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from quizzz.common.test_mixins import SetupQuizDataMixin
+
+from quizzz.quizzes.models import Quiz
+from ..answer_keys import AnswerKey, get_answer_key, clear_local_cache
+
+
+class AnswerKeyTest(SetupQuizDataMixin, TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        clear_local_cache()
+        self.quiz = Quiz.objects.get(pk=self.QUIZZES["quiz1"]["id"])
+
+    def test_answer_key_matches_quiz(self):
+        with self.assertNumQueries(1):
+            answer_key = AnswerKey.build(self.quiz.id)
+
+        questions = self.quiz.questions.prefetch_related('options').order_by('id')
+        self.assertListEqual(list(answer_key.questions), [q.id for q in questions])
+        for question in questions:
+            option_ids, correct_option_id = answer_key.questions[question.id]
+            self.assertListEqual(list(option_ids), sorted(o.id for o in question.options.all()))
+            self.assertEqual(correct_option_id, next(
+                (o.id for o in question.options.all() if o.is_correct), None))
+
+    def test_grade(self):
+        answer_key = AnswerKey({1: ((1, 2), 2), 2: ((3, 4), 3)})
+        self.assertEqual(answer_key.grade({1: 2, 2: 4}), ([(1, 2), (2, 4)], 1))
+        self.assertEqual(answer_key.grade({2: 3}), ([(1, None), (2, 3)], 1))
+        with self.assertRaises(ValueError):
+            answer_key.grade({1: 3})
+
+    def test_two_tier_cache(self):
+        with self.assertNumQueries(1):
+            answer_key = get_answer_key(self.quiz)
+        with self.assertNumQueries(0):
+            self.assertIs(get_answer_key(self.quiz), answer_key)
+
+        # another process reads it from the shared cache:
+        clear_local_cache()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_answer_key(self.quiz).questions, answer_key.questions)
+
+        # edited quiz gets a new answer key:
+        self.quiz.save()
+        with self.assertNumQueries(1):
+            get_answer_key(self.quiz)
@@ -0,0 +1,81 @@
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.communities.models import Membership
+from ..answer_keys import clear_local_cache
+from ..models import Play, PlayAnswer, RoundAnswerCount
+
+
+class PackedAnswersTest(SetupRoundsMixin, APITestCase):
+    def setUp(self):
+        self.ROUND_ID = self.ROUNDS["round1"]["id"]
+        kwargs = {"community_id": self.GROUP_ID, "round_id": self.ROUND_ID}
+        self.start_url = reverse('plays:start-round', kwargs=kwargs)
+        self.submit_url = reverse('plays:submit-round', kwargs=kwargs)
+        self.review_url = reverse('plays:review-round', kwargs=kwargs)
+        Membership.objects.create(user_id=self.USERS["ben"]["id"], community_id=self.GROUP_ID)
+        caches['default'].clear()
+        clear_local_cache()
+
+    def play(self, username, answers):
+        self.login_as(username)
+        self.client.post(self.start_url, {})
+        response = self.client.post(self.submit_url, {"answers": answers})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def play_round(self):
+        self.play("alice", [{"question_id": 1, "option_id": 4}, {"question_id": 2, "option_id": 7}])
+        self.play("ben", [{"question_id": 2, "option_id": 8}])
+
+    def review(self, username):
+        self.login_as(username)
+        response = self.client.get(self.review_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.json()
+
+    def test_packed_answers_are_reviewed_as_rows(self):
+        self.play_round()
+        expected = self.review("alice")
+
+        # same round played with packed answers:
+        Play.objects.all().delete()
+        RoundAnswerCount.objects.all().delete()
+        with override_settings(QUIZZZ_PACKED_PLAY_ANSWERS=True):
+            response = self.play("ben", [{"question_id": 2, "option_id": 8}])
+            self.assertListEqual(response.json()["answers"], [
+                {"question_id": 1, "option_id": None},
+                {"question_id": 2, "option_id": 8},
+            ])
+            self.play("alice", [{"question_id": 1, "option_id": 4}, {"question_id": 2, "option_id": 7}])
+            self.assertEqual(PlayAnswer.objects.count(), 0)
+            self.assertEqual(bytes(Play.objects.get(user_id=self.USERS["alice"]["id"]).packed_answers), b"\x04\x03")
+
+            data = self.review("alice")
+        self.assertEqual(data["play"]["result"], expected["play"]["result"])
+        for key in ["play_answers", "play_count", "choices_by_question_id"]:
+            self.assertEqual(data[key], expected[key])
+
+    def test_command(self):
+        self.play_round()
+        expected = self.review("alice")
+
+        out = StringIO()
+        call_command('packplayanswers', '--batch-size', '1', stdout=out)
+        self.assertIn('Packed answers of 2 play(s).', out.getvalue())
+        self.assertEqual(PlayAnswer.objects.count(), 0)
+        self.assertEqual(Play.objects.filter(packed_answers__isnull=True).count(), 0)
+        with override_settings(QUIZZZ_PACKED_PLAY_ANSWERS=True):
+            self.assertEqual(self.review("alice"), expected)
+
+        call_command('packplayanswers', '--unpack', stdout=out)
+        self.assertIn('Unpacked answers of 2 play(s).', out.getvalue())
+        self.assertEqual(PlayAnswer.objects.count(), 4)
+        self.assertEqual(self.review("alice"), expected)
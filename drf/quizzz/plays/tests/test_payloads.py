@@ -0,0 +1,63 @@
+import json
+import threading
+import time
+from django.core.cache import caches
+from django.test import TestCase, SimpleTestCase
+
+from quizzz.common.cache import get_or_build
+from quizzz.common.test_mixins import SetupQuizDataMixin
+
+from quizzz.quizzes.models import Quiz
+from ..payloads import get_quiz_payload
+from ..serializers import PlayQuizSerializer, ReviewQuizSerializer
+
+
+class SingleFlightTest(SimpleTestCase):
+    def setUp(self):
+        caches['default'].clear()
+
+    def test_concurrent_misses_build_once(self):
+        calls = []
+        def build():
+            calls.append(1)
+            time.sleep(0.1)
+            return b"payload"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(get_or_build("single-flight-test", build)))
+            for _ in range(10)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertListEqual(results, [b"payload"] * 10)
+
+
+class QuizPayloadTest(SetupQuizDataMixin, TestCase):
+    def setUp(self):
+        caches['default'].clear()
+        self.quiz = Quiz.objects.get(pk=self.QUIZZES["quiz1"]["id"])
+
+    def test_payload_matches_serializer(self):
+        for serializer_class in [PlayQuizSerializer, ReviewQuizSerializer]:
+            self.quiz.refresh_from_db()
+            with self.assertNumQueries(2):  # (1) questions (2) options
+                payload = get_quiz_payload(self.quiz, serializer_class)
+            quiz = Quiz.objects.prefetch_related('questions__options').get(pk=self.quiz.id)
+            self.assertEqual(json.loads(payload), json.loads(json.dumps(serializer_class(quiz).data)))
+
+            with self.assertNumQueries(0):
+                self.assertEqual(get_quiz_payload(self.quiz, serializer_class), payload)
+
+    def test_edited_quiz_is_rendered_again(self):
+        get_quiz_payload(self.quiz, PlayQuizSerializer)
+
+        self.quiz.name = "New name"
+        self.quiz.save()
+        quiz = Quiz.objects.get(pk=self.quiz.id)
+        payload = json.loads(get_quiz_payload(quiz, PlayQuizSerializer))
+        self.assertEqual(payload["name"], "New name")
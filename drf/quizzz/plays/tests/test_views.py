@@ -1,12 +1,19 @@
 from rest_framework import status
 from rest_framework.test import APITestCase
+from rest_framework.exceptions import ValidationError
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from quizzz.common.test_mixins import SetupRoundsMixin
 from quizzz.quizzes.tests.test_views import QUIZ_EXPECTED_KEYS
 
-from quizzz.quizzes.models import Quiz
+from quizzz.communities.models import Membership
+from quizzz.quizzes.models import Quiz, Question, Option
+from ..answer_keys import clear_local_cache, get_answer_key
 from ..models import Play, PlayAnswer
+from ..serializers import SubmittedPlaySerializer
 
 
 QUIZ_EXPECTED_KEYS = ['name', 'introduction', 'questions']
@@ -35,6 +42,7 @@ class StartRoundTest(SetupRoundsMixin, APITestCase):
             }
         )
         self.expected_keys = QUIZ_EXPECTED_KEYS
+        caches['default'].clear()   # rendered quizzes are cached
     
     def test_normal(self):
         """
@@ -52,26 +60,29 @@ class StartRoundTest(SetupRoundsMixin, APITestCase):
 
         # a regular group member can start the round
         self.login_as("alice")
-        with self.assertNumQueries(12):
+        with self.assertNumQueries(16):
+            # (1-3) request.user & membership (4) round with quiz (5) play (6) savepoint
+            # (7) lock round (8-11) get or create play (12-13) standings (14) release savepoint
+            # (15-16) questions & options
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertListEqual(list(response.data.keys()), self.expected_keys)
-            self.assertEqual(len(response.data["questions"]), self.num_questions)
+            self.assertListEqual(list(response.json().keys()), self.expected_keys)
+            self.assertEqual(len(response.json()["questions"]), self.num_questions)
 
         self.assertEqual(Play.objects.count(), init_count + 1)
 
-        # reloading page returns the quiz again, but returns same Play:
-        with self.assertNumQueries(9):
+        # reloading page returns the same Play and the quiz rendered once:
+        with self.assertNumQueries(4):
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertListEqual(list(response.data.keys()), self.expected_keys)
-            self.assertEqual(len(response.data["questions"]), self.num_questions)
+            self.assertListEqual(list(response.json().keys()), self.expected_keys)
+            self.assertEqual(len(response.json()["questions"]), self.num_questions)
 
         self.assertEqual(Play.objects.count(), init_count + 1)
 
         # Bob is quiz author, he cannot play it:
         self.login_as("bob")
-        with self.assertNumQueries(5):
+        with self.assertNumQueries(4):
             response = get_response()
             self.assert_validation_failed(response, data=["You cannot play your own quiz."])
 
@@ -106,6 +117,9 @@ class SubmitRoundTest(SetupRoundsMixin, APITestCase):
                 {"question_id": 2, "option_id": 8},
             ]
         }
+        # answer keys are cached:
+        caches['default'].clear()
+        clear_local_cache()
     
     def test_normal(self):
         """
@@ -127,6 +141,9 @@ class SubmitRoundTest(SetupRoundsMixin, APITestCase):
         self.login_as("alice")
         self.client.post(self.start_url, {})    # (must start the round first)
         with self.assertNumQueries(14):
+            # (1-2) request.user (membership is cached) (3) round with quiz (4) play
+            # (5) answer key (6) savepoint (7) lock round (8) submit play (9) insert all answers
+            # (10-11) increment answer counts (12-13) score and passed players (14) release savepoint
             response = self.client.post(self.url, self.payload)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
@@ -136,6 +153,27 @@ class SubmitRoundTest(SetupRoundsMixin, APITestCase):
         self.assertIsNotNone(play.finish_time)
         self.assertEqual(PlayAnswer.objects.count(), init_answer_count + 2)
 
+        # next submissions are graded with the cached answer key (no question or option queries):
+        Membership.objects.create(user_id=self.USERS["ben"]["id"], community_id=self.GROUP_ID)
+        self.login_as("ben")
+        self.client.post(self.start_url, {})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, self.payload)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse([q for q in queries.captured_queries if '"quiz_question' in q["sql"]])
+        self.assertEqual(Play.objects.get(user_id=self.USERS["ben"]["id"]).result, 2)
+
+    def test_option_of_other_question_raises_400(self):
+        self.login_as("alice")
+        self.client.post(self.start_url, {})
+        response = self.client.post(self.url, {
+            "answers": [
+                {"question_id": 1, "option_id": 8},
+            ]
+        })
+        self.assert_validation_failed(response, data=["Option ids do not match."])
+        self.assertFalse(Play.objects.get(user_id=self.USERS["alice"]["id"]).is_submitted)
+
     def test_submit_without_starting_raises_404(self):
         """
         Submit without starting a round raises 404.
@@ -237,6 +275,68 @@ class SubmitRoundTest(SetupRoundsMixin, APITestCase):
 
 
 
+class SubmitRoundQueryCountTest(SetupRoundsMixin, APITestCase):
+    """
+    Number of queries per submission does not depend on the number of questions.
+    """
+    def setUp(self):
+        self.ROUND_ID = self.ROUNDS["round1"]["id"]
+        self.QUIZ_ID = self.ROUNDS["round1"]["quiz_id"]
+        kwargs = {"community_id": self.GROUP_ID, "round_id": self.ROUND_ID}
+        self.start_url = reverse('plays:start-round', kwargs=kwargs)
+        self.url = reverse('plays:submit-round', kwargs=kwargs)
+        caches['default'].clear()
+        clear_local_cache()
+
+    def add_questions(self, num_questions):
+        for _ in range(num_questions):
+            question = Question.objects.create(quiz_id=self.QUIZ_ID, text="Question")
+            for i in range(4):
+                Option.objects.create(question=question, text="Option", is_correct=(i == 0))
+
+    def submit_all_correct(self):
+        quiz = Quiz.objects.prefetch_related('questions__options').get(pk=self.QUIZ_ID)
+        answers = [
+            {
+                "question_id": question.id,
+                "option_id": next(o.id for o in question.options.all() if o.is_correct),
+            }
+            for question in quiz.questions.all()
+        ]
+        self.login_as("alice")
+        self.client.post(self.start_url, {})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(self.url, {"answers": answers})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        play = Play.objects.get(user_id=self.USERS["alice"]["id"], round_id=self.ROUND_ID)
+        self.assertEqual(play.result, len(answers))
+        self.assertEqual(PlayAnswer.objects.filter(play=play).count(), len(answers))
+        return len(queries)
+
+    def test_two_questions(self):
+        self.assertEqual(self.submit_all_correct(), 14)
+
+    def test_ten_questions(self):
+        self.add_questions(8)
+        self.assertEqual(self.submit_all_correct(), 14)
+
+    def test_concurrent_submit(self):
+        """
+        A play submitted by a concurrent request (after the check in `SubmitRound`) is not saved twice.
+        """
+        self.login_as("alice")
+        self.client.post(self.start_url, {})
+        play = Play.objects.select_related('round__quiz').get(user_id=self.USERS["alice"]["id"])
+        Play.objects.filter(pk=play.id).update(is_submitted=True, result=0)
+
+        serializer = SubmittedPlaySerializer(play, data={"answers": [{"question_id": 1, "option_id": 4}]})
+        serializer.is_valid(raise_exception=True)
+        with self.assertRaises(ValidationError):
+            serializer.save(play=play, answer_key=get_answer_key(play.round.quiz))
+        self.assertEqual(PlayAnswer.objects.count(), 0)
+        self.assertEqual(Play.objects.get(pk=play.id).result, 0)
+
+
 class ReviewRoundTest(SetupRoundsMixin, APITestCase):
     def setUp(self):
         self.ROUND = "round1"
@@ -270,6 +370,7 @@ class ReviewRoundTest(SetupRoundsMixin, APITestCase):
                 {"question_id": 2, "option_id": 7}, # wrong
             ]
         }
+        caches['default'].clear()   # rendered quizzes are cached
     
     def test_normal(self):
         """
@@ -284,12 +385,18 @@ class ReviewRoundTest(SetupRoundsMixin, APITestCase):
         self.client.post(self.start_url, {}) # start round
         self.client.post(self.submit_url, self.submit_payload) # submit round
 
-        with self.assertNumQueries(11):
+        with self.assertNumQueries(9):
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertListEqual(list(response.data.keys()), REVIEWED_ROUND_EXPECTED_KEYS)
             self.assertListEqual(list(response.data["play"].keys()), REVIEWED_PLAY_EXPECTED_KEYS)
 
+        # rendered quiz is cached (no questions and options are loaded):
+        with self.assertNumQueries(7):
+            response = get_response()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data["quiz"]["questions"]), 2)
+
 
     def test_cannot_review_non_submitted_round(self):
         get_response = lambda: self.client.get(self.url)
@@ -297,13 +404,13 @@ class ReviewRoundTest(SetupRoundsMixin, APITestCase):
         self.login_as("alice")
 
         # try reviewing before starting:
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(5):
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
         # try reviewing after starting but before submitting:
         self.client.post(self.start_url, {}) # start round
-        with self.assertNumQueries(8):
+        with self.assertNumQueries(4):
             response = get_response()
             self.assert_validation_failed(response, ["You have not finished this round yet."])
 
@@ -312,7 +419,7 @@ class ReviewRoundTest(SetupRoundsMixin, APITestCase):
         Quiz author can review a round at any time.
         """
         self.login_as("bob")
-        with self.assertNumQueries(9):
+        with self.assertNumQueries(8):
             response = self.client.get(self.url)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertListEqual(list(response.data.keys()), REVIEWED_ROUND_EXPECTED_KEYS)
@@ -1,15 +1,18 @@
-from collections import defaultdict
-
+import json
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework.renderers import JSONRenderer
 from rest_framework import serializers
+from django.db import transaction
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404
 
 from quizzz.common.permissions import IsAuthenticated
 from quizzz.communities.permissions import IsCommunityMember
-from quizzz.tournaments.models import Round
-from quizzz.quizzes.models import Quiz
-from .models import Play, PlayAnswer
+from quizzz.tournaments.models import Round, TournamentStanding
+from .models import Play
+from .answer_keys import get_answer_key
+from .payloads import get_quiz_payload, get_quiz_payload_data
 from .serializers import (
     SubmittedPlaySerializer, 
     PlayQuizSerializer, 
@@ -30,7 +33,7 @@ class StartRound(APIView):
 
     def post(self, request, community_id, round_id):
         # round information and checks:
-        round = get_object_or_404(Round.objects.filter(pk=round_id))
+        round = get_object_or_404(Round.objects.select_related('quiz').filter(pk=round_id))
         if not round.is_active:
             raise serializers.ValidationError(
                 "This round is not available (already finished or not started yet)."
@@ -39,20 +42,23 @@ class StartRound(APIView):
             raise serializers.ValidationError("You cannot play your own quiz.")
 
         # start a new play or continue (page reload)
-        (play, created) = Play.objects.get_or_create(
-            user_id=request.user.id, round_id=round_id)
+        play = Play.objects.filter(user_id=request.user.id, round_id=round_id).first()
+        if play is None:
+            # a started play counts in round standings right away:
+            with transaction.atomic():
+                TournamentStanding.lock_round(round)
+                (play, created) = Play.objects.get_or_create(
+                    user_id=request.user.id, round_id=round_id)
+                if created:
+                    TournamentStanding.add_started_play(round, play)
         if play.is_submitted:
             raise serializers.ValidationError("You have already played this round.")
         
-        # load quiz with questions
-        q = Quiz.objects\
-            .filter(pk=round.quiz_id)\
-            .prefetch_related('questions')\
-            .prefetch_related('questions__options')
-        quiz = get_object_or_404(q)
-
-        serializer = PlayQuizSerializer(quiz)
-        return Response(serializer.data)
+        # quiz with questions is rendered once for all players (see `payloads`):
+        payload = get_quiz_payload(round.quiz, PlayQuizSerializer)
+        if isinstance(request.accepted_renderer, JSONRenderer):
+            return HttpResponse(payload, content_type='application/json')
+        return Response(json.loads(payload))
 
 
 
@@ -64,7 +70,7 @@ class SubmitRound(APIView):
 
     def post(self, request, community_id, round_id):
         # load round information and run checks:
-        round = get_object_or_404(Round.objects.filter(pk=round_id))
+        round = get_object_or_404(Round.objects.select_related('quiz').filter(pk=round_id))
         if not round.is_active:
             raise serializers.ValidationError(
                 "This round is not available (already finished or not started yet)."
@@ -77,17 +83,11 @@ class SubmitRound(APIView):
         if play.is_submitted:
             raise serializers.ValidationError("You have already played this round.")
 
-        # load quiz with questions
-        quiz = get_object_or_404(
-            Quiz.objects.filter(pk=round.quiz_id)
-            .prefetch_related('questions')
-            .prefetch_related('questions__options')
-        )
-
-        # validate data and save results
+        # validate data and save results (graded without loading questions, see `answer_keys`):
+        play.round = round
         serializer = SubmittedPlaySerializer(play, data=request.data)
         if serializer.is_valid(raise_exception=True):
-            serializer.save(play=play, quiz=quiz)
+            serializer.save(play=play, answer_key=get_answer_key(round.quiz))
             return Response(serializer.data)
 
 
@@ -99,15 +99,9 @@ class ReviewRound(APIView):
 
     def get(self, request, community_id, round_id):
         # load round information and run checks:
-        round = get_object_or_404(Round.objects.filter(pk=round_id))
-
-        # load quiz with questions and author
-        quiz = get_object_or_404(
-            Quiz.objects.filter(pk=round.quiz_id)
-            .select_related('user')
-            .prefetch_related('questions')
-            .prefetch_related('questions__options')
-        )
+        round = get_object_or_404(
+            Round.objects.select_related('snapshot', 'quiz__user').filter(pk=round_id))
+        quiz = round.quiz
 
         # load a play and run checks (author has no play - but that's fine)
         play = None if quiz.user_id == request.user.id else get_object_or_404(
@@ -115,28 +109,33 @@ class ReviewRound(APIView):
         if play and not play.is_submitted:
             raise serializers.ValidationError("You have not finished this round yet.")
 
-        # load user answers:
-        play_answers = play.answers.all() if play else []
+        # load user answers (rows or packed):
+        if play:
+            play.round = round
+        play_answers = play.get_answers() if play else []
 
-        # load play count:
-        play_count = Play.objects.filter(round__id=round_id).count()
-        
-        # load all choice stats:
-        all_answers = PlayAnswer.objects.filter(play__round__id=round_id).all()
-        choices_by_question_id = { q.id: defaultdict(int) for q in quiz.questions.all() }
-        for answer in all_answers:
-            choices_by_question_id[answer.question_id][answer.option_id] += 1
+        # quiz with questions is rendered once for all players (see `payloads`):
+        quiz_data = get_quiz_payload_data(quiz, ReviewQuizSerializer)
+
+        # load play count and all choice stats (from snapshot when round is finished):
+        snapshot = round.get_result_snapshot()
+        if snapshot:
+            play_count = snapshot.play_count
+            choices_by_question_id = snapshot.answer_distribution
+        else:
+            play_count = Play.objects.filter(round__id=round_id).count()
+            choices_by_question_id = round.get_answer_distribution(
+                question_ids=[question["id"] for question in quiz_data["questions"]])
 
         # return data
         play_serializer = ReviewPlaySerializer(play)
         play_answers_serializer = SubmittedAnswerSerializer(play_answers, many=True)
-        quiz_serializer = ReviewQuizSerializer(quiz)
         author_serializer = UserForMembershipListSerializer(quiz.user)
 
         return Response({
             "play": play_serializer.data,
             "play_answers": play_answers_serializer.data,
-            "quiz": quiz_serializer.data,
+            "quiz": quiz_data,
             "author": author_serializer.data,
             "play_count": play_count,
             "choices_by_question_id": choices_by_question_id,   # counts for all plays
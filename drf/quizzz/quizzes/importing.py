@@ -0,0 +1,337 @@
+"""
+Streaming import of trivia questions into new quizzes.
+
+Supported formats (the file is parsed incrementally and questions are saved
+in batches, so memory use does not depend on the size of the file):
+
+- "opentdb": OpenTriviaDB API response or dump, i.e. {"response_code": 0, "results": [...]}
+  or a plain JSON array of questions:
+  {"question": "...", "correct_answer": "...", "incorrect_answers": ["...", ...]}
+- "ndjson": one JSON question per line, either in the OpenTriviaDB format or as
+  {"text": "...", "explanation": "...", "options": [{"text": "...", "is_correct": true}, ...]}
+- "csv": columns "question", "correct_answer", "explanation" (optional) and
+  any number of "incorrect_answer..." columns.
+
+Texts can be decoded with `encoding`: "html" (HTML entities, the default encoding
+of OpenTriviaDB), "base64", "url3986" (the other encodings of the OpenTriviaDB API)
+or "none" (default for CSV and NDJSON).
+"""
+import base64
+import codecs
+import csv
+import html
+import json
+import random
+import re
+from urllib.parse import unquote
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Quiz, Question, Option, QuestionSearchDocument, bulk_create_returning_ids
+
+
+FORMATS = ["opentdb", "ndjson", "csv"]
+FORMATS_BY_EXTENSION = {
+    ".json": "opentdb",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+    ".csv": "csv",
+}
+DECODERS = {
+    "none": lambda text: text,
+    "html": html.unescape,
+    "base64": lambda text: base64.b64decode(text, validate=True).decode("utf-8"),
+    "url3986": unquote,
+}
+CHUNK_SIZE = 64 * 1024
+MAX_TEXT_LENGTH = 1000
+MAX_REPORTED_ERRORS = 20
+
+
+class QuizImportError(Exception):
+    """
+    The file cannot be imported (nothing is saved in that case).
+    """
+
+
+def get_format(filename):
+    """
+    Guess the format of a file by its extension (None if unknown).
+    """
+    for extension, format in FORMATS_BY_EXTENSION.items():
+        if filename.lower().endswith(extension):
+            return format
+    return None
+
+
+# *** PARSERS ***
+# Parsers read a binary stream and yield raw records (dicts) one by one.
+
+def iter_json_array(stream, key="results", chunk_size=CHUNK_SIZE):
+    """
+    Yield items of a top-level JSON array or of the array under <key>
+    of a top-level JSON object, reading <stream> in chunks.
+    """
+    reader = codecs.getreader("utf-8-sig")(stream)
+    decoder = json.JSONDecoder()
+    buffer, position, is_eof = "", 0, False
+
+    def read_more():
+        nonlocal buffer, position, is_eof
+        chunk = reader.read(chunk_size)
+        # drop consumed text, so that the buffer holds the current item only:
+        buffer, position, is_eof = buffer[position:] + chunk, 0, not chunk
+
+    # find the beginning of the array:
+    array_start = re.compile(r'\s*\[|\s*\{.*?"%s"\s*:\s*\[' % re.escape(key), re.DOTALL)
+    while True:
+        match = array_start.match(buffer)
+        if match:
+            position = match.end()
+            break
+        if is_eof:
+            raise QuizImportError(f'JSON array (or an object with "{key}" array) expected.')
+        read_more()
+
+    while True:
+        # skip separators between items:
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                position += 1
+            if position < len(buffer) or is_eof:
+                break
+            read_more()
+
+        if position == len(buffer):
+            raise QuizImportError("Unexpected end of JSON array.")
+        if buffer[position] == "]":
+            return
+
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as e:
+            if is_eof:
+                raise QuizImportError(f"Invalid JSON: {e}")
+            read_more()
+            continue
+        position = end
+        yield item
+
+
+def iter_ndjson(stream):
+    """
+    Yield JSON objects of non-empty lines (invalid lines are yielded as ValueError).
+    """
+    for line in codecs.getreader("utf-8-sig")(stream):
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON: {e}")
+
+
+def iter_csv(stream):
+    """
+    Yield CSV rows as OpenTriviaDB-like records.
+    """
+    rows = csv.DictReader(codecs.getreader("utf-8-sig")(stream))
+    if not rows.fieldnames or not {"question", "correct_answer"} <= set(rows.fieldnames):
+        raise QuizImportError('CSV columns "question" and "correct_answer" are required.')
+
+    incorrect_answer_columns = [
+        column for column in rows.fieldnames if column.startswith("incorrect_answer")
+    ]
+    for row in rows:
+        yield {
+            "question": row["question"],
+            "explanation": row.get("explanation") or "",
+            "correct_answer": row["correct_answer"],
+            "incorrect_answers": [
+                row[column] for column in incorrect_answer_columns if row[column]
+            ],
+        }
+
+
+PARSERS = {
+    "opentdb": iter_json_array,
+    "ndjson": iter_ndjson,
+    "csv": iter_csv,
+}
+
+
+def iter_records(stream, format):
+    """
+    Yield raw records of <stream> parsed as <format>; errors of the whole file
+    (decoding, CSV syntax) are raised as QuizImportError.
+    """
+    try:
+        yield from PARSERS[format](stream)
+    except UnicodeDecodeError:
+        raise QuizImportError("File is not UTF-8 encoded.")
+    except csv.Error as e:
+        raise QuizImportError(f"Invalid CSV: {e}")
+
+
+def parse_question(record, decode):
+    """
+    Convert a raw record into {"text", "explanation", "options": [(text, is_correct)]}
+    or raise ValueError if it cannot be imported.
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("Question must be an object.")
+
+    if "options" in record:
+        if not isinstance(record["options"], list):
+            raise ValueError('"options" must be a list.')
+        text = record.get("text")
+        options = [
+            (option.get("text"), option.get("is_correct") is True)
+            for option in record["options"] if isinstance(option, dict)
+        ]
+    else:
+        if not isinstance(record.get("incorrect_answers"), list):
+            raise ValueError('"incorrect_answers" must be a list.')
+        text = record.get("question")
+        options = [(record.get("correct_answer"), True)]
+        options += [(answer, False) for answer in record["incorrect_answers"]]
+        if record.get("type") == "boolean":
+            options.sort(key=lambda option: option[0] != "True")
+        else:
+            # the correct answer goes first in these formats:
+            random.shuffle(options)
+
+    explanation = record.get("explanation") or ""
+    for value in [text, explanation] + [option_text for option_text, _ in options]:
+        if not isinstance(value, str):
+            raise ValueError("Texts must be strings.")
+
+    question = {
+        "text": decode(text),
+        "explanation": decode(explanation),
+        "options": [(decode(option_text), is_correct) for option_text, is_correct in options],
+    }
+    texts = [question["text"]] + [option_text for option_text, _ in question["options"]]
+    if not all(texts):
+        raise ValueError("Question and option texts are required.")
+    if max(len(text) for text in texts + [question["explanation"]]) > MAX_TEXT_LENGTH:
+        raise ValueError(f"Texts must have no more than {MAX_TEXT_LENGTH} characters.")
+    if len(question["options"]) < 2:
+        raise ValueError("At least 2 options are required.")
+    if sum(is_correct for _, is_correct in question["options"]) != 1:
+        raise ValueError("Exactly one correct option is required.")
+    return question
+
+
+# *** IMPORT ***
+class QuizImporter:
+    """
+    Create draft quizzes of <user> in a community from parsed questions
+    (<questions_per_quiz> questions per quiz, the last quiz may have fewer).
+    Quizzes, questions, options and search documents are inserted with
+    one bulk query per model for every <batch_size> questions.
+    """
+    def __init__(self, user, community_id, name="Imported Quiz", description="",
+        questions_per_quiz=None, batch_size=None, max_questions=None):
+        self.user = user
+        self.community_id = community_id
+        self.name = name[:Quiz._meta.get_field("name").max_length - 10]
+        self.description = description[:Quiz._meta.get_field("description").max_length]
+        self.questions_per_quiz = questions_per_quiz or settings.QUIZZZ_QUESTIONS_PER_QUIZ
+        self.batch_size = batch_size or settings.QUIZZZ_IMPORT_BATCH_SIZE
+        self.max_questions = max_questions
+
+        self.num_quizzes = 0
+        self.num_questions = 0
+        self.num_skipped = 0
+        self.errors = []
+
+    def run(self, stream, format, encoding=None):
+        """
+        Import questions from <stream> in one transaction and return the summary.
+        Records that cannot be imported are skipped (and reported).
+        """
+        if format not in PARSERS:
+            raise QuizImportError(f"Unknown format: {format}.")
+        decode = DECODERS[encoding or ("html" if format == "opentdb" else "none")]
+
+        with transaction.atomic():
+            batch, quiz_questions = [], []
+            for number, record in enumerate(iter_records(stream, format), 1):
+                try:
+                    question = parse_question(record, decode)
+                except ValueError as e:
+                    self.skip(number, e)
+                    continue
+
+                if self.max_questions and self.num_questions >= self.max_questions:
+                    raise QuizImportError(f"Files with more than {self.max_questions} questions cannot be imported.")
+                self.num_questions += 1
+                quiz_questions.append(question)
+                if len(quiz_questions) == self.questions_per_quiz:
+                    batch.append(quiz_questions)
+                    quiz_questions = []
+                    if len(batch) * self.questions_per_quiz >= self.batch_size:
+                        self.save_batch(batch)
+                        batch = []
+
+            if quiz_questions:
+                batch.append(quiz_questions)
+            self.save_batch(batch)
+
+        return self.get_summary()
+
+    def skip(self, number, error):
+        self.num_skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(f"Question {number}: {error}")
+
+    def save_batch(self, batch):
+        """
+        Save quizzes of a batch (a list of lists of parsed questions).
+        """
+        if not batch:
+            return
+        quizzes = []
+        for questions in batch:
+            self.num_quizzes += 1
+            quizzes.append(Quiz(
+                name=f"{self.name} {self.num_quizzes}",
+                description=self.description,
+                num_questions=len(questions),
+                num_options=max(len(question["options"]) for question in questions),
+                user=self.user,
+                community_id=self.community_id,
+            ))
+        bulk_create_returning_ids(Quiz, quizzes, user_id=self.user.id, community_id=self.community_id)
+
+        orm_questions = bulk_create_returning_ids(
+            Question,
+            [
+                Question(quiz=quiz, text=question["text"], explanation=question["explanation"])
+                for quiz, questions in zip(quizzes, batch)
+                for question in questions
+            ],
+            quiz_id__in=[quiz.id for quiz in quizzes],
+        )
+        questions = [question for questions in batch for question in questions]
+        Option.objects.bulk_create([
+            Option(question=orm_question, text=text, is_correct=is_correct)
+            for orm_question, question in zip(orm_questions, questions)
+            for text, is_correct in question["options"]
+        ])
+        QuestionSearchDocument.objects.bulk_create([
+            QuestionSearchDocument.build(
+                orm_question.quiz, orm_question, [text for text, _ in question["options"]])
+            for orm_question, question in zip(orm_questions, questions)
+        ])
+
+    def get_summary(self):
+        return {
+            "quizzes": self.num_quizzes,
+            "questions": self.num_questions,
+            "skipped": self.num_skipped,
+            "errors": self.errors,
+        }
@@ -0,0 +1,69 @@
+import os
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzz.communities.models import Membership
+from quizzz.quizzes.importing import DECODERS, FORMATS, QuizImporter, QuizImportError, get_format
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Imports trivia questions from a file (OpenTriviaDB JSON, NDJSON or CSV) '
+        'into new draft quizzes of a community member.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('community_id', type=int,
+            help='Community of the new quizzes.')
+        parser.add_argument('path',
+            help='File to import.')
+        parser.add_argument('--user', required=True,
+            help='Username of the author of the new quizzes (a member of the community).')
+        parser.add_argument('--format', choices=FORMATS,
+            help='Format of the file (guessed from the file extension by default).')
+        parser.add_argument('--encoding', choices=list(DECODERS),
+            help='Encoding of texts ("html" for OpenTriviaDB JSON, "none" otherwise by default).')
+        parser.add_argument('--name', default='Imported Quiz',
+            help='Name of the new quizzes (followed by a number).')
+        parser.add_argument('--questions-per-quiz', type=int,
+            help='Number of questions per quiz (QUIZZZ_QUESTIONS_PER_QUIZ by default).')
+        parser.add_argument('--batch-size', type=int,
+            help='Number of questions inserted by one query (QUIZZZ_IMPORT_BATCH_SIZE by default).')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist.')
+        is_member = Membership.objects\
+            .filter(user=user, community_id=options['community_id'], is_approved=True)\
+            .exists()
+        if not is_member:
+            raise CommandError(f'User "{user.username}" is not a member of community {options["community_id"]}.')
+
+        format = options['format'] or get_format(options['path'])
+        if format is None:
+            raise CommandError('Cannot guess the format from the file name, use --format.')
+
+        importer = QuizImporter(
+            user=user,
+            community_id=options['community_id'],
+            name=options['name'],
+            description=f'Imported from {os.path.basename(options["path"])}',
+            questions_per_quiz=options['questions_per_quiz'],
+            batch_size=options['batch_size'],
+        )
+        try:
+            with open(options['path'], 'rb') as stream:
+                summary = importer.run(stream, format, options['encoding'])
+        except (OSError, QuizImportError) as e:
+            raise CommandError(f'Cannot import {options["path"]}: {e}')
+
+        for error in summary['errors']:
+            self.stderr.write(error)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {summary["questions"]} question(s) into {summary["quizzes"]} quiz(zes), '
+            f'skipped {summary["skipped"]} question(s).'
+        ))
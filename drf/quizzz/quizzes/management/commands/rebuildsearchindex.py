@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from quizzz.quizzes.models import Quiz, QuestionSearchDocument
+from quizzz.quizzes.search import rebuild_index
+
+
+FIELDS = ['question_id', 'quiz_id', 'community_id', 'quiz_name', 'text', 'explanation', 'options']
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds search documents of quiz questions and the full-text index, '
+        'and verifies that stored documents match quizzes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('community_ids', nargs='*', type=int,
+            help='Communities to process (all communities by default).')
+        parser.add_argument('--check', action='store_true',
+            help='Only verify stored documents without rebuilding them.')
+        parser.add_argument('--batch-size', type=int, default=100,
+            help='Number of quizzes processed at once.')
+
+    def handle(self, *args, **options):
+        quiz_ids = Quiz.objects.order_by('id')
+        if options['community_ids']:
+            quiz_ids = quiz_ids.filter(community_id__in=options['community_ids'])
+        quiz_ids = list(quiz_ids.values_list('id', flat=True))
+
+        num_mismatches = 0
+        for start in range(0, len(quiz_ids), options['batch_size']):
+            batch = quiz_ids[start:start + options['batch_size']]
+            if not options['check']:
+                with transaction.atomic():
+                    QuestionSearchDocument.refresh(quiz_ids=batch)
+
+            errors = self.compare(
+                QuestionSearchDocument.objects.filter(quiz_id__in=batch),
+                QuestionSearchDocument.build_all(quiz_ids=batch),
+            )
+            for error in errors:
+                self.stderr.write(error)
+            num_mismatches += len(errors)
+
+        if not options['check']:
+            rebuild_index()
+
+        if num_mismatches:
+            raise CommandError(f'{num_mismatches} search document(s) are out of date.')
+        self.stdout.write(self.style.SUCCESS(f'Search documents of {len(quiz_ids)} quiz(zes) are up to date.'))
+
+    @staticmethod
+    def compare(stored, expected):
+        """
+        Compare stored documents with expected ones and return a list of errors.
+        """
+        stored_by_id = {row[0]: row for row in stored.values_list(*FIELDS)}
+        expected_by_id = {
+            document.question_id: tuple(getattr(document, field) for field in FIELDS)
+            for document in expected
+        }
+        return [
+            f'Question {question_id}: stored {stored_by_id.get(question_id)}, '
+            f'expected {expected_by_id.get(question_id)}'
+            for question_id in sorted(set(stored_by_id) | set(expected_by_id))
+            if stored_by_id.get(question_id) != expected_by_id.get(question_id)
+        ]
@@ -0,0 +1,123 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Full-text index of search documents (see `quizzz.quizzes.search`):
+POSTGRESQL_INDEX_SQL = [
+    """
+    ALTER TABLE quiz_question_search ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', text), 'A') ||
+        setweight(to_tsvector('english', quiz_name), 'B') ||
+        setweight(to_tsvector('english', options), 'B') ||
+        setweight(to_tsvector('english', explanation), 'C')
+    ) STORED
+    """,
+    "CREATE INDEX quiz_question_search_vector ON quiz_question_search USING GIN (search_vector)",
+]
+POSTGRESQL_DROP_INDEX_SQL = [
+    "DROP INDEX quiz_question_search_vector",
+    "ALTER TABLE quiz_question_search DROP COLUMN search_vector",
+]
+# external content FTS5 table synchronized by triggers:
+SQLITE_INDEX_SQL = [
+    """
+    CREATE VIRTUAL TABLE quiz_question_search_fts USING fts5(
+        text, quiz_name, options, explanation,
+        content='quiz_question_search', content_rowid='question_id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER quiz_question_search_insert AFTER INSERT ON quiz_question_search BEGIN
+        INSERT INTO quiz_question_search_fts(rowid, text, quiz_name, options, explanation)
+        VALUES (new.question_id, new.text, new.quiz_name, new.options, new.explanation);
+    END
+    """,
+    """
+    CREATE TRIGGER quiz_question_search_delete AFTER DELETE ON quiz_question_search BEGIN
+        INSERT INTO quiz_question_search_fts(quiz_question_search_fts, rowid, text, quiz_name, options, explanation)
+        VALUES ('delete', old.question_id, old.text, old.quiz_name, old.options, old.explanation);
+    END
+    """,
+    """
+    CREATE TRIGGER quiz_question_search_update AFTER UPDATE ON quiz_question_search BEGIN
+        INSERT INTO quiz_question_search_fts(quiz_question_search_fts, rowid, text, quiz_name, options, explanation)
+        VALUES ('delete', old.question_id, old.text, old.quiz_name, old.options, old.explanation);
+        INSERT INTO quiz_question_search_fts(rowid, text, quiz_name, options, explanation)
+        VALUES (new.question_id, new.text, new.quiz_name, new.options, new.explanation);
+    END
+    """,
+]
+SQLITE_DROP_INDEX_SQL = [
+    "DROP TRIGGER quiz_question_search_update",
+    "DROP TRIGGER quiz_question_search_delete",
+    "DROP TRIGGER quiz_question_search_insert",
+    "DROP TABLE quiz_question_search_fts",
+]
+
+
+def run_sql(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    run_sql(schema_editor, {"postgresql": POSTGRESQL_INDEX_SQL, "sqlite": SQLITE_INDEX_SQL})
+
+
+def drop_index(apps, schema_editor):
+    run_sql(schema_editor, {"postgresql": POSTGRESQL_DROP_INDEX_SQL, "sqlite": SQLITE_DROP_INDEX_SQL})
+
+
+def create_documents(apps, schema_editor):
+    Question = apps.get_model('quizzes', 'Question')
+    Option = apps.get_model('quizzes', 'Option')
+    QuestionSearchDocument = apps.get_model('quizzes', 'QuestionSearchDocument')
+
+    option_texts_by_question_id = {}
+    for question_id, text in Option.objects.order_by('id').values_list('question_id', 'text').iterator():
+        option_texts_by_question_id.setdefault(question_id, []).append(text)
+
+    documents = []
+    for question in Question.objects.select_related('quiz').iterator():
+        option_texts = option_texts_by_question_id.get(question.id, [])
+        if question.text or question.explanation or any(option_texts):
+            documents.append(QuestionSearchDocument(
+                question_id=question.id,
+                quiz_id=question.quiz_id,
+                community_id=question.quiz.community_id,
+                quiz_name=question.quiz.name,
+                text=question.text,
+                explanation=question.explanation,
+                options="\n".join(option_texts),
+            ))
+    QuestionSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0001_initial'),
+        ('quizzes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSearchDocument',
+            fields=[
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='quizzes.question')),
+                ('quiz_name', models.CharField(max_length=100)),
+                ('text', models.CharField(max_length=1000)),
+                ('explanation', models.CharField(max_length=1000)),
+                ('options', models.TextField()),
+                ('community', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='communities.community')),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='quizzes.quiz')),
+            ],
+            options={
+                'db_table': 'quiz_question_search',
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+        migrations.RunPython(create_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:51
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from quizzz.quizzes.similarity import get_buckets
+
+
+def create_buckets(apps, schema_editor):
+    Question = apps.get_model('quizzes', 'Question')
+    QuestionSimilarityBucket = apps.get_model('quizzes', 'QuestionSimilarityBucket')
+
+    questions = Question.objects\
+        .filter(quiz__is_finalized=True)\
+        .values_list('id', 'quiz__community_id', 'text')
+    buckets = [
+        QuestionSimilarityBucket(question_id=question_id, community_id=community_id, bucket=bucket)
+        for question_id, community_id, text in questions.iterator()
+        for bucket in get_buckets(text)
+    ]
+    QuestionSimilarityBucket.objects.bulk_create(buckets, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0001_initial'),
+        ('quizzes', '0002_question_search_document'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionSimilarityBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('community', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='communities.community')),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='quizzes.question')),
+            ],
+            options={
+                'db_table': 'quiz_question_similarity_buckets',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='questionsimilaritybucket',
+            index=models.Index(fields=['community', 'bucket'], name='quiz_similarity_bucket_idx'),
+        ),
+        migrations.RunPython(create_buckets, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,32 @@
-from django.db import models, transaction
+from django.db import models, transaction, connections
 from django.conf import settings
 
 from quizzz.common.models import TimeStampedModel
 from quizzz.communities.models import Community
 
+from . import similarity
+
+
+def bulk_create_returning_ids(model, objects, **filters):
+    """
+    Insert new <objects> of <model> in one query and return them with ids.
+
+    On databases that do not return ids from bulk inserts (SQLite) the ids
+    of the last inserted rows matching <filters> are selected in another query.
+    This is safe for rows inserted in the same transaction, because SQLite 
+    serializes writes (call it inside `transaction.atomic()` when <filters> 
+    may match rows inserted concurrently).
+    """
+    model.objects.bulk_create(objects)
+    if objects and not connections[model.objects.db].features.can_return_rows_from_bulk_insert:
+        ids = model.objects\
+            .filter(**filters)\
+            .order_by('-id')\
+            .values_list('id', flat=True)[:len(objects)]
+        for obj, id in zip(objects, reversed(list(ids))):
+            obj.id = id
+    return objects
+
 
 class Quiz(TimeStampedModel):
     name = models.CharField(max_length=100, default="Anonymous Quiz")
@@ -25,10 +48,23 @@ class Quiz(TimeStampedModel):
         verbose_name_plural = "quizzes"
 
     def init_questions(self):
-        for _ in range(self.num_questions):             
-            question = Question.objects.create(quiz=self)
-            for _ in range(self.num_options):
-                Option.objects.create(question=question)
+        """
+        Create empty questions and options of a new quiz in bulk.
+        """
+        questions = self.bulk_create_questions(
+            [Question(quiz=self) for _ in range(self.num_questions)])
+        Option.objects.bulk_create([
+            Option(question=question)
+            for question in questions
+            for _ in range(self.num_options)
+        ])
+
+    def bulk_create_questions(self, questions):
+        """
+        Insert <questions> of a new quiz (without other questions) in one query
+        and return them with ids (see `bulk_create_returning_ids()`).
+        """
+        return bulk_create_returning_ids(Question, questions, quiz_id=self.id)
 
     @classmethod
     def create_with_questions(cls, **kwargs):
@@ -38,6 +74,40 @@ class Quiz(TimeStampedModel):
             quiz.init_questions()
         return quiz
 
+    def clone(self, user, **kwargs):
+        """
+        Copy the quiz with all questions and options into a new draft of <user>
+        in a constant number of queries. <kwargs> override copied quiz fields (e.g. name).
+        """
+        questions = list(self.questions.prefetch_related('options').order_by('id'))
+        fields = {
+            "name": self.name,
+            "description": self.description,
+            "introduction": self.introduction,
+            "num_questions": self.num_questions,
+            "num_options": self.num_options,
+            "community_id": self.community_id,
+            **kwargs,
+        }
+        with transaction.atomic():
+            quiz = Quiz.objects.create(user=user, **fields)
+            new_questions = quiz.bulk_create_questions([
+                Question(quiz=quiz, text=question.text, explanation=question.explanation)
+                for question in questions
+            ])
+            Option.objects.bulk_create([
+                Option(question=new_question, text=option.text, is_correct=option.is_correct)
+                for question, new_question in zip(questions, new_questions)
+                for option in question.options.all()
+            ])
+            new_documents = [
+                QuestionSearchDocument.build(
+                    quiz, new_question, [option.text for option in question.options.all()])
+                for question, new_question in zip(questions, new_questions)
+            ]
+            QuestionSearchDocument.objects.bulk_create([document for document in new_documents if document])
+        return quiz
+
 
 class Question(models.Model):
     text = models.CharField(max_length=1000, default="", blank=True)
@@ -72,4 +142,169 @@ class Option(models.Model):
             self.text[:20] + (" (correct)" if self.is_correct else ""), self.id)
 
     class Meta:
-        db_table = "quiz_question_options"
\ No newline at end of file
+        db_table = "quiz_question_options"
+
+
+class QuestionSearchDocument(models.Model):
+    """
+    Searchable text of a question together with its quiz name and options.
+
+    Documents are indexed by the full-text search of the database (a generated
+    `tsvector` column with a GIN index on PostgreSQL, an FTS5 table kept in sync 
+    by triggers on SQLite, see migration 0002 and `quizzz.quizzes.search`) and 
+    refreshed by the code that changes quizzes. Questions without any text are 
+    not indexed. Use `manage.py rebuildsearchindex` to rebuild documents.
+    """
+    question = models.OneToOneField(Question, 
+        primary_key=True,
+        related_name="search_document",
+        on_delete=models.CASCADE
+    )
+    quiz = models.ForeignKey(Quiz, related_name="+", on_delete=models.CASCADE)
+    community = models.ForeignKey(Community, related_name="+", on_delete=models.CASCADE)
+
+    quiz_name = models.CharField(max_length=100)
+    text = models.CharField(max_length=1000)
+    explanation = models.CharField(max_length=1000)
+    options = models.TextField()   # option texts, one per line
+
+    class Meta:
+        db_table = "quiz_question_search"
+
+    def __str__(self):
+        return "<QuestionSearchDocument: %r [%r]>" % (self.text[:20], self.question_id)
+
+    @classmethod
+    def build(cls, quiz, question, option_texts):
+        """
+        Return a new document of <question> (None if it has no text).
+        """
+        if not (question.text or question.explanation or any(option_texts)):
+            return None
+        return cls(
+            question_id=question.id,
+            quiz_id=quiz.id,
+            community_id=quiz.community_id,
+            quiz_name=quiz.name,
+            text=question.text,
+            explanation=question.explanation,
+            options="\n".join(option_texts),
+        )
+
+    @classmethod
+    def build_all(cls, quiz_ids=None, question_ids=None):
+        """
+        Return new documents of questions of <quiz_ids> or of <question_ids> (2 queries).
+        """
+        questions = Question.objects.select_related('quiz').order_by('id')
+        if quiz_ids is not None:
+            questions = questions.filter(quiz_id__in=quiz_ids)
+        if question_ids is not None:
+            questions = questions.filter(id__in=question_ids)
+        questions = list(questions)
+
+        option_texts_by_question_id = {}
+        option_rows = Option.objects\
+            .filter(question_id__in=[question.id for question in questions])\
+            .order_by('id')\
+            .values_list('question_id', 'text')
+        for question_id, text in option_rows:
+            option_texts_by_question_id.setdefault(question_id, []).append(text)
+
+        documents = [
+            cls.build(question.quiz, question, option_texts_by_question_id.get(question.id, []))
+            for question in questions
+        ]
+        return [document for document in documents if document]
+
+    @classmethod
+    def refresh(cls, quiz_ids=None, question_ids=None):
+        """
+        Rebuild documents of questions of <quiz_ids> or of <question_ids> in 4 queries
+        (call it in the transaction that changes the questions).
+        """
+        documents = cls.objects.all()
+        if quiz_ids is not None:
+            documents = documents.filter(quiz_id__in=quiz_ids)
+        if question_ids is not None:
+            documents = documents.filter(question_id__in=question_ids)
+        new_documents = cls.build_all(quiz_ids, question_ids)
+
+        with transaction.atomic(savepoint=False):
+            documents.delete()
+            cls.objects.bulk_create(new_documents)
+
+
+class QuestionSimilarityBucket(models.Model):
+    """
+    LSH bucket of the text of a question of a finalized quiz (see `quizzz.quizzes.similarity`).
+    Questions sharing a bucket in a community are candidate near-duplicates.
+    """
+    question = models.ForeignKey(Question, related_name="+", on_delete=models.CASCADE)
+    community = models.ForeignKey(Community, related_name="+", on_delete=models.CASCADE)
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        db_table = "quiz_question_similarity_buckets"
+        indexes = [
+            models.Index(fields=['community', 'bucket'], name='quiz_similarity_bucket_idx'),
+        ]
+
+    @classmethod
+    def index_quiz(cls, quiz):
+        """
+        (Re)index questions of a finalized <quiz> in 3 queries.
+        """
+        questions = Question.objects.filter(quiz_id=quiz.id).values_list('id', 'text')
+        buckets = [
+            cls(question_id=question_id, community_id=quiz.community_id, bucket=bucket)
+            for question_id, text in questions
+            for bucket in similarity.get_buckets(text)
+        ]
+        with transaction.atomic(savepoint=False):
+            cls.objects.filter(question__quiz_id=quiz.id).delete()
+            cls.objects.bulk_create(buckets)
+
+    @classmethod
+    def find_duplicates(cls, quiz, questions, min_similarity=None, visible=None):
+        """
+        Return {question id: [(similar question, similarity), ...]} for <questions>
+        of <quiz> with similar questions of other finalized quizzes of the community
+        (most similar first), limited to questions matching the <visible> filter if given.
+        Only questions sharing a bucket are compared (1 query).
+        """
+        if min_similarity is None:
+            min_similarity = settings.QUIZZZ_DUPLICATE_QUESTION_SIMILARITY
+        buckets_by_question_id = {question.id: similarity.get_buckets(question.text) for question in questions}
+        all_buckets = {bucket for buckets in buckets_by_question_id.values() for bucket in buckets}
+        if not all_buckets:
+            return {}
+
+        candidate_ids = cls.objects\
+            .filter(community_id=quiz.community_id, bucket__in=all_buckets)\
+            .values('question_id')
+        candidates = Question.objects\
+            .filter(id__in=candidate_ids)\
+            .exclude(quiz_id=quiz.id)\
+            .select_related('quiz')\
+            .order_by('id')
+        if visible is not None:
+            candidates = candidates.filter(visible)
+        candidates = [
+            (candidate, set(similarity.get_buckets(candidate.text)), similarity.get_shingles(candidate.text))
+            for candidate in candidates
+        ]
+
+        duplicates = {}
+        for question in questions:
+            buckets = set(buckets_by_question_id[question.id])
+            shingles = similarity.get_shingles(question.text)
+            found = []
+            for candidate, candidate_buckets, candidate_shingles in candidates:
+                if buckets & candidate_buckets:
+                    value = similarity.get_similarity(shingles, candidate_shingles)
+                    if value >= min_similarity:
+                        found.append((candidate, value))
+            if found:
+                duplicates[question.id] = sorted(found, key=lambda item: -item[1])
+        return duplicates
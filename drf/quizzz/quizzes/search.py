@@ -0,0 +1,81 @@
+"""
+Full-text search of quiz questions by `QuestionSearchDocument`s.
+
+PostgreSQL matches the generated `search_vector` column (GIN index) with
+`websearch_to_tsquery()` and ranks by `ts_rank()`. SQLite matches the FTS5 table
+`quiz_question_search_fts` and ranks by `bm25()`. Other databases fall back to
+unranked substring matching. See migration 0002 for the index definitions.
+"""
+import re
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import QuestionSearchDocument
+
+
+# text search configuration of the generated `search_vector` column:
+POSTGRESQL_CONFIG = "english"
+# weights of columns of the FTS5 table (text, quiz_name, options, explanation):
+SQLITE_WEIGHTS = "4.0, 2.0, 2.0, 1.0"
+
+
+def get_fts5_query(query):
+    """
+    Convert a user query into an FTS5 query: all words must match,
+    the last one as a prefix (None if the query has no words).
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return " ".join(f'"{word}"' for word in words) + "*"
+
+
+def search_documents(documents, query):
+    """
+    Filter <documents> (a queryset of QuestionSearchDocument) by a user <query>
+    and annotate them with `rank` (higher is better).
+    """
+    vendor = connections[documents.db].vendor
+
+    if vendor == "postgresql":
+        tsquery = f"websearch_to_tsquery('{POSTGRESQL_CONFIG}', %s)"
+        return documents\
+            .filter(RawSQL(
+                f"quiz_question_search.search_vector @@ {tsquery}",
+                [query], output_field=BooleanField()))\
+            .annotate(rank=RawSQL(
+                f"ts_rank(quiz_question_search.search_vector, {tsquery})",
+                [query], output_field=FloatField()))
+
+    if vendor == "sqlite":
+        fts_query = get_fts5_query(query)
+        if fts_query is None:
+            return documents.none()
+        return documents\
+            .filter(RawSQL(
+                "quiz_question_search.question_id IN ("
+                "SELECT rowid FROM quiz_question_search_fts WHERE quiz_question_search_fts MATCH %s)",
+                [fts_query], output_field=BooleanField()))\
+            .annotate(rank=RawSQL(
+                f"(SELECT -bm25(quiz_question_search_fts, {SQLITE_WEIGHTS}) FROM quiz_question_search_fts "
+                "WHERE quiz_question_search_fts MATCH %s AND rowid = quiz_question_search.question_id)",
+                [fts_query], output_field=FloatField()))
+
+    condition = Q()
+    for word in query.split():
+        condition &= Q(text__icontains=word) | Q(quiz_name__icontains=word) \
+            | Q(options__icontains=word) | Q(explanation__icontains=word)
+    return documents.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+def rebuild_index():
+    """
+    Rebuild the full-text index from documents (the generated PostgreSQL
+    column is always up to date, the SQLite FTS5 table is rebuilt).
+    """
+    connection = connections[QuestionSearchDocument.objects.db]
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO quiz_question_search_fts(quiz_question_search_fts) VALUES('rebuild')")
@@ -14,16 +14,20 @@ Therefore, for example, `validate_questions()` of EditableQuizSerializer
 runs after `validate()` method of each EditableQuestionSerializer.
 """
 from django.db import transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
-from .models import Quiz, Question, Option
+from .models import Quiz, Question, Option, QuestionSearchDocument, QuestionSimilarityBucket
+from .importing import FORMATS, DECODERS, get_format
+from quizzz.common.serializers import SparseFieldsetsMixin
 
 from django.contrib.auth import get_user_model
 User = get_user_model()
 
 
 # *** BASIC QUIZ SERIALIZER ***
-class ListedQuizSerializer(serializers.ModelSerializer):
+class ListedQuizSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer to create new empty quiz (with questions) 
     or show existing ones in a list.
@@ -43,7 +47,92 @@ class ListedQuizSerializer(serializers.ModelSerializer):
 
 
 
+class QuizImportSerializer(serializers.Serializer):
+    """
+    Uploaded file of questions to import into new quizzes (see `importing.py`).
+    The format is guessed from the file name unless given.
+    """
+    file = serializers.FileField()
+    format = serializers.ChoiceField(choices=FORMATS, required=False)
+    encoding = serializers.ChoiceField(choices=list(DECODERS), required=False)
+    name = serializers.CharField(max_length=90, required=False)
+
+    def validate(self, data):
+        if "format" not in data:
+            data["format"] = get_format(data["file"].name)
+            if data["format"] is None:
+                raise serializers.ValidationError({"format": ["Cannot guess the format from the file name."]})
+        return data
+
+
+
 # *** EDITABLE QUIZ SERIALIZER ***
+def get_single_correct_answer_error(options, is_finalized):
+    """
+    Return an error message if question <options> (dicts) do not have 
+    exactly one correct answer (a draft may have none), otherwise None.
+    """
+    num_correct_options = sum(option.get("is_correct") is True for option in options)
+    error = None
+    if is_finalized and num_correct_options == 0:
+        error = "No correct answer selected."
+    if num_correct_options > 1:
+        error = "Multiple answers not allowed."
+    return error
+
+
+def set_changed_fields(orm_object, data, fields):
+    """
+    Set <fields> of <orm_object> that are present in <data> 
+    and return names of the fields whose values have changed.
+    """
+    changed_fields = []
+    for field in fields:
+        if field in data and getattr(orm_object, field) != data[field]:
+            setattr(orm_object, field, data[field])
+            changed_fields.append(field)
+    return changed_fields
+
+
+def save_changed_objects(quiz, quiz_fields, questions, question_fields, options, option_fields):
+    """
+    Write changed <fields> of a quiz, its questions and options 
+    (one bulk update per model) and return the number of written rows by model.
+    """
+    is_changed = bool(quiz_fields or questions or options)
+    if is_changed:
+        with transaction.atomic():
+            if questions:
+                Question.objects.bulk_update(questions, sorted(question_fields))
+            if options:
+                Option.objects.bulk_update(options, sorted(option_fields))
+            # quiz is saved on any change: its `time_updated` versions
+            # cached quiz payloads and answer keys of rounds
+            quiz.save(update_fields=list(quiz_fields) + ['time_updated'])
+
+            # refresh search documents of changed texts:
+            if 'name' in quiz_fields:
+                QuestionSearchDocument.refresh(quiz_ids=[quiz.id])
+            else:
+                question_ids = set()
+                if {'text', 'explanation'} & set(question_fields):
+                    question_ids |= {question.id for question in questions}
+                if 'text' in option_fields:
+                    question_ids |= {option.question_id for option in options}
+                if question_ids:
+                    QuestionSearchDocument.refresh(question_ids=question_ids)
+
+            # finalized questions join the history compared by duplicate detection:
+            if 'is_finalized' in quiz_fields and quiz.is_finalized:
+                QuestionSimilarityBucket.index_quiz(quiz)
+
+    return {
+        "quizzes": int(is_changed),
+        "questions": len(questions),
+        "options": len(options),
+    }
+
+
 class EditableOptionSerializer(serializers.ModelSerializer):
     """
     This serializer is supposed to be nested into EditableQuestionSerializer
@@ -121,10 +210,9 @@ class EditableQuestionSerializer(serializers.ModelSerializer):
         # to represent relationships where one object type is nested inside another.
         # `self.root`: Returns the top-level serializer for this field.
         # https://github.com/encode/django-rest-framework/blob/9d149f23177055b3b1ea12cf62de0d669739b544/rest_framework/fields.py#L643
-        quiz = self.root.instance
-        orm_questions_by_id = { question.id: question for question in quiz.questions.all() }
-        orm_question = orm_questions_by_id.get(question_id)
-        return orm_question
+        # Questions are indexed once on the root serializer (see `orm_questions_by_id`)
+        # to validate each question in constant time.
+        return self.root.orm_questions_by_id.get(question_id)
 
     def validate_single_correct_answer(self, new_options):
         """
@@ -132,12 +220,7 @@ class EditableQuestionSerializer(serializers.ModelSerializer):
         quiz is being finalized. In a draft, no correct answer is allowed.
         """
         is_finalized = self.root.initial_data.get("is_finalized", False)
-        num_correct_options = sum(option.get("is_correct") is True for option in new_options)
-        error = None
-        if is_finalized and num_correct_options == 0:
-            error = "No correct answer selected."
-        if num_correct_options > 1:
-            error = "Multiple answers not allowed."
+        error = get_single_correct_answer_error(new_options, is_finalized)
         if error:
             raise serializers.ValidationError(error)
         
@@ -172,6 +255,16 @@ class EditableQuizSerializer(serializers.ModelSerializer):
             # options are required by default because it is a nested field
         }
 
+    @cached_property
+    def orm_questions_by_id(self):
+        """
+        Questions of the quiz being updated by id. The index is built once per 
+        serializer and shared by nested question serializers (see 
+        `EditableQuestionSerializer.get_nested_orm_question()`), so validation 
+        takes linear time in the number of questions.
+        """
+        return { question.id: question for question in self.instance.questions.all() }
+
     def validate_questions(self, data):
         """
         Validate that all questions have been submitted.
@@ -182,33 +275,17 @@ class EditableQuizSerializer(serializers.ModelSerializer):
             therefore we must validate just the number of submitted questions 
             to make sure that all questions have been submitted.
         """
-        quiz = self.instance
         new_questions_by_id = { question["id"]: question for question in data}
-        orm_questions_by_id = { question.id: question for question in quiz.questions.all() }
 
-        if len(new_questions_by_id) != len(orm_questions_by_id):
+        if len(new_questions_by_id) != len(self.orm_questions_by_id):
             raise serializers.ValidationError("This quiz has other question ids.")
 
         return data
 
 
-    def update_quiz(self, orm_quiz, quiz_data):
-        orm_quiz.name = quiz_data.get('name', orm_quiz.name)
-        orm_quiz.description = quiz_data.get('description', orm_quiz.description)
-        orm_quiz.introduction = quiz_data.get('introduction', orm_quiz.introduction)
-        orm_quiz.is_finalized = quiz_data.get('is_finalized', orm_quiz.is_finalized)
-        return orm_quiz
-
-    def update_question(self, orm_question, question_data):
-        orm_question.text = question_data.get('text', orm_question.text)
-        orm_question.explanation = question_data.get('explanation', orm_question.explanation)
-        return orm_question
-
-    def update_option(self, orm_option, option_data):
-        orm_option.text = option_data.get('text', orm_option.text)
-        orm_option.is_correct = option_data.get('is_correct', orm_option.is_correct)
-        return orm_option
-                        
+    QUIZ_FIELDS = ['name', 'description', 'introduction', 'is_finalized']
+    QUESTION_FIELDS = ['text', 'explanation']
+    OPTION_FIELDS = ['text', 'is_correct']
 
     def update(self, instance, validated_data):
         """
@@ -216,32 +293,43 @@ class EditableQuizSerializer(serializers.ModelSerializer):
         At this point, question and options ids as well as the presence of 
         required fields has been validated.
 
+        Only changed objects are written (one bulk update per model), and
+        `self.written` tells how many rows of each model were updated.
+
         Note:
             The default ModelSerializer .create() and .update() methods 
             do not include support for writable nested representations - 
             because the behavior of nested creates and updates can be ambiguous.
         """
-        # keep all objects in a list to save together in a transaction:
-        updated_objects = [self.update_quiz(instance, validated_data)]
+        changed_quiz_fields = set_changed_fields(instance, validated_data, self.QUIZ_FIELDS)
+        changed_questions, changed_question_fields = [], set()
+        changed_options, changed_option_fields = [], set()
 
         question_data_by_id = { q["id"]: q for q in validated_data['questions'] }
 
         for orm_question in instance.questions.all():
 
             question_data = question_data_by_id[orm_question.id]
-            updated_objects += [self.update_question(orm_question, question_data)]
+            changed_fields = set_changed_fields(orm_question, question_data, self.QUESTION_FIELDS)
+            if changed_fields:
+                changed_questions.append(orm_question)
+                changed_question_fields.update(changed_fields)
                 
             option_data_by_id = { option["id"]: option for option in question_data["options"] }
             
             for orm_option in orm_question.options.all():
                 option_data = option_data_by_id[orm_option.id]
-                updated_objects += [self.update_option(orm_option, option_data)]
+                changed_fields = set_changed_fields(orm_option, option_data, self.OPTION_FIELDS)
+                if changed_fields:
+                    changed_options.append(orm_option)
+                    changed_option_fields.update(changed_fields)
 
         # save changes:
-        with transaction.atomic():
-            for object in updated_objects:
-                object.save()
-
+        self.written = save_changed_objects(
+            instance, changed_quiz_fields,
+            changed_questions, changed_question_fields,
+            changed_options, changed_option_fields,
+        )
         return instance
 
     def raise_question_field_validation_error(self, field, error, question_index):
@@ -258,4 +346,234 @@ class EditableQuizSerializer(serializers.ModelSerializer):
         """
         question_errors = [{} for _ in range(question_index)]
         question_errors += [{field: [error]}]
-        raise serializers.ValidationError({"questions": question_errors})
\ No newline at end of file
+        raise serializers.ValidationError({"questions": question_errors})
+
+
+# *** QUIZ PATCH SERIALIZERS ***
+class QuizOperationSerializer(serializers.Serializer):
+    """
+    A single targeted change of a quiz, for example:
+    {"op": "set_option_text", "option_id": 7, "value": "Paris"}
+    {"op": "set_correct_option", "option_id": 7}
+    {"op": "set_quiz_field", "field": "is_finalized", "value": true}
+
+    Values are validated by the same fields as in EditableQuizSerializer.
+    """
+    # op: (id field of the target object, field of the target object)
+    OPERATIONS = {
+        "set_quiz_field": (None, None),
+        "set_question_text": ("question_id", "text"),
+        "set_question_explanation": ("question_id", "explanation"),
+        "set_option_text": ("option_id", "text"),
+        "set_correct_option": ("option_id", "is_correct"),
+    }
+
+    op = serializers.ChoiceField(choices=list(OPERATIONS))
+    field = serializers.ChoiceField(choices=EditableQuizSerializer.QUIZ_FIELDS, required=False)
+    question_id = serializers.IntegerField(required=False)
+    option_id = serializers.IntegerField(required=False)
+    value = serializers.JSONField(required=False)
+
+    def validate(self, data):
+        id_field, target_field = self.OPERATIONS[data["op"]]
+        if data["op"] == "set_quiz_field":
+            required_fields = ["field", "value"]
+            value_field = EditableQuizSerializer().fields.get(data.get("field"))
+        elif data["op"] == "set_correct_option":
+            required_fields = [id_field]
+            value_field = None
+            data["value"] = True
+        else:
+            required_fields = [id_field, "value"]
+            serializer_class = EditableQuestionSerializer \
+                if id_field == "question_id" else EditableOptionSerializer
+            value_field = serializer_class().fields[target_field]
+
+        missing_fields = [field for field in required_fields if field not in data]
+        if missing_fields:
+            raise serializers.ValidationError({
+                field: ["This field is required."] for field in missing_fields
+            })
+
+        if value_field is not None:
+            try:
+                data["value"] = value_field.run_validation(data["value"])
+            except serializers.ValidationError as e:
+                raise serializers.ValidationError({"value": e.detail})
+        return data
+
+
+class QuizPatchSerializer(serializers.Serializer):
+    """
+    Apply a list of targeted operations to a quiz, loading and writing only 
+    the touched questions and options (e.g. for autosaving a quiz being edited):
+    {"operations": [{"op": "set_question_text", "question_id": 1, "value": "..."}, ...]}
+
+    Finalization requirements (text of all questions and options, one correct 
+    answer per question) are validated on the whole quiz only when 
+    `is_finalized` is set by the patch.
+    """
+    OPERATIONS = QuizOperationSerializer.OPERATIONS
+
+    operations = QuizOperationSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        quiz = self.instance
+        operations = data["operations"]
+
+        is_finalizing = any(
+            op["op"] == "set_quiz_field" and op["field"] == "is_finalized" and op["value"]
+            for op in operations
+        )
+        questions_by_id, options_by_id = self.load_targets(quiz, operations, is_finalizing)
+        options_by_question_id = {}
+        for option in options_by_id.values():
+            options_by_question_id.setdefault(option.question_id, []).append(option)
+
+        changed_quiz_fields = set()
+        changed_question_fields, changed_questions_by_id = set(), {}
+        changed_option_fields, changed_options_by_id = set(), {}
+        errors = [{} for _ in operations]
+
+        for i, op in enumerate(operations):
+            id_field, target_field = self.OPERATIONS[op["op"]]
+
+            if op["op"] == "set_quiz_field":
+                changed_quiz_fields.update(set_changed_fields(quiz, {op["field"]: op["value"]}, [op["field"]]))
+
+            elif id_field == "question_id":
+                question = questions_by_id.get(op["question_id"])
+                if question is None:
+                    errors[i] = {"question_id": ["This question does not belong to this quiz."]}
+                elif set_changed_fields(question, {target_field: op["value"]}, [target_field]):
+                    changed_question_fields.add(target_field)
+                    changed_questions_by_id[question.id] = question
+
+            else:
+                option = options_by_id.get(op["option_id"])
+                if option is None:
+                    errors[i] = {"option_id": ["This option does not belong to this quiz."]}
+                    continue
+                # marking an option as correct unmarks other options of the question:
+                if op["op"] == "set_correct_option":
+                    targets = options_by_question_id[option.question_id]
+                else:
+                    targets = [option]
+                for target in targets:
+                    value = (target is option) if op["op"] == "set_correct_option" else op["value"]
+                    if set_changed_fields(target, {target_field: value}, [target_field]):
+                        changed_option_fields.add(target_field)
+                        changed_options_by_id[target.id] = target
+
+        if any(errors):
+            raise serializers.ValidationError({"operations": errors})
+
+        if is_finalizing:
+            self.validate_finalized_questions(questions_by_id, options_by_question_id)
+
+        return {
+            "quiz_fields": changed_quiz_fields,
+            "questions": list(changed_questions_by_id.values()),
+            "question_fields": changed_question_fields,
+            "options": list(changed_options_by_id.values()),
+            "option_fields": changed_option_fields,
+        }
+
+    def load_targets(self, quiz, operations, is_finalizing):
+        """
+        Load questions and options touched by <operations> (with all options 
+        of questions whose correct option is set) or the whole quiz when it is 
+        being finalized. Return them as two dicts by id.
+        """
+        if is_finalizing:
+            questions = list(quiz.questions.prefetch_related('options'))
+            options = [option for question in questions for option in question.options.all()]
+        else:
+            question_ids = {op["question_id"] for op in operations if "question_id" in op}
+            option_ids = {op["option_id"] for op in operations if "option_id" in op}
+            correct_option_ids = {
+                op["option_id"] for op in operations if op["op"] == "set_correct_option"
+            }
+            questions = []
+            if question_ids:
+                questions = Question.objects\
+                    .filter(quiz_id=quiz.id)\
+                    .filter(id__in=question_ids)
+            options = []
+            if option_ids:
+                options = Option.objects\
+                    .filter(question__quiz_id=quiz.id)\
+                    .filter(
+                        Q(id__in=option_ids) | 
+                        Q(question_id__in=Option.objects
+                            .filter(id__in=correct_option_ids)
+                            .values('question_id'))
+                    )\
+                    .order_by('id')
+        return (
+            { question.id: question for question in questions },
+            { option.id: option for option in options },
+        )
+
+    def validate_finalized_questions(self, questions_by_id, options_by_question_id):
+        """
+        Validate finalization requirements of all questions (with applied changes)
+        and raise errors in the same format as EditableQuizSerializer.
+        """
+        question_errors = []
+        for question_id in sorted(questions_by_id):
+            errors = {}
+            options = options_by_question_id.get(question_id, [])
+            if not questions_by_id[question_id].text:
+                errors["text"] = ["This field is required."]
+            option_errors = [
+                {} if option.text else {"text": ["This field is required."]}
+                for option in options
+            ]
+            if any(option_errors):
+                errors["options"] = option_errors
+            error = get_single_correct_answer_error(
+                [{"is_correct": option.is_correct} for option in options], is_finalized=True)
+            if error:
+                errors["non_field_errors"] = [error]
+            question_errors.append(errors)
+
+        if any(question_errors):
+            raise serializers.ValidationError({"questions": question_errors})
+
+    def update(self, instance, validated_data):
+        self.written = save_changed_objects(
+            instance, validated_data["quiz_fields"],
+            validated_data["questions"], validated_data["question_fields"],
+            validated_data["options"], validated_data["option_fields"],
+        )
+        return instance
+
+
+# *** SEARCH ***
+class QuestionSearchResultSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
+    """
+    Question found by the full-text search (see `quizzz.quizzes.search`).
+    """
+    rank = serializers.FloatField()
+    options = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuestionSearchDocument
+        fields = [
+            'question_id',
+            'quiz_id',
+            'quiz_name',
+            'text',
+            'explanation',
+            'options',
+            'rank',
+        ]
+        # model fields read by other fields (see `quizzz.common.serializers`):
+        sparse_field_sources = {
+            'options': ['options'],
+            'rank': [],   # annotated
+        }
+
+    def get_options(self, obj):
+        return obj.options.split("\n") if obj.options else []
@@ -0,0 +1,87 @@
+"""
+Near-duplicate detection of question texts with MinHash and locality-sensitive hashing.
+
+A text is normalized (lowercase words) and split into character shingles.
+Its MinHash signature has NUM_BANDS * ROWS_PER_BAND values, each the minimum
+of a random hash function over the shingles: two texts have an equal value
+with the probability equal to the Jaccard similarity of their shingles.
+Every band of ROWS_PER_BAND values is hashed into a bucket, so texts sharing
+any bucket are candidates (with 20 bands of 3 rows, texts with similarity 0.5
+share a bucket with the probability of 93%, texts with similarity 0.2 of 15%).
+Candidates are then compared by the exact similarity of their shingles.
+
+Buckets of questions of finalized quizzes are stored by `QuestionSimilarityBucket`,
+so looking for duplicates is an index lookup, not a scan of all questions.
+"""
+import hashlib
+import re
+import struct
+import zlib
+
+
+SHINGLE_SIZE = 4
+NUM_BANDS = 20
+ROWS_PER_BAND = 3
+
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+
+def _get_coefficient(name, i):
+    digest = hashlib.blake2b(f"{name}{i}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % (MERSENNE_PRIME - 1) + 1
+
+
+# fixed coefficients of hash functions (a * x + b) % prime (buckets are stored, do not change them):
+HASH_COEFFICIENTS = [
+    (_get_coefficient("a", i), _get_coefficient("b", i))
+    for i in range(NUM_BANDS * ROWS_PER_BAND)
+]
+
+
+def get_shingles(text):
+    """
+    Return the set of character shingles of the normalized <text>
+    (texts shorter than a shingle are a shingle themselves).
+    """
+    normalized = " ".join(re.findall(r"\w+", text.lower()))
+    if len(normalized) <= SHINGLE_SIZE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+
+
+def get_signature(shingles):
+    """
+    Return the MinHash signature of non-empty <shingles>.
+    """
+    hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+    return [
+        min((a * x + b) % MERSENNE_PRIME for x in hashes) & MAX_HASH
+        for a, b in HASH_COEFFICIENTS
+    ]
+
+
+def get_buckets(text):
+    """
+    Return LSH buckets of <text> (signed 64-bit integers, unique across bands),
+    or an empty list if the text has no words.
+    """
+    shingles = get_shingles(text)
+    if not shingles:
+        return []
+    signature = get_signature(shingles)
+    buckets = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f"<H{ROWS_PER_BAND}I", band, *rows), digest_size=8).digest()
+        buckets.append(int.from_bytes(digest, "little", signed=True))
+    return buckets
+
+
+def get_similarity(shingles, other_shingles):
+    """
+    Jaccard similarity of two sets of shingles.
+    """
+    if not shingles or not other_shingles:
+        return 0.0
+    return len(shingles & other_shingles) / len(shingles | other_shingles)
@@ -0,0 +1,87 @@
+"""
+Benchmarks (not collected by the test runner, run explicitly):
+
+    python manage.py test quizzz.quizzes.tests.benchmarks
+
+Validation of a full quiz update (PUT) for quizzes of 10, 100 and 500 questions,
+first with the question index rebuilt for every submitted question
+(the behaviour before the index was shared on the root serializer),
+then with the shared index.
+"""
+import time
+from unittest import mock
+from django.test import TestCase
+
+from quizzz.common.test_mixins import SetupCommunityDataMixin
+
+from ..models import Quiz
+from ..serializers import EditableQuizSerializer, EditableQuestionSerializer
+
+
+NUM_QUESTIONS = [10, 100, 500]
+NUM_OPTIONS = 4
+NUM_REPEATS = 5
+
+
+def get_nested_orm_question_without_index(self, question_id):
+    quiz = self.root.instance
+    orm_questions_by_id = { question.id: question for question in quiz.questions.all() }
+    return orm_questions_by_id.get(question_id)
+
+
+class QuizValidationBenchmark(SetupCommunityDataMixin, TestCase):
+
+    def create_quiz(self, num_questions):
+        quiz = Quiz.create_with_questions(
+            user_id=self.USERS["bob"]["id"],
+            community_id=self.GROUP_ID,
+            num_questions=num_questions,
+            num_options=NUM_OPTIONS,
+        )
+        data = EditableQuizSerializer(self.load_quiz(quiz.id)).data
+        data.update({"description": "Exam", "introduction": "Good luck!", "is_finalized": True})
+        for i, question in enumerate(data["questions"]):
+            question["text"] = f"Question {i}"
+            for j, option in enumerate(question["options"]):
+                option["text"] = f"Option {j}"
+            question["options"][0]["is_correct"] = True
+        return quiz.id, data
+
+    def load_quiz(self, quiz_id):
+        return Quiz.objects\
+            .prefetch_related('questions')\
+            .prefetch_related('questions__options')\
+            .get(pk=quiz_id)
+
+    def time_validation(self, quiz_id, data):
+        """
+        Return the best time of validating <data> in ms.
+        """
+        timings = []
+        for _ in range(NUM_REPEATS):
+            serializer = EditableQuizSerializer(self.load_quiz(quiz_id), data=data)
+            start = time.perf_counter()
+            is_valid = serializer.is_valid()
+            timings.append((time.perf_counter() - start) * 1000)
+            self.assertTrue(is_valid, serializer.errors)
+        return min(timings)
+
+    def test_validate_quiz(self):
+        ms_per_question = {}
+        for num_questions in NUM_QUESTIONS:
+            quiz_id, data = self.create_quiz(num_questions)
+
+            with mock.patch.object(EditableQuestionSerializer, 'get_nested_orm_question',
+                get_nested_orm_question_without_index):
+                ms_without_index = self.time_validation(quiz_id, data)
+            ms = self.time_validation(quiz_id, data)
+
+            ms_per_question[num_questions] = ms / num_questions
+            print(
+                f'\nValidate {num_questions} questions: '
+                f'{ms_without_index:.1f} ms without shared index, {ms:.1f} ms with shared index '
+                f'({ms_per_question[num_questions]:.3f} ms per question)'
+            )
+
+        # linear: time per question does not grow with the number of questions
+        self.assertLess(ms_per_question[NUM_QUESTIONS[-1]], 2 * ms_per_question[NUM_QUESTIONS[0]])
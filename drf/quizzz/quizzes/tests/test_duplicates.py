@@ -0,0 +1,120 @@
+import datetime
+import io
+import json
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupQuizDataMixin
+from quizzz.tournaments.models import Round, Tournament
+from quizzz.users.models import CustomUser
+
+from ..importing import QuizImporter
+from ..models import Quiz, QuestionSimilarityBucket
+from ..similarity import NUM_BANDS, get_buckets, get_shingles, get_similarity
+
+
+class SimilarityTest(APITestCase):
+
+    def test_buckets(self):
+        self.assertEqual(len(get_buckets("What does the fox say?")), NUM_BANDS)
+        self.assertListEqual(get_buckets("What does the fox say?"), get_buckets("what  does the FOX say"))
+        self.assertListEqual(get_buckets("?!"), [])
+
+        similar = set(get_buckets("What does the fox say?")) & set(get_buckets("What does the fox say, exactly?"))
+        self.assertTrue(similar)
+        different = set(get_buckets("What does the fox say?")) & set(get_buckets("Capital of France?"))
+        self.assertFalse(different)
+
+    def test_similarity(self):
+        self.assertEqual(get_similarity(get_shingles("2+2?"), get_shingles("2 + 2")), 1.0)
+        self.assertAlmostEqual(
+            get_similarity(get_shingles("What does the fox say?"), get_shingles("What does the fox say, exactly?")),
+            18 / 26)
+        self.assertEqual(get_similarity(get_shingles(""), get_shingles("")), 0.0)
+
+
+class QuizDuplicatesTest(SetupQuizDataMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('quizzes:quiz-duplicates', kwargs={"community_id": self.GROUP_ID, "quiz_id": 1})
+
+        # a quiz of alice, indexed when finalized:
+        lines = [
+            {"text": "What does the fox say, exactly?", "options": [
+                {"text": "Ring-ding-ding", "is_correct": True}, {"text": "Woof"}]},
+            {"text": "Capital of France?", "options": [
+                {"text": "Paris", "is_correct": True}, {"text": "Lyon"}]},
+        ]
+        alice = CustomUser.objects.get(pk=self.USERS["alice"]["id"])
+        QuizImporter(alice, self.GROUP_ID, name="Animals").run(
+            io.BytesIO("\n".join(json.dumps(line) for line in lines).encode("utf-8")), "ndjson")
+        self.alice_quiz = Quiz.objects.get(name="Animals 1")
+        self.fox_question_id, _ = self.alice_quiz.questions.order_by('id').values_list('id', flat=True)
+
+        self.login_as("alice")
+        response = self.client.patch(
+            reverse('quizzes:quiz-detail', kwargs={"community_id": self.GROUP_ID, "quiz_id": self.alice_quiz.id}),
+            {"operations": [{"op": "set_quiz_field", "field": "is_finalized", "value": True}]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.client.logout()
+
+    def test_permissions(self):
+        get_response = lambda: self.client.get(self.url)
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+        self.login_as("alice")
+        self.assert_not_authorized(get_response())
+
+    def test_finalized_questions_are_indexed(self):
+        buckets = QuestionSimilarityBucket.objects.filter(question__quiz_id=self.alice_quiz.id)
+        self.assertEqual(buckets.count(), 2 * NUM_BANDS)
+        self.assertFalse(QuestionSimilarityBucket.objects.filter(question__quiz_id=1).exists())
+
+    def test_duplicates(self):
+        self.login_as("bob")
+        # (1-3) auth & membership (4) quiz (5) questions (6) candidates sharing buckets
+        with self.assertNumQueries(6):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertDictEqual(response.data, {"questions": [
+            {"id": 1, "text": "What does 2+2 equal to?", "duplicates": []},
+            {"id": 2, "text": "What does the fox say?", "duplicates": [{
+                "question_id": self.fox_question_id,
+                "quiz_id": self.alice_quiz.id,
+                "quiz_name": "Animals 1",
+                "text": "What does the fox say, exactly?",
+                "similarity": 0.69,
+            }]},
+        ]})
+
+        # drafts are not indexed, alice finds no duplicates of her questions:
+        self.login_as("alice")
+        response = self.client.get(reverse('quizzes:quiz-duplicates',
+            kwargs={"community_id": self.GROUP_ID, "quiz_id": self.alice_quiz.id}))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual([question["duplicates"] for question in response.data["questions"]], [[], []])
+
+    def test_questions_of_rounds_not_finished_are_hidden(self):
+        """
+        Members only find questions they can read (same as in the search).
+        """
+        tournament = Tournament.objects.create(community_id=self.GROUP_ID, name="Tournament")
+        now = timezone.now()
+        round = Round.objects.create(
+            tournament=tournament, quiz=self.alice_quiz,
+            start_time=now + datetime.timedelta(days=1), finish_time=now + datetime.timedelta(days=2))
+
+        self.login_as("bob")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual([question["duplicates"] for question in response.data["questions"]], [[], []])
+
+        Round.objects.filter(pk=round.pk).update(
+            start_time=now - datetime.timedelta(days=2), finish_time=now - datetime.timedelta(days=1))
+        response = self.client.get(self.url)
+        self.assertListEqual(
+            [[d["question_id"] for d in question["duplicates"]] for question in response.data["questions"]],
+            [[], [self.fox_question_id]])
@@ -0,0 +1,204 @@
+import base64
+import io
+import json
+import os
+import tempfile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupCommunityDataMixin
+
+from ..importing import iter_json_array
+from ..models import Quiz, Question, Option
+
+
+def opentdb_question(i, **kwargs):
+    return {
+        "category": "General Knowledge",
+        "type": "multiple",
+        "difficulty": "easy",
+        "question": f"Question &quot;{i}&quot;?",
+        "correct_answer": f"Right {i}",
+        "incorrect_answers": [f"Wrong {i}.1", f"Wrong {i}.2", f"Wrong {i}.3"],
+        **kwargs,
+    }
+
+
+class JSONArrayParserTest(APITestCase):
+
+    def test_items_are_parsed_across_chunks(self):
+        items = [{"text": "a ] b, [c", "n": [1, 2]}, {"text": "ü \" }"}, {}]
+        for document in [{"response_code": 0, "results": items}, {"results": items, "x": 1}, items]:
+            stream = io.BytesIO(json.dumps(document, indent=2).encode("utf-8"))
+            self.assertListEqual(list(iter_json_array(stream, chunk_size=5)), items)
+
+
+class QuizImportTest(SetupCommunityDataMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('quizzes:quiz-import', kwargs={"community_id": self.GROUP_ID})
+        self.select_ids = 0 if connection.features.can_return_rows_from_bulk_insert else 1
+
+    def upload(self, filename, content, charset="utf-8", **data):
+        file = SimpleUploadedFile(filename, content.encode(charset))
+        return self.client.post(self.url, {"file": file, **data}, format="multipart")
+
+    def test_permissions(self):
+        get_response = lambda: self.upload("questions.json", "[]")
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+    def test_import_opentdb(self):
+        questions = [opentdb_question(i) for i in range(5)]
+        questions[1] = opentdb_question(1, type="boolean", correct_answer="False", incorrect_answers=["True"])
+        questions[3] = opentdb_question(3, correct_answer="")
+        content = json.dumps({"response_code": 0, "results": questions})
+
+        self.login_as("alice")
+        response = self.upload("questions.json", content, name="Trivia")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertDictEqual(response.data, {
+            "quizzes": 2,
+            "questions": 4,
+            "skipped": 1,
+            "errors": ["Question 4: Question and option texts are required."],
+        })
+
+        quizzes = list(Quiz.objects.filter(name__startswith="Trivia").order_by('id'))
+        self.assertListEqual([quiz.name for quiz in quizzes], ["Trivia 1", "Trivia 2"])
+        self.assertTrue(all(quiz.user_id == self.USERS["alice"]["id"] for quiz in quizzes))
+        self.assertTrue(all(not quiz.is_finalized for quiz in quizzes))
+        self.assertListEqual([quiz.num_options for quiz in quizzes], [4, 4])
+
+        question, boolean_question = quizzes[0].questions.order_by('id')
+        self.assertEqual(question.text, 'Question "0"?')
+        self.assertSetEqual(
+            set(question.options.values_list('text', 'is_correct')),
+            {("Right 0", True), ("Wrong 0.1", False), ("Wrong 0.2", False), ("Wrong 0.3", False)},
+        )
+        self.assertListEqual(
+            list(boolean_question.options.order_by('id').values_list('text', 'is_correct')),
+            [("True", False), ("False", True)],
+        )
+        self.assertEqual(quizzes[1].questions.count(), 2)
+
+    def test_import_csv_and_ndjson(self):
+        self.login_as("alice")
+        content = (
+            "question,correct_answer,incorrect_answer_1,incorrect_answer_2,explanation\n"
+            'Capital of France?,Paris,Lyon,"Nice, maybe",It is Paris.\n'
+            "2+2?,4,5,,\n"
+        )
+        response = self.upload("questions.csv", content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["questions"], 2)
+        question = Question.objects.get(text="Capital of France?")
+        self.assertEqual(question.explanation, "It is Paris.")
+        self.assertEqual(question.options.count(), 3)
+        self.assertEqual(Question.objects.get(text="2+2?").options.count(), 2)
+
+        encode = lambda text: base64.b64encode(text.encode("utf-8")).decode("ascii")
+        lines = [
+            json.dumps({"text": encode("Native?"), "options": [
+                {"text": encode("Yes"), "is_correct": True}, {"text": encode("No")}]}),
+            "",
+            "{not json",
+            json.dumps({"question": encode("OpenTDB?"), "correct_answer": encode("Yes"),
+                "incorrect_answers": [encode("No")]}),
+            json.dumps({"text": encode("Two correct?"), "options": [
+                {"text": encode("Yes"), "is_correct": True}, {"text": encode("No"), "is_correct": True}]}),
+        ]
+        response = self.upload("questions.ndjson", "\n".join(lines), encoding="base64")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["questions"], 2)
+        self.assertEqual(response.data["skipped"], 2)
+        self.assertTrue(response.data["errors"][0].startswith("Question 2: Invalid JSON"))
+        self.assertEqual(response.data["errors"][1], "Question 4: Exactly one correct option is required.")
+        self.assertListEqual(
+            list(Question.objects.get(text="Native?").options.order_by('id').values_list('text', 'is_correct')),
+            [("Yes", True), ("No", False)],
+        )
+
+    def test_invalid_files(self):
+        self.login_as("alice")
+        response = self.upload("questions.txt", "")
+        self.assert_validation_failed(response, data={"format": ["Cannot guess the format from the file name."]})
+
+        # nothing is imported from a broken file:
+        content = json.dumps([opentdb_question(i) for i in range(3)])[:-10]
+        response = self.upload("questions.json", content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Quiz.objects.count(), 0)
+
+        response = self.upload("questions.csv", "text,answer\n")
+        self.assert_validation_failed(response, data={
+            "file": ['CSV columns "question" and "correct_answer" are required.']
+        })
+
+        with override_settings(QUIZZZ_IMPORT_MAX_QUESTIONS=2):
+            response = self.upload("questions.json", json.dumps([opentdb_question(i) for i in range(3)]))
+        self.assert_validation_failed(response, data={
+            "file": ["Files with more than 2 questions cannot be imported."]
+        })
+        self.assertEqual(Quiz.objects.count(), 0)
+
+    def test_files_must_be_utf8(self):
+        self.login_as("alice")
+        files = {
+            "questions.csv": "question,correct_answer,incorrect_answer\nCafé?,Crème,Thé\n",
+            "questions.ndjson": json.dumps(
+                {"question": "Café?", "correct_answer": "Crème", "incorrect_answers": ["Thé"]},
+                ensure_ascii=False,
+            ),
+        }
+        for filename, content in files.items():
+            response = self.upload(filename, content, charset="latin-1")
+            self.assert_validation_failed(response, data={"file": ["File is not UTF-8 encoded."]})
+        self.assertEqual(Quiz.objects.count(), 0)
+
+    @override_settings(QUIZZZ_IMPORT_BATCH_SIZE=100)
+    def test_questions_are_inserted_in_batches(self):
+        """
+        The number of queries depends on the number of batches, not questions.
+        """
+        self.login_as("alice")
+        # (1-3) auth & membership (4) savepoint (5) insert quizzes (6) insert questions
+        # (7) insert options (8) insert search documents (9) release savepoint
+        # (+ select ids of quizzes and questions on SQLite; membership is cached after the first upload)
+        for i, num_questions in enumerate([2, 60]):
+            content = json.dumps([opentdb_question(i) for i in range(num_questions)])
+            with self.assertNumQueries(9 + 2 * self.select_ids - (i > 0)):
+                response = self.upload("questions.json", content)
+                self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        self.assertEqual(Quiz.objects.count(), 31)
+        self.assertEqual(Option.objects.count(), 62 * 4)
+        for quiz in Quiz.objects.prefetch_related('questions__options'):
+            for question in quiz.questions.all():
+                number = question.text.split('"')[1]
+                correct_option, = [option for option in question.options.all() if option.is_correct]
+                self.assertEqual(correct_option.text, f"Right {number}")
+
+    def test_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "questions.json")
+            with open(path, "w") as f:
+                json.dump({"results": [opentdb_question(i) for i in range(7)]}, f)
+
+            with self.assertRaises(CommandError):
+                call_command('importquizzes', str(self.GROUP_ID), path, '--user', 'bob_the_stranger',
+                    stdout=io.StringIO())
+
+            out = io.StringIO()
+            call_command('importquizzes', str(self.GROUP_ID), path, '--user', 'alice',
+                '--questions-per-quiz', '3', '--batch-size', '2', stdout=out)
+        self.assertIn('Imported 7 question(s) into 3 quiz(zes)', out.getvalue())
+        self.assertListEqual(
+            list(Quiz.objects.order_by('id').values_list('num_questions', flat=True)), [3, 3, 1])
+        self.assertEqual(Quiz.objects.first().description, "Imported from questions.json")
@@ -0,0 +1,163 @@
+import datetime
+import io
+import json
+from unittest import mock
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+from quizzz.tournaments.models import Round
+from quizzz.users.models import CustomUser
+
+from ..importing import QuizImporter
+from ..models import Quiz, QuestionSearchDocument
+from ..views import SearchPagination
+
+
+class QuestionSearchTest(SetupRoundsMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse('quizzes:question-search', kwargs={"community_id": self.GROUP_ID})
+        QuestionSearchDocument.refresh()
+
+        # a draft quiz of alice (imported quizzes are indexed on import):
+        lines = [
+            {"text": "Which animal is red?", "options": [
+                {"text": "Fox", "is_correct": True}, {"text": "Crow"}]},
+            {"text": "Which animal barks?", "options": [
+                {"text": "Dog", "is_correct": True}, {"text": "Cat"}]},
+        ]
+        alice = CustomUser.objects.get(pk=self.USERS["alice"]["id"])
+        QuizImporter(alice, self.GROUP_ID, name="Animals").run(
+            io.BytesIO("\n".join(json.dumps(line) for line in lines).encode("utf-8")), "ndjson")
+        self.alice_quiz = Quiz.objects.get(name="Animals 1")
+        self.red_question_id, self.dog_question_id = \
+            self.alice_quiz.questions.order_by('id').values_list('id', flat=True)
+
+    def search(self, query, **params):
+        return self.client.get(self.url, {"q": query, **params})
+
+    def get_question_ids(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [result["question_id"] for result in response.data["results"]]
+
+    def test_permissions(self):
+        get_response = lambda: self.search("fox")
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+    def test_query_is_required(self):
+        self.login_as("bob")
+        self.assert_validation_failed(self.client.get(self.url), data={"q": ["This field is required."]})
+        self.assert_validation_failed(self.search("  "), data={"q": ["This field is required."]})
+
+    def test_search(self):
+        self.login_as("alice")
+        # (1-3) auth & membership (4) count (5) results
+        with self.assertNumQueries(5):
+            response = self.search("fox")
+        self.assertListEqual(self.get_question_ids(response), [self.red_question_id])
+        result, = response.data["results"]
+        self.assertDictEqual({key: value for key, value in result.items() if key != "rank"}, {
+            "question_id": self.red_question_id,
+            "quiz_id": self.alice_quiz.id,
+            "quiz_name": "Animals 1",
+            "text": "Which animal is red?",
+            "explanation": "",
+            "options": ["Fox", "Crow"],
+        })
+
+        # all words must match, the last one as a prefix:
+        self.assertListEqual(self.get_question_ids(self.search("animal ba")), [self.dog_question_id])
+        self.assertCountEqual(self.get_question_ids(self.search("animals 1")), [self.red_question_id, self.dog_question_id])
+        self.assertListEqual(self.get_question_ids(self.search("giraffe")), [])
+
+        # sparse fieldsets (see `quizzz.common.serializers`):
+        response = self.search("fox", fields="question_id,options")
+        self.assertListEqual(response.data["results"], [{"question_id": self.red_question_id, "options": ["Fox", "Crow"]}])
+
+    def test_visibility_and_ranking(self):
+        # bob sees his own quiz only, quiz of alice is a draft:
+        self.login_as("bob")
+        self.assertListEqual(self.get_question_ids(self.search("fox")), [2])
+
+        # group admins also see the quiz pool, matches in question texts rank first:
+        Quiz.objects.filter(pk=self.alice_quiz.id).update(is_finalized=True)
+        response = self.search("fox")
+        self.assertListEqual(self.get_question_ids(response), [2, self.red_question_id])
+        self.assertGreater(response.data["results"][0]["rank"], response.data["results"][1]["rank"])
+
+        # quizzes of finished rounds are visible to everybody:
+        self.login_as("alice")
+        self.assertListEqual(self.get_question_ids(self.search("fox")), [self.red_question_id])
+        Round.objects.filter(pk=self.ROUNDS["round1"]["id"])\
+            .update(finish_time=timezone.now() - datetime.timedelta(minutes=1))
+        self.assertListEqual(self.get_question_ids(self.search("fox")), [2, self.red_question_id])
+
+        # other communities are not searched:
+        self.login_as("bob")
+        response = self.client.get(
+            reverse('quizzes:question-search', kwargs={"community_id": self.COMMUNITIES["group3"]["id"]}),
+            {"q": "fox"})
+        self.assertListEqual(self.get_question_ids(response), [])
+
+    def test_pagination(self):
+        self.login_as("alice")
+        with mock.patch.object(SearchPagination, 'page_size', 1):
+            response = self.search("animal")
+            self.assertEqual(response.data["count"], 2)
+            self.assertIsNotNone(response.data["next"])
+            question_ids = self.get_question_ids(response)
+            response = self.search("animal", page=2)
+            self.assertIsNone(response.data["next"])
+            question_ids += self.get_question_ids(response)
+        self.assertCountEqual(question_ids, [self.red_question_id, self.dog_question_id])
+
+    def test_index_follows_quiz_changes(self):
+        self.login_as("bob")
+        url = reverse('quizzes:quiz-detail', kwargs={"community_id": self.GROUP_ID, "quiz_id": 1})
+        response = self.client.patch(url, {"operations": [
+            {"op": "set_question_text", "question_id": 2, "value": "What does the cow say?"},
+            {"op": "set_option_text", "option_id": 1, "value": "Eleven"},
+        ]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertListEqual(self.get_question_ids(self.search("fox")), [])
+        self.assertListEqual(self.get_question_ids(self.search("cow")), [2])
+        self.assertListEqual(self.get_question_ids(self.search("eleven")), [1])
+
+        response = self.client.patch(url, {"operations": [
+            {"op": "set_quiz_field", "field": "name", "value": "Farm"},
+        ]})
+        self.assertCountEqual(self.get_question_ids(self.search("farm")), [1, 2])
+
+        # clones are indexed:
+        response = self.client.post(
+            reverse('quizzes:quiz-clone', kwargs={"community_id": self.GROUP_ID, "quiz_id": 1}))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(self.get_question_ids(self.search("cow"))), 2)
+
+        # documents are deleted with quizzes:
+        self.login_as("alice")
+        url = reverse('quizzes:quiz-detail', kwargs={"community_id": self.GROUP_ID, "quiz_id": self.alice_quiz.id})
+        self.assertEqual(self.client.delete(url).status_code, status.HTTP_204_NO_CONTENT)
+        self.assertListEqual(self.get_question_ids(self.search("animal")), [])
+
+    def test_command(self):
+        out = io.StringIO()
+        call_command('rebuildsearchindex', '--check', stdout=out)
+        self.assertIn('up to date', out.getvalue())
+
+        QuestionSearchDocument.objects.filter(question_id=1).update(text="Stale")
+        QuestionSearchDocument.objects.filter(question_id=2).delete()
+        with self.assertRaisesMessage(CommandError, '2 search document(s) are out of date.'):
+            call_command('rebuildsearchindex', str(self.GROUP_ID), '--check', stdout=io.StringIO(), stderr=io.StringIO())
+
+        call_command('rebuildsearchindex', str(self.GROUP_ID), '--batch-size', '1', stdout=io.StringIO())
+        call_command('rebuildsearchindex', '--check', stdout=io.StringIO())
+        self.login_as("bob")
+        self.assertListEqual(self.get_question_ids(self.search("fox")), [2])
+        self.assertListEqual(self.get_question_ids(self.search("stale")), [])
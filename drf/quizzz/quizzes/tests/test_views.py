@@ -1,4 +1,5 @@
 from copy import deepcopy
+from django.db import connection
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -37,8 +38,11 @@ class CreateQuizTest(SetupCommunityDataMixin, APITestCase):
 
         # A regular registered group member can create a new quiz:
         self.login_as("alice")
-        with self.assertNumQueries(16):  
-            # (1-2) request.user (3) membership (4,16) transaction (5) insert quiz (6-15) questions & options
+        # SQLite does not return ids of bulk inserted rows, questions are selected again:
+        select_ids = 0 if connection.features.can_return_rows_from_bulk_insert else 1
+        with self.assertNumQueries(8 + select_ids):
+            # (1-2) request.user (3) membership (4,8) transaction (5) insert quiz
+            # (6) insert questions (7) insert options
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
             self.assertListEqual(list(response.data.keys()), self.expected_keys)
@@ -176,14 +180,15 @@ class QuizDetailTest(SetupQuizDataMixin, APITestCase):
         """
         self._test_permissions("put", self.data)
 
-        # Owner can update the quiz:
+        # Owner can update the quiz (nothing is written when nothing has changed):
         self.login_as("bob")
-        with self.assertNumQueries(19):
+        with self.assertNumQueries(6):
             response = self.client.put(self.url, self.data)
             self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response["X-Rows-Written"], "quizzes=0, questions=0, options=0")
 
         # Fields "is_finalized", "name", "questions" are required:
-        with self.assertNumQueries(6):
+        with self.assertNumQueries(5):
             response = self.client.put(self.url, {})
             self.assert_validation_failed(response, data={
                 "questions": ["This field is required."],
@@ -303,6 +308,42 @@ class QuizDetailTest(SetupQuizDataMixin, APITestCase):
             ],
         })
 
+    def test_put_quiz_writes_changed_rows_only(self):
+        """
+        Only changed questions and options are written, one bulk update per model.
+        Quiz is saved on any change (its update time versions cached payloads).
+        """
+        init_time_updated = Quiz.objects.get(pk=1).time_updated
+        data = deepcopy(self.data)
+        data["questions"][0]["options"][0]["text"] = "new text 1"
+        data["questions"][1]["options"][1]["text"] = "new text 2"
+        data["questions"][1]["options"][2]["is_correct"] = not data["questions"][1]["options"][2]["is_correct"]
+        for option in data["questions"][1]["options"]:
+            if option is not data["questions"][1]["options"][2]:
+                option["is_correct"] = False
+
+        self.login_as("bob")
+        # (1-3) auth & membership (4) quiz (5) questions (6) options 
+        # (7) savepoint (8) options bulk update (9) quiz update
+        # (10-13) search documents: questions, options, delete, insert (14) release savepoint
+        with self.assertNumQueries(14):
+            response = self.client.put(self.url, data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Rows-Written"], "quizzes=1, questions=0, options=4")
+        self.assertEqual(response.data["questions"], data["questions"])
+
+        quiz = Quiz.objects.get(pk=1)
+        self.assertGreater(quiz.time_updated, init_time_updated)
+        self.assertEqual(quiz.questions.get(pk=data["questions"][0]["id"]).options.first().text, "new text 1")
+
+        # quiz fields only (documents of all questions are refreshed with the name):
+        data["name"] = "new name"
+        with self.assertNumQueries(12):
+            response = self.client.put(self.url, data)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Rows-Written"], "quizzes=1, questions=0, options=0")
+        self.assertEqual(Quiz.objects.get(pk=1).name, "new name")
+
     def test_update_finalized_quiz(self):
         """
         Finalized quiz cannot be updated.
@@ -329,9 +370,9 @@ class QuizDetailTest(SetupQuizDataMixin, APITestCase):
 
         # Owner can delete the quiz:
         self.login_as("bob")
-        with self.assertNumQueries(12):
-            # (4) select quiz (5) select quiz questions (6) select options (7) select round
-            # (8-12) del quiz, questions, options, answers[2]
+        with self.assertNumQueries(17):
+            # (4) select quiz (5) select quiz questions (6) select options (7) select round (8-17) del quiz,
+            # questions, options, search documents[2], similarity buckets, answers[2], answer counts[2]
             response = self.client.delete(self.url)
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
@@ -350,4 +391,184 @@ class QuizDetailTest(SetupQuizDataMixin, APITestCase):
         self.login_as("bob")
         with self.assertNumQueries(4):
             response = self.client.delete(self.url)
-            self.assert_validation_failed(response, ["Submitted quiz cannot be deleted."])
\ No newline at end of file
+            self.assert_validation_failed(response, ["Submitted quiz cannot be deleted."])
+
+
+
+class QuizPatchTest(SetupQuizDataMixin, APITestCase):
+
+    def setUp(self):
+        self.url = reverse(
+            'quizzes:quiz-detail', 
+            kwargs={"community_id": self.GROUP_ID, "quiz_id": self.QUIZZES["quiz1"]["id"]}
+        )
+
+    def patch(self, *operations):
+        return self.client.patch(self.url, {"operations": list(operations)})
+
+    def test_permissions(self):
+        get_response = lambda: self.patch({"op": "set_question_text", "question_id": 1, "value": "?"})
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+        self.login_as("alice")
+        self.assert_not_authorized(get_response())
+
+    def test_patch_writes_touched_rows_only(self):
+        self.login_as("bob")
+        # (1-3) auth & membership (4) quiz (5) touched options with options of the question
+        # (6) savepoint (7) options bulk update (8) quiz update
+        # (9-12) search documents: questions, options, delete, insert (13) release savepoint
+        with self.assertNumQueries(13):
+            response = self.patch(
+                {"op": "set_option_text", "option_id": 3, "value": "three"},
+                {"op": "set_correct_option", "option_id": 2},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Rows-Written"], "quizzes=1, questions=0, options=3")
+        self.assertEqual(response.data["id"], self.QUIZZES["quiz1"]["id"])
+
+        options = {option.id: option for option in Option.objects.all()}
+        self.assertEqual(options[3].text, "three")
+        self.assertListEqual([id for id, option in options.items() if option.is_correct], [2, 8])
+
+        with self.assertNumQueries(12):
+            response = self.patch(
+                {"op": "set_question_text", "question_id": 2, "value": "What does the cow say?"},
+                {"op": "set_question_explanation", "question_id": 2, "value": ""},
+                {"op": "set_quiz_field", "field": "name", "value": "Quiz 1"},
+            )
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Rows-Written"], "quizzes=1, questions=1, options=0")
+        question = Question.objects.get(pk=2)
+        self.assertEqual((question.text, question.explanation), ("What does the cow say?", ""))
+        self.assertEqual(Quiz.objects.get(pk=1).name, "Quiz 1")
+
+        # nothing is written when nothing changes:
+        with self.assertNumQueries(4):
+            response = self.patch({"op": "set_correct_option", "option_id": 2})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["X-Rows-Written"], "quizzes=0, questions=0, options=0")
+
+    def test_invalid_operations(self):
+        self.login_as("bob")
+        response = self.patch()
+        self.assert_validation_failed(response, data={
+            "operations": {"non_field_errors": ["This list may not be empty."]},
+        })
+
+        response = self.patch(
+            {"op": "delete_quiz"},
+            {"op": "set_option_text", "value": "text"},
+            {"op": "set_quiz_field", "field": "is_finalized", "value": "maybe"},
+            {"op": "set_question_text", "question_id": 1, "value": "x" * 1001},
+        )
+        self.assert_validation_failed(response, data={"operations": [
+            {"op": ['"delete_quiz" is not a valid choice.']},
+            {"option_id": ["This field is required."]},
+            {"value": ["Must be a valid boolean."]},
+            {"value": ["Ensure this field has no more than 1000 characters."]},
+        ]})
+
+        # other quizzes' questions and options cannot be updated:
+        response = self.patch(
+            {"op": "set_option_text", "option_id": 1, "value": "one"},
+            {"op": "set_correct_option", "option_id": 100},
+            {"op": "set_question_text", "question_id": 100, "value": "?"},
+        )
+        self.assert_validation_failed(response, data={"operations": [
+            {},
+            {"option_id": ["This option does not belong to this quiz."]},
+            {"question_id": ["This question does not belong to this quiz."]},
+        ]})
+        self.assertEqual(Option.objects.get(pk=1).text, "1")
+
+    def test_finalize_quiz(self):
+        """
+        Finalization requirements are validated on the whole quiz when it is finalized.
+        """
+        self.login_as("bob")
+        # a draft may have empty texts:
+        response = self.patch({"op": "set_option_text", "option_id": 6, "value": ""})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        finalize = {"op": "set_quiz_field", "field": "is_finalized", "value": True}
+        # (3) quiz (4) all questions (5) all options (membership is cached)
+        with self.assertNumQueries(5):
+            response = self.patch({"op": "set_question_text", "question_id": 1, "value": ""}, finalize)
+            self.assert_validation_failed(response, data={"questions": [
+                {"text": ["This field is required."]},
+                {"options": [{}, {"text": ["This field is required."]}, {}, {}]},
+            ]})
+        self.assertFalse(Quiz.objects.get(pk=1).is_finalized)
+
+        # (+3) index finalized questions for duplicate detection
+        with self.assertNumQueries(16):
+            response = self.patch({"op": "set_option_text", "option_id": 6, "value": "Woof"}, finalize)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data["is_finalized"])
+        self.assertTrue(Quiz.objects.get(pk=1).is_finalized)
+
+        # finalized quiz cannot be updated:
+        response = self.patch({"op": "set_option_text", "option_id": 6, "value": "Wuff"})
+        self.assert_validation_failed(response, ["Submitted quiz cannot be updated."])
+
+
+
+class QuizCloneTest(SetupQuizDataMixin, APITestCase):
+
+    def setUp(self):
+        self.quiz = Quiz.objects.get(pk=self.QUIZZES["quiz1"]["id"])
+        self.url = reverse(
+            'quizzes:quiz-clone',
+            kwargs={"community_id": self.GROUP_ID, "quiz_id": self.quiz.id}
+        )
+
+    def get_content(self, quiz):
+        return [
+            (question.text, question.explanation, [
+                (option.text, option.is_correct) for option in question.options.order_by('id')
+            ])
+            for question in quiz.questions.order_by('id')
+        ]
+
+    def test_normal(self):
+        """
+        Owner can copy a quiz with all questions and options into a new draft.
+        """
+        get_response = lambda: self.client.post(self.url, {"name": "Copy"})
+
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+        # Non-owner cannot copy the quiz:
+        self.login_as("alice")
+        self.assert_not_authorized(get_response())
+
+        self.quiz.is_finalized = True
+        self.quiz.save()
+
+        self.login_as("bob")
+        select_ids = 0 if connection.features.can_return_rows_from_bulk_insert else 1
+        with self.assertNumQueries(12 + select_ids):
+            # (4) quiz (5-6) questions with options (7,12) transaction (8) insert quiz
+            # (9) insert questions (10) insert options (11) insert search documents
+            response = get_response()
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertListEqual(list(response.data.keys()), QUIZ_EXPECTED_KEYS)
+
+        new_quiz = Quiz.objects.get(pk=response.data["id"])
+        self.assertEqual(new_quiz.name, "Copy")
+        self.assertFalse(new_quiz.is_finalized)
+        self.assertEqual(new_quiz.user_id, self.USERS["bob"]["id"])
+        self.assertEqual(new_quiz.description, self.quiz.description)
+        self.assertListEqual(self.get_content(new_quiz), self.get_content(self.quiz))
+        self.assertNotEqual(
+            set(new_quiz.questions.values_list('id', flat=True)),
+            set(self.quiz.questions.values_list('id', flat=True))
+        )
+
+    def test_name_is_validated(self):
+        self.login_as("bob")
+        response = self.client.post(self.url, {"name": "x" * 101})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Quiz.objects.count(), 1)
@@ -6,5 +6,9 @@ from . import views
 app_name = "quizzes"
 urlpatterns = [
     path('', views.QuizListOrCreate.as_view(), name="quiz-list-create"),
+    path('import/', views.QuizImport.as_view(), name="quiz-import"),
+    path('search/', views.QuestionSearch.as_view(), name="question-search"),
     path('<int:quiz_id>/', views.QuizDetail.as_view(), name="quiz-detail"),
+    path('<int:quiz_id>/clone/', views.QuizClone.as_view(), name="quiz-clone"),
+    path('<int:quiz_id>/duplicates/', views.QuizDuplicates.as_view(), name="quiz-duplicates"),
 ]
\ No newline at end of file
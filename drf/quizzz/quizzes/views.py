@@ -1,13 +1,23 @@
 from django.shortcuts import get_object_or_404
 from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
+from rest_framework import generics
 from rest_framework import permissions
 from rest_framework import status
 from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.parsers import MultiPartParser
 
-from .serializers import EditableQuizSerializer, ListedQuizSerializer
-from .models import Quiz
+from .serializers import (
+    EditableQuizSerializer, ListedQuizSerializer, QuizPatchSerializer, QuizImportSerializer,
+    QuestionSearchResultSerializer,
+)
+from .models import Quiz, QuestionSearchDocument, QuestionSimilarityBucket
+from .importing import QuizImporter, QuizImportError
+from .search import search_documents
 
 from quizzz.common.permissions import IsOwner, IsAuthenticated
 from quizzz.communities.permissions import IsCommunityMember
@@ -30,7 +40,8 @@ class QuizListOrCreate(APIView):
             .filter(user=request.user)\
             .filter(community_id=community_id)\
             .all()
-        serializer = ListedQuizSerializer(quizzes, many=True)
+        quizzes = ListedQuizSerializer.prune_queryset(quizzes, request)
+        serializer = ListedQuizSerializer(quizzes, many=True, context={'request': request})
         return Response(serializer.data)
 
     def post(self, request, community_id):
@@ -47,7 +58,7 @@ class QuizListOrCreate(APIView):
 
 class QuizDetail(APIView):
     """
-    Read, update, delete an existing quiz.
+    Read, update (fully or with targeted operations), delete an existing quiz.
     """
     permission_classes = [
         IsAuthenticated,
@@ -62,6 +73,12 @@ class QuizDetail(APIView):
         self.check_object_permissions(self.request, obj)
         return obj
 
+    def get_written_headers(self, written):
+        """
+        Tell the client which rows were actually written (unchanged ones are skipped).
+        """
+        return {"X-Rows-Written": ", ".join(f"{model}={count}" for model, count in written.items())}
+
     def get(self, request, community_id, quiz_id):
         quiz = self.get_object(quiz_id)
         serializer = EditableQuizSerializer(quiz)
@@ -74,11 +91,156 @@ class QuizDetail(APIView):
         serializer = EditableQuizSerializer(quiz, data=request.data)
         if serializer.is_valid(raise_exception=True):
             serializer.save()
-            return Response(serializer.data)
+            return Response(serializer.data, headers=self.get_written_headers(serializer.written))
+
+    def patch(self, request, community_id, quiz_id):
+        """
+        Apply targeted operations (see QuizPatchSerializer) without 
+        submitting the whole quiz. Returns the quiz without nested objects.
+        """
+        quiz = self.get_object(quiz_id, prefetch=False)
+        if quiz.is_finalized:
+            raise ValidationError("Submitted quiz cannot be updated.")
+        serializer = QuizPatchSerializer(quiz, data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(
+            ListedQuizSerializer(quiz).data, 
+            headers=self.get_written_headers(serializer.written)
+        )
 
     def delete(self, request, community_id, quiz_id):
         quiz = self.get_object(quiz_id, prefetch=False)
         if quiz.is_finalized:
             raise ValidationError("Submitted quiz cannot be deleted.")
         quiz.delete()
-        return Response(status=status.HTTP_204_NO_CONTENT)
\ No newline at end of file
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class QuizClone(APIView):
+    """
+    Copy an existing quiz (e.g. a template or an old quiz to re-run) into a new draft.
+    Fields of the new quiz (name, description) can be set in the payload.
+    """
+    permission_classes = [
+        IsAuthenticated,
+        IsCommunityMember & IsOwner,
+    ]
+
+    def post(self, request, community_id, quiz_id):
+        quiz = get_object_or_404(Quiz.objects.filter(pk=quiz_id, community_id=community_id))
+        self.check_object_permissions(request, quiz)
+
+        serializer = ListedQuizSerializer(data=request.data, partial=True)
+        serializer.is_valid(raise_exception=True)
+        new_quiz = quiz.clone(request.user, **serializer.validated_data)
+
+        serializer = ListedQuizSerializer(new_quiz)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+def get_visible_questions_filter(request):
+    """
+    Filter of questions (or of models with a `quiz` relation) the member can read:
+    questions of own quizzes and of finished rounds, for admins also questions
+    of the quiz pool (finalized quizzes without a round).
+    """
+    visible = Q(quiz__user=request.user) | Q(quiz__round__finish_time__lt=timezone.now())
+    if request.membership.is_admin:
+        visible |= Q(quiz__is_finalized=True, quiz__round__isnull=True)
+    return visible
+
+
+class QuizDuplicates(APIView):
+    """
+    Find likely duplicates of questions of the quiz among questions 
+    of other finalized quizzes of the community (see `quizzz.quizzes.similarity`)
+    the user can read (see `get_visible_questions_filter()`).
+    """
+    permission_classes = [
+        IsAuthenticated,
+        IsCommunityMember & IsOwner,
+    ]
+
+    def get(self, request, community_id, quiz_id):
+        quiz = get_object_or_404(Quiz.objects.filter(pk=quiz_id, community_id=community_id))
+        self.check_object_permissions(request, quiz)
+
+        questions = list(quiz.questions.order_by('id'))
+        duplicates = QuestionSimilarityBucket.find_duplicates(
+            quiz, questions, visible=get_visible_questions_filter(request))
+        return Response({
+            "questions": [
+                {
+                    "id": question.id,
+                    "text": question.text,
+                    "duplicates": [
+                        {
+                            "question_id": duplicate.id,
+                            "quiz_id": duplicate.quiz_id,
+                            "quiz_name": duplicate.quiz.name,
+                            "text": duplicate.text,
+                            "similarity": round(similarity, 2),
+                        }
+                        for duplicate, similarity in duplicates.get(question.id, [])
+                    ],
+                }
+                for question in questions
+            ]
+        })
+
+
+class QuizImport(APIView):
+    """
+    Import trivia questions from an uploaded file (OpenTriviaDB JSON, NDJSON, CSV)
+    into new draft quizzes of the user. The file is parsed as a stream 
+    and saved in batches; nothing is saved if the file cannot be parsed.
+    """
+    permission_classes = [ IsAuthenticated, IsCommunityMember ]
+    parser_classes = [ MultiPartParser ]
+
+    def post(self, request, community_id):
+        serializer = QuizImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        importer = QuizImporter(
+            user=request.user,
+            community_id=community_id,
+            name=data.get("name", "Imported Quiz"),
+            description=f"Imported from {data['file'].name}",
+            max_questions=settings.QUIZZZ_IMPORT_MAX_QUESTIONS,
+        )
+        try:
+            summary = importer.run(data["file"], data["format"], data.get("encoding"))
+        except QuizImportError as e:
+            raise ValidationError({"file": [str(e)]})
+        return Response(summary, status=status.HTTP_201_CREATED)
+
+
+class SearchPagination(PageNumberPagination):
+    page_size = settings.QUIZZZ_SEARCH_PAGE_SIZE
+
+
+class QuestionSearch(generics.ListAPIView):
+    """
+    Full-text search of questions (texts, explanations, options and quiz names)
+    in the community, best matches first: `?q=capital of france`.
+
+    Members find questions of their own quizzes and of finished rounds,
+    admins also find questions of the quiz pool (finalized quizzes without a round).
+    """
+    serializer_class = QuestionSearchResultSerializer
+    permission_classes = [ IsAuthenticated, IsCommunityMember ]
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({"q": ["This field is required."]})
+
+        documents = QuestionSearchDocument.objects\
+            .filter(community_id=self.kwargs['community_id'])\
+            .filter(get_visible_questions_filter(self.request))
+        documents = search_documents(documents, query).order_by('-rank', 'question_id')
+        return self.get_serializer_class().prune_queryset(documents, self.request)
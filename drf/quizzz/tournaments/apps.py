@@ -5,3 +5,7 @@ class TournamentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'quizzz.tournaments'     # full Python path to the application
     label = 'tournaments'           # short, unique name for the application
+
+    def ready(self):
+        # registers built-in round finalization hooks:
+        from . import finalization  # noqa: F401
@@ -0,0 +1,152 @@
+"""
+Post-round work done once per round after its `finish_time` has passed.
+
+Apps register hooks with `@register_finalization_hook` (in `AppConfig.ready()`),
+and `manage.py finalizerounds` runs them for every finished round exactly once:
+a round is claimed by a conditional UPDATE of its `finalization_status`,
+so several scheduler processes never finalize the same round.
+"""
+import datetime
+import logging
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Round
+
+
+logger = logging.getLogger(__name__)
+
+_hooks = []
+
+
+def register_finalization_hook(hook):
+    """
+    Register a function `hook(round)` to be called once a round has finished.
+    Hooks are called in the order of registration; can be used as a decorator.
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+    return hook
+
+
+def unregister_finalization_hook(hook):
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def get_finalization_hooks():
+    return list(_hooks)
+
+
+def get_claimable_rounds(now=None, include_failed=False):
+    """
+    Return rounds that have finished and are waiting to be finalized
+    (including rounds whose processing has been abandoned by a crashed scheduler).
+    """
+    if now is None:
+        now = timezone.now()
+    timeout = datetime.timedelta(seconds=settings.QUIZZZ_ROUND_FINALIZATION_TIMEOUT_SECONDS)
+    statuses = [Round.FINALIZATION_PENDING]
+    if include_failed:
+        statuses.append(Round.FINALIZATION_FAILED)
+    return Round.objects\
+        .filter(finish_time__lt=now)\
+        .filter(
+            Q(finalization_status__in=statuses) |
+            Q(finalization_status=Round.FINALIZATION_PROCESSING, finalization_time__lt=now - timeout)
+        )
+
+
+def claim_round(round_id, now=None, include_failed=False):
+    """
+    Mark the round as being processed; return False if it has been claimed by someone else.
+    """
+    if now is None:
+        now = timezone.now()
+    num_updated = get_claimable_rounds(now, include_failed)\
+        .filter(pk=round_id)\
+        .update(finalization_status=Round.FINALIZATION_PROCESSING, finalization_time=now)
+    return num_updated == 1
+
+
+def set_finalization_status(round_id, status):
+    # editing the round resets its status to "pending" - keep it that way:
+    Round.objects\
+        .filter(pk=round_id, finalization_status=Round.FINALIZATION_PROCESSING)\
+        .update(finalization_status=status, finalization_time=timezone.now())
+
+
+def finalize_round(round):
+    """
+    Run all hooks for a claimed round. Return True if all of them succeeded.
+    """
+    for hook in get_finalization_hooks():
+        try:
+            hook(round)
+        except Exception:
+            logger.exception('Finalization hook %s failed for %s', getattr(hook, '__name__', hook), round)
+            set_finalization_status(round.id, Round.FINALIZATION_FAILED)
+            return False
+    set_finalization_status(round.id, Round.FINALIZATION_DONE)
+    return True
+
+
+def finalize_due_rounds(now=None, limit=None, include_failed=False):
+    """
+    Claim and finalize finished rounds (at most <limit>, oldest first).
+    Return the number of rounds that were finalized successfully and that failed.
+    """
+    if now is None:
+        now = timezone.now()
+    round_ids = get_claimable_rounds(now, include_failed)\
+        .order_by('finish_time', 'id')\
+        .values_list('id', flat=True)
+    if limit:
+        round_ids = round_ids[:limit]
+
+    num_done, num_failed = 0, 0
+    for round_id in list(round_ids):
+        if not claim_round(round_id, now, include_failed):
+            continue
+        round = Round.objects.select_related('quiz').get(pk=round_id)
+        if finalize_round(round):
+            num_done += 1
+        else:
+            num_failed += 1
+    return num_done, num_failed
+
+
+# Built-in hooks (in this order):
+
+@register_finalization_hook
+def rebuild_answer_counts(round):
+    """
+    Recalculate answer counters of the round from its plays (see `RoundAnswerCount`),
+    so that the distribution frozen by the snapshot is exact.
+    """
+    apps.get_model('plays.RoundAnswerCount').rebuild(round)
+
+
+@register_finalization_hook
+def write_result_snapshot(round):
+    """
+    Freeze standings and answer distribution of the round (see `RoundResult`).
+    """
+    round.get_result_snapshot()
+
+
+@register_finalization_hook
+def update_quiz_payload_caches(round):
+    """
+    The quiz of a finished round is no longer played but reviewed by all players:
+    drop its cached play payload and render its review payload (see `quizzz.plays.payloads`).
+    """
+    from quizzz.plays.payloads import get_quiz_payload, get_quiz_payload_key
+    from quizzz.plays.serializers import PlayQuizSerializer, ReviewQuizSerializer
+
+    cache.delete(get_quiz_payload_key(round.quiz, PlayQuizSerializer))
+    get_quiz_payload(round.quiz, ReviewQuizSerializer)
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from quizzz.tournaments.finalization import finalize_due_rounds
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs registered finalization hooks (answer counts, standings snapshot, '
+        'quiz payload caches) once for every round that has finished. '
+        'Runs forever unless --once is given (e.g. for cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+            help='Process due rounds once and exit.')
+        parser.add_argument('--interval', type=float, default=30,
+            help='Seconds to sleep between scans (default: 30).')
+        parser.add_argument('--limit', type=int, default=100,
+            help='Maximum number of rounds to process per scan (default: 100).')
+        parser.add_argument('--retry-failed', action='store_true',
+            help='Also process rounds whose finalization has failed before.')
+
+    def handle(self, *args, **options):
+        while True:
+            # reconnect if the connection was dropped (same as before and after requests):
+            close_old_connections()
+            try:
+                num_done, num_failed = finalize_due_rounds(
+                    limit=options['limit'],
+                    include_failed=options['retry_failed'],
+                )
+            finally:
+                close_old_connections()
+            if num_done or num_failed or options['once']:
+                self.stdout.write(f'Finalized {num_done} round(s), {num_failed} failed.')
+            if options['once']:
+                break
+            if num_done + num_failed < options['limit']:
+                time.sleep(options['interval'])
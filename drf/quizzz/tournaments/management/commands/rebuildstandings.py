@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from quizzz.tournaments.models import Tournament, TournamentStanding
+
+
+class Command(BaseCommand):
+    help = (
+        'Rebuilds materialized tournament standings from scratch and verifies '
+        'that they match standings calculated from rounds and plays.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_ids', nargs='*', type=int,
+            help='Tournaments to process (all tournaments by default).')
+        parser.add_argument('--check', action='store_true',
+            help='Only verify stored standings without rebuilding them.')
+
+    def handle(self, *args, **options):
+        tournaments = Tournament.objects.order_by('id')
+        if options['tournament_ids']:
+            tournaments = tournaments.filter(pk__in=options['tournament_ids'])
+
+        num_mismatches = 0
+        for tournament in tournaments.iterator():
+            if not options['check']:
+                TournamentStanding.rebuild(tournament)
+
+            errors = self.compare(tournament.get_stored_standings(), tournament.get_standings())
+            for error in errors:
+                self.stderr.write(f'Tournament {tournament.id}: {error}')
+            num_mismatches += bool(errors)
+
+        if num_mismatches:
+            raise CommandError(f'Stored standings do not match in {num_mismatches} tournament(s).')
+        self.stdout.write(self.style.SUCCESS('Tournament standings are up to date.'))
+
+    @staticmethod
+    def compare(stored, expected):
+        """
+        Compare stored standings with expected ones and return a list of errors.
+        Users with equal points may be listed in any order.
+        """
+        errors = []
+        stored_by_user_id = {row["user_id"]: row for row in stored}
+        expected_by_user_id = {row["user_id"]: row for row in expected}
+        for user_id in sorted(set(stored_by_user_id) | set(expected_by_user_id)):
+            if stored_by_user_id.get(user_id) != expected_by_user_id.get(user_id):
+                errors.append(
+                    f'user {user_id}: stored {stored_by_user_id.get(user_id)}, '
+                    f'expected {expected_by_user_id.get(user_id)}'
+                )
+        points = [row["points"] for row in stored]
+        if points != sorted(points, reverse=True):
+            errors.append('rows are not sorted by points')
+        return errors
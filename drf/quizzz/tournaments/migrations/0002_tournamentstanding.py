@@ -0,0 +1,91 @@
+# Generated by Django 3.2.25 on 2026-10-18 12:56
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+COUNTERS = ['points_played', 'points_authored', 'rounds_played', 'rounds_authored']
+
+
+def get_score(result, start_time, finish_time):
+    # same as `Play.get_score()`:
+    if not result or start_time is None or finish_time is None:
+        return 0
+    server_time = (finish_time - start_time).total_seconds()
+    return max(0, 100 * result - server_time) if server_time else 0
+
+
+def build_standings(apps, schema_editor):
+    """
+    Build standings rows of existing tournaments from their rounds and plays
+    (see `TournamentStanding.rebuild()`).
+    """
+    Round = apps.get_model('tournaments', 'Round')
+    Play = apps.get_model('plays', 'Play')
+    TournamentStanding = apps.get_model('tournaments', 'TournamentStanding')
+
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    rounds = Round.objects.order_by('id').values_list('id', 'tournament_id', 'quiz__user_id')
+    for round_id, tournament_id, author_id in rounds.iterator():
+        plays = Play.objects\
+            .filter(round_id=round_id)\
+            .order_by('id')\
+            .values_list('user_id', 'result', 'start_time', 'finish_time')
+        # ranked by score, ties are broken by play id (the sort is stable):
+        standings = sorted(plays, key=lambda play: -get_score(*play[1:]))
+        for rank, (user_id, *_) in enumerate(standings):
+            totals[(tournament_id, user_id)]["points_played"] += len(standings) - rank
+            totals[(tournament_id, user_id)]["rounds_played"] += 1
+        if author_id:
+            totals[(tournament_id, author_id)]["points_authored"] += len(standings)
+            totals[(tournament_id, author_id)]["rounds_authored"] += 1
+
+    TournamentStanding.objects.all().delete()
+    TournamentStanding.objects.bulk_create([
+        TournamentStanding(
+            tournament_id=tournament_id,
+            user_id=user_id,
+            points_total=counters["points_played"] + counters["points_authored"],
+            **counters
+        ) for (tournament_id, user_id), counters in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tournaments', '0001_initial'),
+        ('plays', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TournamentStanding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points_total', models.IntegerField(default=0)),
+                ('points_played', models.IntegerField(default=0)),
+                ('points_authored', models.IntegerField(default=0)),
+                ('rounds_played', models.IntegerField(default=0)),
+                ('rounds_authored', models.IntegerField(default=0)),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='standings', to='tournaments.tournament')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'tournament_standings',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tournamentstanding',
+            index=models.Index(fields=['tournament', '-points_total'], name='tournament_standings_points'),
+        ),
+        migrations.AddConstraint(
+            model_name='tournamentstanding',
+            constraint=models.UniqueConstraint(fields=('tournament', 'user'), name='unique_tournament_standings'),
+        ),
+        migrations.RunPython(build_standings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:02
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0002_tournamentstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoundResult',
+            fields=[
+                ('round', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='snapshot', serialize=False, to='tournaments.round')),
+                ('standings', models.JSONField()),
+                ('play_count', models.IntegerField()),
+                ('answer_distribution', models.JSONField()),
+                ('time_created', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'round_results',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 3.2.25 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournaments', '0003_roundresult'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='round',
+            name='finalization_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='round',
+            name='finalization_time',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='round',
+            index=models.Index(fields=['finalization_status', 'finish_time'], name='rounds_finalization'),
+        ),
+    ]
@@ -1,2 +1,4 @@
 from .tournament import Tournament
-from .round import Round
\ No newline at end of file
+from .round import Round
+from .round_result import RoundResult
+from .standing import TournamentStanding
\ No newline at end of file
@@ -21,9 +21,30 @@ class Round(models.Model):
     start_time = models.DateTimeField()
     finish_time = models.DateTimeField()
 
+    # post-round work is done once by `finalizerounds` command (see `quizzz.tournaments.finalization`):
+    FINALIZATION_PENDING = "pending"
+    FINALIZATION_PROCESSING = "processing"
+    FINALIZATION_DONE = "done"
+    FINALIZATION_FAILED = "failed"
+    FINALIZATION_STATUS_CHOICES = [
+        (FINALIZATION_PENDING, "Pending"),
+        (FINALIZATION_PROCESSING, "Processing"),
+        (FINALIZATION_DONE, "Done"),
+        (FINALIZATION_FAILED, "Failed"),
+    ]
+    finalization_status = models.CharField(
+        max_length=16,
+        choices=FINALIZATION_STATUS_CHOICES,
+        default=FINALIZATION_PENDING,
+    )
+    finalization_time = models.DateTimeField(null=True, blank=True)  # last status change
+
     class Meta:
         db_table = "rounds"
-        indexes = [models.Index(fields=['finish_time'])]
+        indexes = [
+            models.Index(fields=['finish_time']),
+            models.Index(fields=['finalization_status', 'finish_time'], name='rounds_finalization'),
+        ]
 
     def __str__(self):
         return "Round [%r]" % (self.id,)
@@ -102,10 +123,108 @@ class Round(models.Model):
         Play = apps.get_model('plays.Play')
         self.user_plays = list(Play.objects.filter(round__id=self.id, user__id=user_id))
 
+    def get_result_snapshot(self):
+        """
+        Return the immutable `RoundResult` of a finished round (created on first access)
+        or None if the round has not finished yet.
+        """
+        if self.get_status() != "finished":
+            return None
+        RoundResult = apps.get_model('tournaments.RoundResult')
+        return RoundResult.get_or_create_for(self)
+
+    def discard_result_snapshot(self):
+        """
+        Delete the snapshot of the round, e.g. when the round is edited
+        (it is written again once the round is finished).
+        """
+        RoundResult = apps.get_model('tournaments.RoundResult')
+        RoundResult.objects.filter(round_id=self.id).delete()
+        snapshot_field = self._meta.get_field('snapshot')
+        if snapshot_field.is_cached(self):
+            snapshot_field.delete_cached_value(self)
+
+    def load_standings(self):
+        """
+        Return standings of the round: finished rounds are read from their snapshot,
+        other rounds are calculated with `get_standings()`.
+        """
+        snapshot = self.get_result_snapshot()
+        return snapshot.standings if snapshot else self.get_standings()
+
+    def get_answer_distribution(self, question_ids=None):
+        """
+        Return how many times each option was chosen in this round:
+        {question_id: {option_id: count}} (option_id is None for skipped questions).
+        Counts are read from counters maintained on submit (see `RoundAnswerCount`).
+        Pass <question_ids> of the round's quiz if they have already been loaded.
+        """
+        RoundAnswerCount = apps.get_model('plays.RoundAnswerCount')
+        if question_ids is None:
+            Question = apps.get_model('quizzes.Question')
+            question_ids = Question.objects\
+                .filter(quiz_id=self.quiz_id)\
+                .values_list('id', flat=True)
+        counts = RoundAnswerCount.get_distribution(self.id)
+        return { question_id: counts.get(question_id, {}) for question_id in question_ids }
+
+    def count_answers(self):
+        """
+        Count how many times each option was chosen in this round from submitted answers:
+        {question_id: {option_id: count}} (questions nobody answered are omitted).
+        """
+        PlayAnswer = apps.get_model('plays.PlayAnswer')
+        distribution = {}
+        counts = PlayAnswer.objects\
+            .filter(play__round__id=self.id)\
+            .values('question_id', 'option_id')\
+            .annotate(count=models.Count('id'))\
+            .order_by()
+        for row in counts:
+            distribution.setdefault(row["question_id"], {})[row["option_id"]] = row["count"]
+
+        # plays with packed answers have no `PlayAnswer` rows:
+        from quizzz.plays.answer_keys import get_answer_key   # (plays app imports this module)
+        Play = apps.get_model('plays.Play')
+        packed_rows = Play.objects\
+            .filter(round__id=self.id, packed_answers__isnull=False)\
+            .values_list('packed_answers', flat=True)
+        answer_key = None
+        for packed_answers in packed_rows:
+            answer_key = answer_key or get_answer_key(self.quiz)
+            for question_id, option_id in answer_key.unpack(packed_answers):
+                counts_by_option = distribution.setdefault(question_id, {})
+                counts_by_option[option_id] = counts_by_option.get(option_id, 0) + 1
+        return distribution
+
     def get_standings(self):
         """
-        Given <round> ORM object with pre-loaded <round.plays> and <play.user> related objects,
-        calculate and return a jsonifiable list for the "standings" table.
+        Calculate and return a jsonifiable list for the "standings" table.
+        Scores, ranks and points are calculated by the database in a single query
+        (see `PlayQuerySet.with_standings()`).
+        """
+        Play = apps.get_model('plays.Play')
+        rows = Play.objects\
+            .filter(round__id=self.id)\
+            .with_standings()\
+            .values('id', 'user__username', 'user_id', 'result', 'server_time', 'score', 'points')
+        return [
+            {
+                "id": row["id"],
+                "user": row["user__username"],
+                "user_id": row["user_id"],
+                "result": row["result"],
+                "time": row["server_time"],
+                "score": row["score"],
+                "points": row["points"],
+            }
+            for row in rows
+        ]
+
+    def get_standings_in_python(self):
+        """
+        Reference implementation of `get_standings()` that loads all plays 
+        and calculates standings in Python. Kept for parity tests.
         """
         Play = apps.get_model('plays.Play')
         play_objects = Play.objects\
@@ -0,0 +1,57 @@
+from django.db import models, transaction, IntegrityError
+
+from . import Round
+
+
+class RoundResult(models.Model):
+    """
+    Immutable snapshot of a finished round: standings, play count, and
+    answer distribution. No plays can be started or submitted after a round
+    has finished, so the snapshot is written once and then only read.
+    """
+    round = models.OneToOneField(
+        Round,
+        related_name="snapshot",
+        on_delete=models.CASCADE,
+        primary_key=True,
+    )
+    standings = models.JSONField()  # see `Round.get_standings()`
+    play_count = models.IntegerField()
+    answer_distribution = models.JSONField()  # see `Round.get_answer_distribution()`
+
+    time_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "round_results"
+
+    def __str__(self):
+        return "<RoundResult of %r>" % (self.round_id,)
+
+    @classmethod
+    def get_or_create_for(cls, round):
+        """
+        Return the snapshot of a finished <round>, creating it on first call.
+        """
+        try:
+            return round.snapshot
+        except cls.DoesNotExist:
+            pass
+
+        if round.get_status() != "finished":
+            raise ValueError("Only finished rounds can be saved as results.")
+
+        standings = round.get_standings()
+        snapshot = cls(
+            round=round,
+            standings=standings,
+            play_count=len(standings),
+            answer_distribution=round.get_answer_distribution(),
+        )
+        try:
+            with transaction.atomic():
+                snapshot.save(force_insert=True)
+        except IntegrityError:
+            # written concurrently by another request/process:
+            snapshot = cls.objects.get(round_id=round.id)
+        round.snapshot = snapshot
+        return snapshot
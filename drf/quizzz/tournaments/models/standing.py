@@ -0,0 +1,274 @@
+from contextlib import contextmanager
+from collections import defaultdict
+
+from django.apps import apps
+from django.db import models, transaction
+from django.db.models import Case, F, Q, Value, When
+from django.conf import settings
+
+from . import Tournament, Round
+
+
+class TournamentStanding(models.Model):
+    """
+    Materialized row of the tournament standings table (one row per participant).
+
+    Rows are maintained incrementally: changes to a round (created/edited/deleted)
+    happen inside `TournamentStanding.track_round(round)` which applies the difference
+    between the round's contribution before and after the change. Plays only move
+    a few points, applied without calculating the round standings:
+    see `add_started_play()` and `add_submitted_play()`.
+    """
+    COUNTERS = [
+        'points_played',
+        'points_authored',
+        'rounds_played',
+        'rounds_authored',
+    ]
+
+    tournament = models.ForeignKey(
+        Tournament,
+        related_name="standings",
+        on_delete=models.CASCADE,
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+
+    points_total = models.IntegerField(default=0)
+    points_played = models.IntegerField(default=0)
+    points_authored = models.IntegerField(default=0)
+    rounds_played = models.IntegerField(default=0)
+    rounds_authored = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "tournament_standings"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['tournament', 'user'],
+                name='unique_tournament_standings'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['tournament', '-points_total'],
+                name='tournament_standings_points'
+            )
+        ]
+
+    def __str__(self):
+        return "<Standing of %r in %r: %r>" % (self.user_id, self.tournament_id, self.points_total)
+
+    @property
+    def rounds_total(self):
+        return self.rounds_played + self.rounds_authored
+
+    def to_dict(self):
+        """
+        Return a jsonifiable row in the format of `Tournament.get_standings()`.
+        """
+        return {
+            "user_id": self.user_id,
+            "user": self.user.username,
+            "points": self.points_total,
+            "rounds": self.rounds_total,
+            "points_played": self.points_played,
+            "points_authored": self.points_authored,
+            "rounds_played": self.rounds_played,
+            "rounds_authored": self.rounds_authored,
+        }
+
+    @classmethod
+    def get_round_contribution(cls, round):
+        """
+        Calculate what <round> adds to its tournament standings:
+        {user_id: {counter: value}} with counters from `COUNTERS`.
+        A round that has not been created yet (or has just been deleted) adds nothing.
+        """
+        if round.pk is None:
+            return {}
+
+        contribution = defaultdict(lambda: dict.fromkeys(cls.COUNTERS, 0))
+        round_standings = round.load_standings()
+        for r in round_standings:
+            contribution[r["user_id"]]["points_played"] += r["points"]
+            contribution[r["user_id"]]["rounds_played"] += 1
+
+        author_id = round.quiz.user_id
+        if author_id:
+            # same as `round.get_author_score()` without loading plays again:
+            contribution[author_id]["points_authored"] += len(round_standings)
+            contribution[author_id]["rounds_authored"] += 1
+
+        return dict(contribution)
+
+    @classmethod
+    def apply_round_change(cls, tournament_id, before, after):
+        """
+        Update standings rows of users whose round contribution changed
+        from <before> to <after> (see `get_round_contribution()`).
+        Runs a constant number of queries regardless of the number of users affected.
+        """
+        empty = dict.fromkeys(cls.COUNTERS, 0)
+        deltas = {}
+        for user_id in set(before) | set(after):
+            delta = {
+                counter: after.get(user_id, empty)[counter] - before.get(user_id, empty)[counter]
+                for counter in cls.COUNTERS
+            }
+            if any(delta.values()):
+                deltas[user_id] = delta
+        if not deltas:
+            return
+
+        with transaction.atomic(savepoint=False):
+            # make sure rows exist (without racing with concurrent inserts) and lock them:
+            cls.objects.bulk_create(
+                [cls(tournament_id=tournament_id, user_id=user_id) for user_id in deltas],
+                ignore_conflicts=True
+            )
+            rows = list(
+                cls.objects
+                .select_for_update()
+                .filter(tournament_id=tournament_id, user_id__in=deltas)
+            )
+            for row in rows:
+                for counter, value in deltas[row.user_id].items():
+                    setattr(row, counter, getattr(row, counter) + value)
+                row.points_total = row.points_played + row.points_authored
+            cls.objects.bulk_update(rows, cls.COUNTERS + ['points_total'])
+
+            # users who no longer take part in any round drop out of standings:
+            if any(delta["rounds_played"] < 0 or delta["rounds_authored"] < 0
+                    for delta in deltas.values()):
+                cls.objects.filter(
+                    tournament_id=tournament_id,
+                    rounds_played=0,
+                    rounds_authored=0
+                ).delete()
+
+    @classmethod
+    def increment(cls, tournament_id, user_ids, **deltas):
+        """
+        Add <deltas> ({counter: value}) to rows of <user_ids> (a list or a subquery) in one query.
+        """
+        values = {counter: F(counter) + value for counter, value in deltas.items()}
+        points = deltas.get('points_played', 0) + deltas.get('points_authored', 0)
+        if points:
+            values['points_total'] = F('points_total') + points
+        cls.objects\
+            .filter(tournament_id=tournament_id, user_id__in=user_ids)\
+            .update(**values)
+
+    @staticmethod
+    def lock_round(round):
+        """
+        Lock the round row until the end of the transaction, so that
+        changes to standings of the same round are applied one by one.
+        """
+        list(Round.objects.select_for_update().filter(pk=round.pk).values_list('pk'))
+
+    @classmethod
+    def add_started_play(cls, round, play):
+        """
+        Count a new <play> of the round: it has no score and the greatest id,
+        so it ranks last (1 point), every other play of the round gets one more point
+        and the author one more point for a player. Runs 2 queries; call it in the
+        transaction that created the play, after `lock_round()`.
+        """
+        Play = apps.get_model('plays.Play')
+        author_id = round.quiz.user_id
+        is_participant = Q(user_id__in=Play.objects.filter(round_id=round.id).values('user_id'))
+        is_player = Q(user_id=play.user_id)
+        is_author = Q(user_id=author_id)
+
+        def add_one(condition):
+            return Case(When(condition, then=Value(1)), default=Value(0))
+
+        with transaction.atomic(savepoint=False):
+            # make sure rows exist (without racing with concurrent inserts):
+            cls.objects.bulk_create(
+                [
+                    cls(tournament_id=round.tournament_id, user_id=user_id)
+                    for user_id in {play.user_id, author_id} if user_id
+                ],
+                ignore_conflicts=True
+            )
+            cls.objects\
+                .filter(tournament_id=round.tournament_id)\
+                .filter(is_participant | is_author)\
+                .update(
+                    points_played=F('points_played') + add_one(is_participant),
+                    rounds_played=F('rounds_played') + add_one(is_player),
+                    points_authored=F('points_authored') + add_one(is_author),
+                    points_total=F('points_total') + add_one(is_participant) + add_one(is_author),
+                )
+
+    @classmethod
+    def add_submitted_play(cls, round, play):
+        """
+        Count the score of a just submitted <play> (0 before): it moves up over plays
+        it outranks now, each of them loses a point to the play. Only rows of these
+        players are updated (3 queries); call it in the transaction that submitted
+        the play, after `lock_round()`.
+        """
+        Play = apps.get_model('plays.Play')
+        plays = Play.objects.filter(round_id=round.id).with_scores()
+        score = plays.filter(pk=play.pk).values_list('score', flat=True).get()
+        if not score:
+            return
+        # plays ranked above the play before (score 0, ties broken by id) and below it now:
+        passed_user_ids = list(
+            plays
+            .exclude(pk=play.pk)
+            .filter(
+                Q(score=0, id__lt=play.id) |
+                Q(score__gt=0, score__lt=score) |
+                Q(score=score, id__gt=play.id)
+            )
+            .values_list('user_id', flat=True)
+        )
+        if passed_user_ids:
+            cls.increment(round.tournament_id, passed_user_ids, points_played=-1)
+            cls.increment(round.tournament_id, [play.user_id], points_played=len(passed_user_ids))
+
+    @classmethod
+    @contextmanager
+    def track_round(cls, round):
+        """
+        Context manager to keep standings in sync with changes to <round>
+        made inside the block, e.g.:
+            with TournamentStanding.track_round(round):
+                play.save()
+
+        The round row is locked for the duration of the block
+        so that concurrent changes to the same round are applied one by one.
+        """
+        with transaction.atomic():
+            if round.pk is not None:
+                cls.lock_round(round)
+            before = cls.get_round_contribution(round)
+            yield
+            after = cls.get_round_contribution(round)
+            cls.apply_round_change(round.tournament_id, before, after)
+
+    @classmethod
+    def rebuild(cls, tournament):
+        """
+        Recalculate all standings rows of <tournament> from scratch.
+        """
+        totals = defaultdict(lambda: dict.fromkeys(cls.COUNTERS, 0))
+        rounds = tournament.rounds.select_related('quiz', 'snapshot').all()
+        for round in rounds:
+            for user_id, contribution in cls.get_round_contribution(round).items():
+                for counter, value in contribution.items():
+                    totals[user_id][counter] += value
+
+        with transaction.atomic():
+            cls.objects.filter(tournament_id=tournament.id).delete()
+            cls.objects.bulk_create([
+                cls(
+                    tournament_id=tournament.id,
+                    user_id=user_id,
+                    points_total=counters["points_played"] + counters["points_authored"],
+                    **counters
+                ) for user_id, counters in totals.items()
+            ])
@@ -20,6 +20,10 @@ class Tournament(TimeStampedModel):
         indexes = [models.Index(fields=['time_created'])]
 
     def get_standings(self):
+        """
+        Calculate tournament standings from standings of its rounds.
+        Finished rounds are read from their `RoundResult` snapshots.
+        """
         points_total = defaultdict(int)
         points_played = defaultdict(int)
         points_authored = defaultdict(int)
@@ -28,8 +32,9 @@ class Tournament(TimeStampedModel):
         rounds_authored = defaultdict(int)
         user_names = {}
 
-        for round in self.rounds.all():
-            round_standings = round.get_standings()
+        rounds = self.rounds.select_related('quiz__user', 'snapshot').all()
+        for round in rounds:
+            round_standings = round.load_standings()
             for r in round_standings:
                 user_id = r["user_id"]
                 rounds_total[user_id] += 1
@@ -41,8 +46,9 @@ class Tournament(TimeStampedModel):
             if author_id:
                 rounds_total[author_id] += 1
                 rounds_authored[author_id] += 1
-                points_total[author_id] += round.get_author_score()
-                points_authored[author_id] += round.get_author_score()
+                # same as `round.get_author_score()` without loading plays again:
+                points_total[author_id] += len(round_standings)
+                points_authored[author_id] += len(round_standings)
                 user_names[author_id] = user_names.get(author_id) or round.quiz.user.username
 
         standings = [
@@ -58,4 +64,15 @@ class Tournament(TimeStampedModel):
             } for x in sorted(points_total.items(), key=lambda x:x[1], reverse=True)
         ]
 
-        return standings
\ No newline at end of file
+        return standings
+
+    def get_stored_standings(self):
+        """
+        Read standings from the materialized `TournamentStanding` table.
+        Returns the same format as `get_standings()` in a single query.
+        """
+        rows = self.standings\
+            .select_related('user')\
+            .order_by('-points_total', 'user_id')\
+            .all()
+        return [row.to_dict() for row in rows]
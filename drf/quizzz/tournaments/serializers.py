@@ -1,12 +1,13 @@
 from django.conf import settings
 from rest_framework import serializers
 
-from .models import Tournament, Round
+from .models import Tournament, Round, TournamentStanding
+from quizzz.common.serializers import SparseFieldsetsMixin
 from quizzz.quizzes.models import Quiz
 from quizzz.users.serializers import UserSerializer
 
 
-class TournamentSerializer(serializers.ModelSerializer):
+class TournamentSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     CRUD serializer for tournaments.
     """
@@ -50,12 +51,13 @@ class ListedQuizSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'is_finalized', 'time_created', 'time_updated', 'user']
 
 
-class ListedRoundSerializer(serializers.ModelSerializer):
+class ListedRoundSerializer(SparseFieldsetsMixin, serializers.ModelSerializer):
     """
     Serializer to view existing rounds with nested quiz information.
     """
     quiz = ListedQuizSerializer()
     status = serializers.CharField(source='get_status', read_only=True)
+    is_author = serializers.SerializerMethodField()
 
     class Meta:
         model = Round
@@ -68,12 +70,18 @@ class ListedRoundSerializer(serializers.ModelSerializer):
             'status',
             'user_play_id',    # id
             'user_play_is_submitted', # bool
+            'is_author',
         ]
+        # model fields read by other fields (see `quizzz.common.serializers`):
+        sparse_field_sources = {
+            'status': ['start_time', 'finish_time'],
+            'user_play_id': [],    # prefetched
+            'user_play_is_submitted': [],
+            'is_author': ['quiz__user'],
+        }
 
-    def to_representation(self, instance):
-        ret = super().to_representation(instance)
-        ret['is_author'] = instance.is_authored_by(self.context["request"].user.id)
-        return ret
+    def get_is_author(self, instance):
+        return instance.is_authored_by(self.context["request"].user.id)
 
 
 class EditableRoundSerializer(serializers.ModelSerializer):
@@ -114,8 +122,11 @@ class EditableRoundSerializer(serializers.ModelSerializer):
 
         self.enforce_rounds_per_tournament_limit(validated_data["tournament_id"])
         self.check_selected_quiz(validated_data["quiz"], validated_data["tournament_id"])
-        
-        return Round.objects.create(**validated_data)
+
+        round = Round(**validated_data)
+        with TournamentStanding.track_round(round):
+            round.save()
+        return round
 
     def update(self, instance, validated_data):
         """
@@ -125,9 +136,12 @@ class EditableRoundSerializer(serializers.ModelSerializer):
 
         self.check_selected_quiz(validated_data["quiz"], validated_data["tournament_id"])
 
-        instance.start_time = validated_data.get("start_time")
-        instance.finish_time = validated_data.get("finish_time")
-        instance.quiz = validated_data.get("quiz")
-        instance.save()
+        with TournamentStanding.track_round(instance):
+            instance.discard_result_snapshot()
+            instance.start_time = validated_data.get("start_time")
+            instance.finish_time = validated_data.get("finish_time")
+            instance.quiz = validated_data.get("quiz")
+            instance.finalization_status = Round.FINALIZATION_PENDING
+            instance.save()
 
         return instance
\ No newline at end of file
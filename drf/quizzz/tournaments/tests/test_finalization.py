@@ -0,0 +1,112 @@
+import datetime
+from io import StringIO
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.plays.models import Play, RoundAnswerCount
+from quizzz.plays.payloads import get_quiz_payload, get_quiz_payload_key
+from quizzz.plays.serializers import PlayQuizSerializer, ReviewQuizSerializer
+
+from .. import finalization
+from ..management.commands import finalizerounds
+from ..models import Round, RoundResult
+
+
+class RoundFinalizationTest(SetupRoundsMixin, TestCase):
+    def setUp(self):
+        self.ROUND_ID = self.ROUNDS["round1"]["id"]
+        self.calls = []
+        self.hook = finalization.register_finalization_hook(
+            lambda round: self.calls.append(round.id))
+        self.addCleanup(finalization.unregister_finalization_hook, self.hook)
+
+    def finish_round(self, round_id=None, minutes_ago=60):
+        now = timezone.now()
+        Round.objects.filter(pk=round_id or self.ROUND_ID).update(
+            start_time=now - datetime.timedelta(minutes=minutes_ago + 60),
+            finish_time=now - datetime.timedelta(minutes=minutes_ago),
+        )
+
+    def get_status(self, round_id=None):
+        return Round.objects.get(pk=round_id or self.ROUND_ID).finalization_status
+
+    def test_active_rounds_are_not_finalized(self):
+        Round.objects.update(finish_time=timezone.now() + datetime.timedelta(minutes=60))
+        self.assertEqual(finalization.finalize_due_rounds(), (0, 0))
+        self.assertListEqual(self.calls, [])
+        self.assertEqual(self.get_status(), Round.FINALIZATION_PENDING)
+
+    def test_finished_round_is_finalized_once(self):
+        Round.objects.update(finish_time=timezone.now() + datetime.timedelta(minutes=60))
+        self.finish_round()
+
+        self.assertEqual(finalization.finalize_due_rounds(), (1, 0))
+        self.assertListEqual(self.calls, [self.ROUND_ID])
+        self.assertEqual(self.get_status(), Round.FINALIZATION_DONE)
+        self.assertTrue(RoundResult.objects.filter(round_id=self.ROUND_ID).exists())
+
+        # the next scan has nothing to do:
+        self.assertEqual(finalization.finalize_due_rounds(), (0, 0))
+        self.assertListEqual(self.calls, [self.ROUND_ID])
+
+    def test_built_in_hooks(self):
+        round = Round.objects.select_related('quiz').get(pk=self.ROUND_ID)
+        play = Play.objects.create(user_id=self.USERS["alice"]["id"], round_id=self.ROUND_ID, is_submitted=True)
+        play.answers.create(question_id=1, option_id=4)
+        get_quiz_payload(round.quiz, PlayQuizSerializer)
+        self.finish_round()
+
+        self.assertEqual(finalization.finalize_due_rounds(), (1, 0))
+        # counters are rebuilt before the snapshot is written:
+        self.assertDictEqual(RoundAnswerCount.get_distribution(self.ROUND_ID), {1: {4: 1}})
+        snapshot = RoundResult.objects.get(round_id=self.ROUND_ID)
+        self.assertEqual(snapshot.answer_distribution["1"]["4"], 1)
+        # the quiz is reviewed, not played:
+        self.assertIsNone(cache.get(get_quiz_payload_key(round.quiz, PlayQuizSerializer)))
+        self.assertIsNotNone(cache.get(get_quiz_payload_key(round.quiz, ReviewQuizSerializer)))
+
+    def test_claimed_round_is_skipped(self):
+        self.finish_round()
+        self.assertTrue(finalization.claim_round(self.ROUND_ID))
+        self.assertFalse(finalization.claim_round(self.ROUND_ID))
+
+        # abandoned claims are picked up after timeout:
+        with self.settings(QUIZZZ_ROUND_FINALIZATION_TIMEOUT_SECONDS=60):
+            later = timezone.now() + datetime.timedelta(seconds=61)
+            self.assertTrue(finalization.claim_round(self.ROUND_ID, now=later))
+
+    def test_failed_hook(self):
+        Round.objects.update(finish_time=timezone.now() + datetime.timedelta(minutes=60))
+        self.finish_round()
+
+        def failing_hook(round):
+            raise RuntimeError("oops")
+        finalization.register_finalization_hook(failing_hook)
+        self.addCleanup(finalization.unregister_finalization_hook, failing_hook)
+
+        with self.assertLogs(finalization.logger, level="ERROR"):
+            self.assertEqual(finalization.finalize_due_rounds(), (0, 1))
+        self.assertEqual(self.get_status(), Round.FINALIZATION_FAILED)
+
+        # failed rounds are retried on demand only:
+        self.assertEqual(finalization.finalize_due_rounds(), (0, 0))
+        finalization.unregister_finalization_hook(failing_hook)
+        self.assertEqual(finalization.finalize_due_rounds(include_failed=True), (1, 0))
+        self.assertEqual(self.get_status(), Round.FINALIZATION_DONE)
+
+    def test_command_once(self):
+        Round.objects.update(finish_time=timezone.now() + datetime.timedelta(minutes=60))
+        self.finish_round()
+
+        out = StringIO()
+        # (connections of test cases are kept open)
+        with mock.patch.object(finalizerounds, 'close_old_connections') as close_old_connections:
+            call_command('finalizerounds', '--once', stdout=out)
+        self.assertEqual(close_old_connections.call_count, 2)
+        self.assertIn('Finalized 1 round(s), 0 failed.', out.getvalue())
+        self.assertEqual(self.get_status(), Round.FINALIZATION_DONE)
@@ -0,0 +1,112 @@
+import datetime
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.utils import timezone
+from django.urls import reverse
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.quizzes.models import Quiz
+from ..models import Round, RoundResult, Tournament
+
+
+class RoundResultTest(SetupRoundsMixin, APITestCase):
+    def setUp(self):
+        self.ROUND = "round1"
+        self.ROUND_ID = self.ROUNDS[self.ROUND]["id"]
+        self.QUIZ_ID = self.ROUNDS[self.ROUND]["quiz_id"]
+
+        # finalize quiz
+        quiz = Quiz.objects.get(pk=self.QUIZ_ID)
+        quiz.is_finalized = True
+        quiz.save()
+
+        def get_url(name):
+            return reverse(name, kwargs={"community_id": self.GROUP_ID, "round_id": self.ROUND_ID})
+        self.url = get_url('tournaments:round-detail')
+        self.start_url = get_url('plays:start-round')
+        self.submit_url = get_url('plays:submit-round')
+        self.review_url = get_url('plays:review-round')
+
+        # alice plays the round:
+        self.login_as("alice")
+        self.client.post(self.start_url, {})
+        self.client.post(self.submit_url, {
+            "answers": [
+                {"question_id": 1, "option_id": 4},
+                {"question_id": 2, "option_id": 7},
+            ]
+        })
+        self.live_standings = Round.objects.get(pk=self.ROUND_ID).get_standings()
+
+    def finish_round(self):
+        now = timezone.now()
+        Round.objects.filter(pk=self.ROUND_ID).update(
+            start_time=now - datetime.timedelta(minutes=120),
+            finish_time=now - datetime.timedelta(minutes=60),
+        )
+
+    def test_no_snapshot_for_active_round(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RoundResult.objects.count(), 0)
+        self.assertIsNone(Round.objects.get(pk=self.ROUND_ID).get_result_snapshot())
+
+    def test_snapshot_is_written_once_and_served(self):
+        self.finish_round()
+
+        # first request writes the snapshot:
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RoundResult.objects.count(), 1)
+        first_standings = response.json()["standings"]
+
+        # next requests just read it together with the round:
+        with self.assertNumQueries(6):
+            # (3) round with snapshot (4) user plays (5) quiz (6) quiz user (membership is cached)
+            response = self.client.get(self.url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["standings"], first_standings)
+        self.assertEqual(RoundResult.objects.count(), 1)
+
+        snapshot = RoundResult.objects.get(round_id=self.ROUND_ID)
+        self.assertEqual(snapshot.play_count, 1)
+        self.assertEqual(snapshot.standings[0]["user_id"], self.live_standings[0]["user_id"])
+        self.assertEqual(snapshot.standings[0]["points"], self.live_standings[0]["points"])
+
+    def test_review_uses_snapshot(self):
+        response = self.client.get(self.review_url)
+        live_data = response.json()
+
+        self.finish_round()
+        response = self.client.get(self.review_url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RoundResult.objects.count(), 1)
+        self.assertEqual(response.json()["play_count"], 1)
+        self.assertEqual(response.json()["choices_by_question_id"], live_data["choices_by_question_id"])
+
+    def test_tournament_standings_use_snapshot(self):
+        self.finish_round()
+        tournament = Tournament.objects.get(pk=self.TOURNAMENTS["tournament1"]["id"])
+        standings = tournament.get_standings()
+        self.assertEqual(RoundResult.objects.count(), 1)
+
+        # snapshots make tournament standings a single query:
+        with self.assertNumQueries(1):
+            self.assertListEqual(tournament.get_standings(), standings)
+
+    def test_edited_round_discards_snapshot(self):
+        self.finish_round()
+        Round.objects.get(pk=self.ROUND_ID).get_result_snapshot()
+        self.assertEqual(RoundResult.objects.count(), 1)
+
+        # admin reopens the round:
+        now = timezone.now().replace(second=0, microsecond=0)
+        self.login_as("bob")
+        response = self.client.put(self.url, {
+            "start_time": now,
+            "finish_time": now + datetime.timedelta(minutes=60),
+            "quiz": self.QUIZ_ID,
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(RoundResult.objects.count(), 0)
@@ -0,0 +1,108 @@
+import datetime
+from collections import defaultdict
+from django.test import TestCase
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.users.models import CustomUser
+from quizzz.plays.models import Play
+from ..models import Round
+
+
+class RoundStandingsParityTest(SetupRoundsMixin, TestCase):
+    """
+    Standings calculated by the database must match the reference Python implementation.
+    """
+    def setUp(self):
+        self.ROUND = "round1"
+        self.round = Round.objects.get(pk=self.ROUNDS[self.ROUND]["id"])
+        self.num_users = 0
+
+    def add_play(self, result=None, seconds=None, microseconds=0):
+        """
+        Add a play by a new user; a play with <seconds> set is finished.
+        """
+        self.num_users += 1
+        user = CustomUser.objects.create_user(
+            username=f"player{self.num_users}",
+            email=f"player{self.num_users}@example.com",
+            password="player12345",
+        )
+        play = Play.objects.create(user=user, round=self.round)
+        if seconds is not None:
+            finish_time = play.start_time + datetime.timedelta(seconds=seconds, microseconds=microseconds)
+            Play.objects.filter(pk=play.id).update(
+                result=result, finish_time=finish_time, is_submitted=True)
+        return play
+
+    def assert_same_standings(self):
+        with self.assertNumQueries(1):
+            standings = self.round.get_standings()
+        expected = self.round.get_standings_in_python()
+
+        self.assertEqual(len(standings), len(expected))
+        for row in standings:
+            self.assertListEqual(list(row.keys()), list(expected[0].keys()))
+
+        # plays are rated the same:
+        expected_by_id = {row["id"]: row for row in expected}
+        for row in standings:
+            expected_row = expected_by_id[row["id"]]
+            for key in ["user", "user_id", "result"]:
+                self.assertEqual(row[key], expected_row[key])
+            for key in ["time", "score"]:
+                if expected_row[key] is None:
+                    self.assertIsNone(row[key])
+                else:
+                    self.assertAlmostEqual(row[key], expected_row[key], places=6)
+
+        # rows are sorted by score and plays with equal scores share the same points:
+        self.assertListEqual(
+            [row["score"] for row in standings],
+            sorted([row["score"] for row in standings], reverse=True)
+        )
+        def points_by_score(rows):
+            points = defaultdict(list)
+            for row in rows:
+                points[round(row["score"], 6)].append(row["points"])
+            return {score: sorted(p) for score, p in points.items()}
+        self.assertDictEqual(points_by_score(standings), points_by_score(expected))
+
+    def test_no_plays(self):
+        self.assertListEqual(self.round.get_standings(), [])
+        self.assertListEqual(self.round.get_standings_in_python(), [])
+
+    def test_single_play(self):
+        self.add_play(result=2, seconds=30)
+        self.assert_same_standings()
+        self.assertEqual(self.round.get_standings()[0]["points"], 1)
+        self.assertAlmostEqual(self.round.get_standings()[0]["score"], 170)
+
+    def test_mixed_plays(self):
+        """
+        Finished, unfinished, zero-result, slow and sub-second plays.
+        """
+        self.add_play(result=2, seconds=30)
+        self.add_play(result=1, seconds=12, microseconds=345678)
+        self.add_play(result=2, seconds=29, microseconds=999999)
+        self.add_play()                             # not submitted
+        self.add_play(result=0, seconds=10)         # no correct answers
+        self.add_play(result=1, seconds=250)        # too slow: score is 0
+        self.add_play(result=1, seconds=0)          # zero time: score is 0
+        self.assert_same_standings()
+
+        standings = self.round.get_standings()
+        self.assertListEqual([row["points"] for row in standings], [7, 6, 5, 4, 3, 2, 1])
+        self.assertListEqual([row["user"] for row in standings[:3]], ["player3", "player1", "player2"])
+
+    def test_ties(self):
+        for _ in range(3):
+            self.add_play(result=1, seconds=10)
+        self.add_play(result=2, seconds=10)
+        self.add_play()
+        self.assert_same_standings()
+
+        standings = self.round.get_standings()
+        self.assertEqual(standings[0]["user"], "player4")
+        # ties are broken by play id:
+        self.assertListEqual([row["user"] for row in standings[1:4]], ["player1", "player2", "player3"])
@@ -70,7 +70,7 @@ class CreateRoundTest(SetupTournamentsMixin, APITestCase):
         quiz.save()
 
         # now it works:
-        with self.assertNumQueries(10):
+        with self.assertNumQueries(15):
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_201_CREATED)
             self.assertListEqual(list(response.data.keys()), self.expected_keys)
@@ -207,7 +207,7 @@ class RoundDetailTest(SetupRoundsMixin, APITestCase):
 
         # bob is a group admin, he can update the data:
         self.login_as("bob")
-        with self.assertNumQueries(10):  
+        with self.assertNumQueries(17):  # (4-10) as before (11) discard snapshot (12-17) update standings
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_200_OK)
             self.assertEqual(list(response.data.keys()), self.expected_keys)
@@ -228,8 +228,9 @@ class RoundDetailTest(SetupRoundsMixin, APITestCase):
 
         # bob is group admin, he can delete the round:
         self.login_as("bob")
-        with self.assertNumQueries(6):
-            # (4) select round (5) del round (6) del plays
+        with self.assertNumQueries(17):
+            # (4) select round (5) del round (6) del plays (7) del snapshot (8) del answer counts
+            # (9-17) update standings
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             self.assertEqual(response.data, None)
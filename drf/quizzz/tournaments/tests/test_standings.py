@@ -0,0 +1,192 @@
+from importlib import import_module
+from io import StringIO
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.apps import apps
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+
+from quizzz.common.test_mixins import SetupRoundsMixin
+
+from quizzz.communities.models import Membership
+from quizzz.quizzes.models import Quiz
+from ..models import Tournament, TournamentStanding
+
+
+STANDINGS_EXPECTED_KEYS = [
+    'user_id', 'user', 'points', 'rounds',
+    'points_played', 'points_authored', 'rounds_played', 'rounds_authored'
+]
+
+
+class TournamentStandingsTest(SetupRoundsMixin, APITestCase):
+    def setUp(self):
+        self.TOURNAMENT = "tournament1"
+        self.TOURNAMENT_ID = self.TOURNAMENTS[self.TOURNAMENT]["id"]
+        self.ROUND = "round1"
+        self.ROUND_ID = self.ROUNDS[self.ROUND]["id"]
+        self.QUIZ_ID = self.ROUNDS[self.ROUND]["quiz_id"]
+
+        # finalize quiz
+        quiz = Quiz.objects.get(pk=self.QUIZ_ID)
+        quiz.is_finalized = True
+        quiz.save()
+
+        # round from test data was inserted directly:
+        self.tournament = Tournament.objects.get(pk=self.TOURNAMENT_ID)
+        TournamentStanding.rebuild(self.tournament)
+
+        self.url = reverse(
+            'tournaments:tournament-standings',
+            kwargs={
+                "community_id": self.GROUP_ID,
+                "tournament_id": self.TOURNAMENT_ID,
+            }
+        )
+        self.round_url = reverse(
+            'tournaments:round-detail',
+            kwargs={
+                "community_id": self.GROUP_ID,
+                "round_id": self.ROUND_ID,
+            }
+        )
+        self.start_url = reverse(
+            'plays:start-round',
+            kwargs={
+                "community_id": self.GROUP_ID,
+                "round_id": self.ROUND_ID,
+            }
+        )
+        self.submit_url = reverse(
+            'plays:submit-round',
+            kwargs={
+                "community_id": self.GROUP_ID,
+                "round_id": self.ROUND_ID,
+            }
+        )
+
+    def play(self, username, answers):
+        self.login_as(username)
+        self.client.post(self.start_url, {})
+        response = self.client.post(self.submit_url, {"answers": answers})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def assert_standings_in_sync(self):
+        stored = {row["user_id"]: row for row in self.tournament.get_stored_standings()}
+        expected = {row["user_id"]: row for row in self.tournament.get_standings()}
+        self.assertDictEqual(stored, expected)
+
+    def test_normal(self):
+        """
+        A group member can see tournament standings read in a single query.
+        """
+        get_response = lambda: self.client.get(self.url)
+
+        self.assert_authentication_required(get_response)
+        self.assert_membership_required(get_response)
+
+        self.login_as("alice")
+        with self.assertNumQueries(5):  # (3) member check (4) tournament (5) standings
+            response = get_response()
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(len(response.data), 1)
+            self.assertListEqual(list(response.data[0].keys()), STANDINGS_EXPECTED_KEYS)
+            self.assertEqual(response.data[0]["user"], "bob")
+            self.assertEqual(response.data[0]["rounds_authored"], 1)
+
+    def test_standings_follow_plays(self):
+        """
+        Starting and submitting plays updates standings incrementally.
+        """
+        for username in ["ben", "admin"]:
+            Membership.objects.create(user_id=self.USERS[username]["id"], community_id=self.GROUP_ID)
+
+        self.play("alice", [{"question_id": 1, "option_id": 4}])
+        self.assert_standings_in_sync()
+
+        self.play("ben", [
+            {"question_id": 1, "option_id": 4},
+            {"question_id": 2, "option_id": 8},
+        ])
+        self.assert_standings_in_sync()
+
+        standings = self.tournament.get_stored_standings()
+        self.assertListEqual(
+            [(row["user"], row["points"]) for row in standings],
+            [("bob", 2), ("ben", 2), ("alice", 1)]    # ties are ordered by user id
+        )
+        self.assertEqual(standings[0]["points_authored"], 2)
+
+        # started but not submitted plays count as well:
+        self.login_as("admin")
+        self.client.post(self.start_url, {})
+        self.assert_standings_in_sync()
+        self.assertEqual(len(self.tournament.get_stored_standings()), 4)
+
+    def test_standings_follow_plays_submitted_in_any_order(self):
+        """
+        Submitted plays move up over the plays they outrank (ties are broken by play id).
+        """
+        for username in ["ben", "admin"]:
+            Membership.objects.create(user_id=self.USERS[username]["id"], community_id=self.GROUP_ID)
+        for username in ["alice", "ben", "admin"]:
+            self.login_as(username)
+            self.client.post(self.start_url, {})
+            self.assert_standings_in_sync()
+
+        for username, answers in [
+            ("admin", [{"question_id": 1, "option_id": 4}]),
+            ("ben", []),
+            ("alice", [{"question_id": 1, "option_id": 4}, {"question_id": 2, "option_id": 8}]),
+        ]:
+            self.login_as(username)
+            response = self.client.post(self.submit_url, {"answers": answers})
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assert_standings_in_sync()
+
+        standings = {row["user"]: row["points_played"] for row in self.tournament.get_stored_standings()}
+        self.assertDictEqual(standings, {"alice": 3, "admin": 2, "ben": 1, "bob": 0})
+
+    def test_standings_follow_round_changes(self):
+        """
+        Deleting a round removes its points from standings.
+        """
+        self.play("alice", [{"question_id": 1, "option_id": 4}])
+
+        self.login_as("bob")
+        response = self.client.delete(self.round_url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+
+        self.assertListEqual(self.tournament.get_stored_standings(), [])
+        self.assertEqual(TournamentStanding.objects.count(), 0)
+
+    def test_rebuild_command(self):
+        """
+        The command fixes drifted standings and verifies them.
+        """
+        self.play("alice", [{"question_id": 1, "option_id": 4}])
+        TournamentStanding.objects.filter(user_id=self.USERS["alice"]["id"]).update(points_total=100)
+
+        with self.assertRaises(CommandError):
+            call_command('rebuildstandings', '--check', stdout=StringIO(), stderr=StringIO())
+
+        out = StringIO()
+        call_command('rebuildstandings', stdout=out, stderr=StringIO())
+        self.assertIn('up to date', out.getvalue())
+        self.assert_standings_in_sync()
+
+    def test_migration_builds_standings(self):
+        """
+        Standings of existing tournaments are built when the table is created.
+        """
+        migration = import_module('quizzz.tournaments.migrations.0002_tournamentstanding')
+        Membership.objects.create(user_id=self.USERS["ben"]["id"], community_id=self.GROUP_ID)
+        self.play("alice", [{"question_id": 1, "option_id": 4}])
+        self.login_as("ben")
+        self.client.post(self.start_url, {})
+        TournamentStanding.objects.all().delete()
+
+        migration.build_standings(apps, None)
+        self.assert_standings_in_sync()
+        self.assertEqual(len(self.tournament.get_stored_standings()), 3)
@@ -138,8 +138,8 @@ class TournamentDetailTest(SetupTournamentsMixin, APITestCase):
 
         # bob is group admin, he can delete the tournament:
         self.login_as("bob")
-        with self.assertNumQueries(6):
-            # (4) select tournament (5) del rounds (6) del tournament
+        with self.assertNumQueries(7):
+            # (4) select tournament (5) del rounds (6) del standings (7) del tournament
             response = get_response()
             self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
             self.assertEqual(response.data, None)
@@ -9,7 +9,7 @@ from rest_framework import permissions, status, generics
 from quizzz.communities.permissions import IsCommunityMember, IsCommunityAdmin
 from quizzz.common.permissions import IsSafeMethod, IsAuthenticated
 
-from .models import Tournament, Round
+from .models import Tournament, Round, TournamentStanding
 from .serializers import (
     TournamentSerializer, 
     ListedRoundSerializer,
@@ -30,7 +30,8 @@ class TournamentListOrCreate(APIView):
 
     def get(self, request, community_id):
         tournaments = Tournament.objects.filter(community_id=community_id).all()
-        serializer = TournamentSerializer(tournaments, many=True)
+        tournaments = TournamentSerializer.prune_queryset(tournaments, request)
+        serializer = TournamentSerializer(tournaments, many=True, context={'request': request})
         return Response(serializer.data)
 
     def post(self, request, community_id):
@@ -71,6 +72,7 @@ class RoundListOrCreate(APIView):
             .select_related('quiz').select_related('quiz__user')\
             .prefetch_related(Round.get_user_plays_prefetch_object(request.user.id))\
             .all()
+        rounds = ListedRoundSerializer.prune_queryset(rounds, request)
         serializer = ListedRoundSerializer(rounds, many=True, context={'request': request})
 
         return Response(serializer.data)
@@ -102,8 +104,12 @@ class RoundDetail(generics.RetrieveDestroyAPIView):
         if self.request.method == 'DELETE':
             return EditableRoundSerializer
 
+    def perform_destroy(self, instance):
+        with TournamentStanding.track_round(instance):
+            instance.delete()
+
     def get(self, request, community_id, round_id):
-        obj = get_object_or_404(Round.objects.filter(pk=round_id))
+        obj = get_object_or_404(Round.objects.select_related('snapshot').filter(pk=round_id))
         self.check_object_permissions(self.request, obj)
 
         obj.load_user_plays(request.user.id)
@@ -111,7 +117,7 @@ class RoundDetail(generics.RetrieveDestroyAPIView):
 
         return Response({
             "round": serializer.data,
-            "standings": obj.get_standings(),
+            "standings": obj.load_standings(),
         })
 
     def put(self, request, community_id, round_id):
@@ -142,7 +148,8 @@ class QuizPool(APIView):
             .filter(round__id=None)\
             .order_by('-time_created')\
             .all()
-        serializer = ListedQuizSerializer(quizzes, many=True)
+        quizzes = ListedQuizSerializer.prune_queryset(quizzes, request)
+        serializer = ListedQuizSerializer(quizzes, many=True, context={'request': request})
         return Response(serializer.data)
 
 
@@ -152,5 +159,5 @@ class TournamentStandings(APIView):
     @method_decorator(cache_page(30))
     def get(self, request, community_id, tournament_id):
         tournament = get_object_or_404(Tournament.objects.filter(pk=tournament_id))
-        standings = tournament.get_standings()
+        standings = tournament.get_stored_standings()
         return Response(standings)
\ No newline at end of file
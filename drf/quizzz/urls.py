@@ -16,9 +16,12 @@ Including another URLconf
 from django.contrib import admin
 from django.urls import path, include
 
+from quizzz.common.batch import Batch
+
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('api/batch/', Batch.as_view(), name="batch"),
     path('api/', include('quizzz.users.urls')),
     path('api/communities/', include('quizzz.communities.urls')),
     path('api/communities/<int:community_id>/chat/', include('quizzz.chat.urls')),
@@ -200,6 +200,6 @@ class UserList(APIView):
     permission_classes = [ IsAuthenticated, IsSuperuser ]
 
     def get(self, request):
-        users = CustomUser.objects.all()
-        serializer = UserSerializer(users, many=True)
+        users = UserSerializer.prune_queryset(CustomUser.objects.all(), request)
+        serializer = UserSerializer(users, many=True, context={'request': request})
         return Response(serializer.data)
\ No newline at end of file
@@ -189,8 +189,39 @@ QUIZZZ_CREATED_COMMUNITIES_LIMIT = 5
 QUIZZZ_JOINED_COMMUNITIES_LIMIT = 20
 QUIZZZ_ROUNDS_PER_TOURNAMENT_LIMIT = 100
 QUIZZZ_CHAT_PAGE_SIZE = 2
+# real-time chat events served by the ASGI app (see quizzz/chat/broker.py and quizzz/chat/events.py):
+QUIZZZ_CHAT_BROKER = "quizzz.chat.broker.LocalBroker"
+QUIZZZ_CHAT_EVENTS_KEEPALIVE_SECONDS = 15
+QUIZZZ_CHAT_EVENTS_QUEUE_SIZE = 100   # undelivered events of a client before its stream is closed
+# long polling of chats holds a worker thread: keep it below the gunicorn `timeout`
+# and the number of waiting requests below gunicorn `threads` (per process)
+QUIZZZ_CHAT_LONG_POLL_SECONDS = 20
+QUIZZZ_CHAT_LONG_POLL_MAX_WAITERS = 4
+QUIZZZ_CHAT_LONG_POLL_INTERVAL_SECONDS = 0.5   # how often waiting requests read the cache
+QUIZZZ_CHAT_LAST_MESSAGE_CACHE_SECONDS = 60 * 60 * 24
 QUIZZZ_QUESTIONS_PER_QUIZ = 2
 QUIZZZ_OPTIONS_PER_QUESTION = 4
+# rounds left "processing" longer than that by `finalizerounds` are picked up again:
+QUIZZZ_ROUND_FINALIZATION_TIMEOUT_SECONDS = 600
+QUIZZZ_QUIZ_PAYLOAD_CACHE_SECONDS = 60 * 60 * 24
+QUIZZZ_ANSWER_KEY_CACHE_SECONDS = 60 * 60 * 24
+QUIZZZ_ANSWER_KEY_LOCAL_CACHE_SIZE = 256   # answer keys kept in memory of each process
+# memberships of (user, community) resolved by MembershipMiddleware (see quizzz/communities/memberships.py),
+# changes reach other processes when their local copies expire:
+QUIZZZ_MEMBERSHIP_CACHE_SECONDS = 60 * 60
+QUIZZZ_MEMBERSHIP_LOCAL_CACHE_SECONDS = 5
+QUIZZZ_MEMBERSHIP_LOCAL_CACHE_SIZE = 10000
+# questions inserted by one bulk query when importing quizzes (see quizzz/quizzes/importing.py):
+QUIZZZ_IMPORT_BATCH_SIZE = 500
+QUIZZZ_IMPORT_MAX_QUESTIONS = 10000   # per uploaded file
+QUIZZZ_EXPORT_CHUNK_SIZE = 2000   # rows fetched at once when exporting a community
+QUIZZZ_SEARCH_PAGE_SIZE = 20
+QUIZZZ_BATCH_MAX_REQUESTS = 10   # GET requests run by one request to /api/batch/
+# similarity of question texts (0-1) reported as likely duplicates (see quizzz/quizzes/similarity.py):
+QUIZZZ_DUPLICATE_QUESTION_SIMILARITY = 0.5
+# store answers of submitted plays in `Play.packed_answers` instead of `PlayAnswer` rows
+# (convert existing plays with `manage.py packplayanswers`):
+QUIZZZ_PACKED_PLAY_ANSWERS = False
 
 # for external links used when sending out emails:
 QUIZZZ_FRONTEND_BASE_URL = "http://localhost:3000"
@@ -43,4 +43,6 @@ DEFAULT_FROM_EMAIL = f"Quizzz <no-reply@{get_secret('DOMAIN')}>"
 QUIZZZ_QUESTIONS_PER_QUIZ = 10
 QUIZZZ_OPTIONS_PER_QUESTION = 4
 QUIZZZ_CHAT_PAGE_SIZE = 10
+# keep the default LocalBroker until the ASGI app is deployed (sync WSGI workers
+# do not serve chat events), then switch to "quizzz.chat.broker.PostgresBroker"
 QUIZZZ_FRONTEND_BASE_URL = f"https://{get_secret('DOMAIN')}"
@@ -28,4 +28,7 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # To view emails in logs:
 # journalctl -u quizzz.service --no-pager
 
+# keep the default LocalBroker until the ASGI app is deployed (sync WSGI workers
+# do not serve chat events), then switch to "quizzz.chat.broker.PostgresBroker"
+
 QUIZZZ_FRONTEND_BASE_URL = "https://localhost:8443"
\ No newline at end of file
@@ -85,4 +85,12 @@ export async function updateMembership(communityId, userId, payload) {
     `/api/communities/${communityId}/members/${userId}/`, 
     { is_admin, is_approved }
   ); 
-}
\ No newline at end of file
+}
+export async function getCommunityDashboard(communityId) {
+  /*
+    Fetch everything shown when a community is opened: the community,
+    user's membership, current tournament with its upcoming rounds
+    and the newest page of the chat.
+  */
+  return await apiClient.get(`/api/communities/${communityId}/dashboard/`);
+}
@@ -20,6 +20,7 @@ export {
   getCommunityMembers,
   getMembership,
   updateMembership,
+  getCommunityDashboard,
 } from './communities';
 
 export {